@@ -260,6 +260,15 @@ class AggregationServer:
         )
         gather_start = time.time()
 
+        # Upload timestamps are only needed by the overlap check, so look them
+        # up as each peer arrives while stragglers are still downloading
+        ts_tasks: dict[int, asyncio.Task] = {}
+
+        def on_peer(peer):
+            ts_tasks[peer.uid] = asyncio.create_task(
+                self.comms.gradient_timestamp(peer.uid, self.sync_window - 1)
+            )
+
         # Use the comms gather function (similar to how the miner uses it)
         gather_result = await self.comms.gather(
             my_uid=self.comms.uid,
@@ -273,6 +282,7 @@ class AggregationServer:
             totalks=self.param_totalks,
             time_min=time_min,
             time_max=time_max,
+            on_peer=on_peer,
         )
 
         gather_time = time.time() - gather_start
@@ -284,7 +294,9 @@ class AggregationServer:
             return False
 
         overlap_start = time.time()
-        uid_index_overlap = await self.check_uid_index_overlap(gather_result)
+        uid_index_overlap = await self.check_uid_index_overlap(
+            gather_result, ts_tasks=ts_tasks
+        )
         overlap_time = time.time() - overlap_start
 
         tplr.logger.info(f"Gather completed in {gather_time:.2f} seconds")
@@ -296,39 +308,43 @@ class AggregationServer:
         processed_state_dict = {}
 
         try:
-            for name, param in self.model.named_parameters():
-                idxs_key = name + "idxs"
-                vals_key = name + "vals"
-                quant_key = name + "quant_params"
-
-                idxs = getattr(gather_result.state_dict, idxs_key, None)
-                vals = getattr(gather_result.state_dict, vals_key, None)
-                quant_params = getattr(gather_result.state_dict, quant_key, None)
-
-                if idxs is not None and vals is not None:
-                    # Ensure idx and val are lists of tensors
-                    if not isinstance(idxs, (list, tuple)):
-                        idxs = [idxs]
-                    if not isinstance(vals, (list, tuple)):
-                        vals = [vals]
-
-                    # Use the compressor to decompress the gradients
-                    decompressed = self.compressor.batch_decompress(
-                        param,
-                        cast(list[torch.Tensor], idxs),
-                        cast(list[torch.Tensor], vals),
-                        self.param_shapes[name],
-                        self.param_totalks[name],
-                        quant_params,
-                    )
 
-                    # Pack the decompressed gradient
-                    processed_state_dict[name] = tplr.neurons.pack_binary_tensor(
-                        self.transformer.decode(decompressed)
-                        .sign()
-                        .to(self.config.device),
-                        device=self.config.device,
-                    ).cpu()
+            def decompressed_grads():
+                for name, param in self.model.named_parameters():
+                    idxs_key = name + "idxs"
+                    vals_key = name + "vals"
+                    quant_key = name + "quant_params"
+
+                    idxs = getattr(gather_result.state_dict, idxs_key, None)
+                    vals = getattr(gather_result.state_dict, vals_key, None)
+                    quant_params = getattr(gather_result.state_dict, quant_key, None)
+
+                    if idxs is not None and vals is not None:
+                        # Ensure idx and val are lists of tensors
+                        if not isinstance(idxs, (list, tuple)):
+                            idxs = [idxs]
+                        if not isinstance(vals, (list, tuple)):
+                            vals = [vals]
+
+                        # Use the compressor to decompress the gradients
+                        yield (
+                            name,
+                            self.compressor.batch_decompress(
+                                param,
+                                cast(list[torch.Tensor], idxs),
+                                cast(list[torch.Tensor], vals),
+                                self.param_shapes[name],
+                                self.param_totalks[name],
+                                quant_params,
+                            ),
+                        )
+
+            # Decode through the batched DCT and pack each decoded gradient
+            for name, decoded in self.transformer.decode_iter(decompressed_grads()):
+                processed_state_dict[name] = tplr.neurons.pack_binary_tensor(
+                    decoded.sign().to(self.config.device),
+                    device=self.config.device,
+                ).cpu()
 
             process_time = time.time() - process_start
             tplr.logger.info(f"Processed gradients in {process_time:.2f} seconds")
@@ -416,6 +432,7 @@ class AggregationServer:
                     "process_time": process_time,
                     "put_time": store_time,
                     "total_time": total_time,
+                    "activity_index_staleness": self.comms.activity_index.staleness(),
                     "selected_uids": str(selected_uids),
                     "skipped_uids": str(gather_result.skipped_uids),
                     "block": self.current_block,
@@ -475,6 +492,9 @@ class AggregationServer:
                     tplr.logger.info("Running garbage collection...")
                     gc.collect()
 
+                # Fetch the next window's gradients as they land, while waiting
+                self.comms.start_prefetch(self.sync_window, self.comms.peers)
+
                 # Wait for next window if needed (optional)
                 tplr.logger.info(
                     f"Waiting for next window... (current: {self.current_window})"
@@ -540,11 +560,13 @@ class AggregationServer:
         gather_result,
         *,
         overlap_threshold: float = 0.90,
+        ts_tasks: dict[int, asyncio.Task] | None = None,
     ) -> dict:
         """
         For every peer-pair compute the per-chunk *set* overlap of their top-k index
         lists on each parameter.  A pair is flagged **only if the size-weighted
         average across *all* checked parameters** is ≥ `overlap_threshold`.
+        `ts_tasks` holds gradient-timestamp lookups already started during gather.
         """
 
         # ── 0. basic sanity ───────────────────────────────────────────────────
@@ -566,7 +588,8 @@ class AggregationServer:
                 uids,
                 await asyncio.gather(
                     *[
-                        self.comms.gradient_timestamp(uid, self.sync_window - 1)
+                        (ts_tasks or {}).get(uid)
+                        or self.comms.gradient_timestamp(uid, self.sync_window - 1)
                         for uid in uids
                     ]
                 ),
@@ -180,6 +180,10 @@ class Miner:
                 output_device=self.local_rank,
             )
         self.tokenizer = self.hparams.tokenizer
+        # Optional process pool for page tokenization (0 keeps it on threads)
+        tplr.r2_dataset.R2DatasetLoader.TOKENIZE_PROCESSES = (
+            self.hparams.tokenize_processes
+        )
 
         # Init compression
         self.transformer = tplr.compress.TransformDCT(
@@ -298,6 +302,9 @@ class Miner:
         self.next_peers: list[int] | None = None
         self.peers_update_window = -1
 
+        # Builds the next window's loader while the current window trains
+        self.data_prefetcher = tplr.WindowPrefetcher(self.load_window_data)
+
     # Main training loop.
     async def run(self):
         # Start background block listener
@@ -432,31 +439,14 @@ class Miner:
                 )
 
             # 2. Load ONLY the pages that belong to *this* rank -------------------
+            # (prefetched during the previous window when it was known in time)
             data_start = tplr.T()
-            total_pages = self.hparams.pages_per_window
-            start_idx, n_my_pages = self.pages_for_rank(
-                total_pages, self.rank, self.world_size
-            )
-
-            pages = await tplr.r2_dataset.R2DatasetLoader.next_pages(
-                offset=step_window * total_pages,
-                n_pages=total_pages,
-                seed=self.uid,
-            )
-            own_pages = pages[start_idx : start_idx + n_my_pages]
+            pages, own_pages, loader = await self.data_prefetcher.get(step_window)
             tplr.logger.info(
-                f"[Rank {self.rank}/{self.world_size}] pages "
-                f"{list(range(start_idx, start_idx + n_my_pages))}"
-            )
-            loader = await tplr.r2_dataset.R2DatasetLoader.create(
-                batch_size=self.hparams.batch_size,
-                sequence_length=self.hparams.sequence_length,
-                pages_info=own_pages,
-                tokenizer=self.tokenizer,
-            )
-            tplr.logger.info(
-                f"{tplr.P(step_window, tplr.T() - data_start)} Loaded training data"
+                f"{tplr.P(step_window, tplr.T() - data_start)} Loaded training data "
+                f"(prefetch hit rate {self.data_prefetcher.hit_rate():.0%})"
             )
+            self.data_prefetcher.start(step_window + 1)
             tplr.logger.info(
                 f"Pages: {[p[1] for p in pages]} for  Window: {step_window}"
             )  # type: ignore
@@ -490,7 +480,7 @@ class Miner:
                     if not local_has_batch:
                         continue
 
-                input_ids = torch.tensor(batch, dtype=torch.long).to(self.device)
+                input_ids = torch.as_tensor(batch, dtype=torch.long).to(self.device)
                 tokens_this_batch = input_ids.numel()
                 window_tokens += tokens_this_batch
                 labels = input_ids.clone()
@@ -506,6 +496,9 @@ class Miner:
                 n_batches += 1
                 tplr.logger.info(f"loss: {outputs.loss.item()} [Batch {n_batches}]")
 
+                # Let the next window's data prefetch make progress
+                await asyncio.sleep(0)
+
                 # Clear intermediate activations immediately
                 del outputs, batch
                 if "input_ids" in locals():
@@ -685,6 +678,15 @@ class Miner:
                     totalks=self.totalks,
                     time_min=time_min,
                     time_max=time_max,
+                    # Dense running mean only pays off with many peers
+                    accumulator=tplr.compress.GradientAccumulator(
+                        self.compressor,
+                        self.xshapes,
+                        self.totalks,
+                        self.device,
+                    )
+                    if len(self.comms.peers) >= self.hparams.accumulator_min_peers
+                    else None,
                 )
                 tplr.logger.info("Gather task completed!")
                 gather_time = tplr.T() - gather_start
@@ -777,23 +779,29 @@ class Miner:
                         model_iterator = self.model.module.named_parameters()
                     else:
                         model_iterator = self.model.named_parameters()
-                    for n, p in model_iterator:
-                        idxs_key = n + "idxs"
-                        vals_key = n + "vals"
-                        quant_key = n + "quant_params"
-
-                        idxs = getattr(gather_result.state_dict, idxs_key, None)
-                        vals = getattr(gather_result.state_dict, vals_key, None)
-                        quant_params = getattr(
-                            gather_result.state_dict, quant_key, None
-                        )
-                        if idxs is not None and vals is not None:
-                            if not isinstance(idxs, (list, tuple)):
-                                idxs = [idxs]
-                            if not isinstance(vals, (list, tuple)):
-                                vals = [vals]
-                            new_grad = self.transformer.decode(
-                                self.compressor.batch_decompress(
+                    accumulator = getattr(gather_result, "accumulator", None)
+
+                    def decompressed_grads():
+                        for n, p in model_iterator:
+                            idxs_key = n + "idxs"
+                            vals_key = n + "vals"
+                            quant_key = n + "quant_params"
+
+                            idxs = getattr(gather_result.state_dict, idxs_key, None)
+                            vals = getattr(gather_result.state_dict, vals_key, None)
+                            quant_params = getattr(
+                                gather_result.state_dict, quant_key, None
+                            )
+                            decompressed = None
+                            if accumulator is not None:
+                                # Peers were folded into a running mean during gather
+                                decompressed = accumulator.result(n)
+                            elif idxs is not None and vals is not None:
+                                if not isinstance(idxs, (list, tuple)):
+                                    idxs = [idxs]
+                                if not isinstance(vals, (list, tuple)):
+                                    vals = [vals]
+                                decompressed = self.compressor.batch_decompress(
                                     p.to(self.device),
                                     cast(list[torch.Tensor], idxs),
                                     cast(list[torch.Tensor], vals),
@@ -801,17 +809,23 @@ class Miner:
                                     self.totalks[n],
                                     quant_params,
                                 )
-                            )
 
-                            if p.grad is None:
-                                p.grad = new_grad
+                            if decompressed is not None:
+                                yield p, decompressed.to(p.dtype)
                             else:
-                                p.grad.copy_(new_grad)
-                            p.grad.sign_()
+                                tplr.logger.info(
+                                    f"Gradient data missing for parameter {n}, skipping."
+                                )
+
+                    # Decode through the batched DCT, a bounded batch at a time
+                    for p, new_grad in self.transformer.decode_iter(
+                        decompressed_grads()
+                    ):
+                        if p.grad is None:
+                            p.grad = new_grad
                         else:
-                            tplr.logger.info(
-                                f"Gradient data missing for parameter {n}, skipping."
-                            )
+                            p.grad.copy_(new_grad)
+                        p.grad.sign_()
 
                 self.optimizer.step()
                 self.scheduler.step()
@@ -902,6 +916,7 @@ class Miner:
                         "miner/timing/window_total": window_total_time,
                         "miner/timing/peer_update": peer_update_time,
                         "miner/timing/data_loading": data_loading_time,
+                        "miner/data_prefetch_hit_rate": self.data_prefetcher.hit_rate(),
                         "miner/timing/training": training_time,
                         "miner/timing/compression": compression_time,
                         "miner/timing/gather": gather_time,
@@ -954,6 +969,9 @@ class Miner:
                         "put_time": put_completion_time,
                         "model_update_time": model_update_time,
                         "tokens_per_sec": tokens_per_sec,
+                        "data_prefetch_hits": self.data_prefetcher.hits,
+                        "data_prefetch_late": self.data_prefetcher.late,
+                        "data_prefetch_misses": self.data_prefetcher.misses,
                     },
                 )
                 tplr.logger.info("Finished metrics logging call for miner")
@@ -981,6 +999,31 @@ class Miner:
             while self.current_window == step_window:
                 await asyncio.sleep(0.1)
 
+    async def load_window_data(self, window: int):
+        """Pages for ``window`` and a loader over the ones this rank trains on."""
+        total_pages = self.hparams.pages_per_window
+        start_idx, n_my_pages = self.pages_for_rank(
+            total_pages, self.rank, self.world_size
+        )
+
+        pages = await tplr.r2_dataset.R2DatasetLoader.next_pages(
+            offset=window * total_pages,
+            n_pages=total_pages,
+            seed=self.uid,
+        )
+        own_pages = pages[start_idx : start_idx + n_my_pages]
+        tplr.logger.info(
+            f"[Rank {self.rank}/{self.world_size}] pages "
+            f"{list(range(start_idx, start_idx + n_my_pages))} for window {window}"
+        )
+        loader = await tplr.r2_dataset.R2DatasetLoader.create(
+            batch_size=self.hparams.batch_size,
+            sequence_length=self.hparams.sequence_length,
+            pages_info=own_pages,
+            tokenizer=self.tokenizer,
+        )
+        return pages, own_pages, loader
+
     def pages_for_rank(
         self, total_pages: int, rank: int, world: int
     ) -> tuple[int, int]:
@@ -154,6 +154,10 @@ class Validator:
         self.model = LlamaForCausalLM(self.hparams.model_config)
         self.model.to(self.config.device)
         self.tokenizer = self.hparams.tokenizer
+        # Optional process pool for page tokenization (0 keeps it on threads)
+        tplr.r2_dataset.R2DatasetLoader.TOKENIZE_PROCESSES = (
+            self.hparams.tokenize_processes
+        )
 
         # Init compression
         self.transformer = tplr.compress.TransformDCT(
@@ -232,6 +236,13 @@ class Validator:
         self.comms.current_window = self.current_window
         self.sync_window = self.current_window
 
+        # Sampled evaluation batches per window, shared by every evaluated UID
+        self.eval_data = tplr.EvalDataService(
+            self.preload_dataloader,
+            sample_rate=self.hparams.validator_sample_rate,
+            max_concurrent=self.hparams.eval_data_concurrency,
+        )
+
         # Init score tracking variables
         self.loss_before_per_batch_own = 0.0
         self.loss_after_per_batch_own = 0.0
@@ -597,17 +608,15 @@ class Validator:
     def evaluate_model_on_batches(
         self,
         model: torch.nn.Module,
-        batches: list[list[int]],
-        sampled_indices: list[int],
+        batches: torch.Tensor,
     ) -> tuple[float, int]:
         total_loss = 0.0
         n_batches = 0
 
-        # TODO: Add validation for empty inputs
-        if not batches or not sampled_indices:
+        if batches is None or len(batches) == 0:
             tplr.log_with_context(
                 level="warning",
-                message="Empty batches or sampled_indices provided to evaluate_model_on_batches",
+                message="Empty batches provided to evaluate_model_on_batches",
                 sync_window=self.sync_window,
                 current_window=self.current_window,
             )
@@ -616,23 +625,11 @@ class Validator:
         with torch.no_grad():
             model.eval()
             with autocast(device_type=self.model.device.type, dtype=torch.bfloat16):
-                for i, batch in enumerate(batches):
-                    if i not in sampled_indices:
-                        continue
-                    # TODO: Add validation for empty batches - handle arrays/tensors properly
-                    if batch is None or len(batch) == 0:
-                        tplr.log_with_context(
-                            level="warning",
-                            message=f"Empty batch at index {i}, skipping",
-                            sync_window=self.sync_window,
-                            current_window=self.current_window,
-                        )
-                        continue
-
-                    input_ids = torch.tensor(batch, dtype=torch.long).to(model.device)
-                    labels = input_ids.clone()
+                for batch in batches:
+                    # Batches are pinned, so the copy can overlap the forward pass
+                    input_ids = batch.to(model.device, non_blocking=True)
                     labels = torch.where(
-                        labels == self.tokenizer.pad_token_id, -100, labels
+                        input_ids == self.tokenizer.pad_token_id, -100, input_ids
                     )
                     outputs = model(input_ids=input_ids, labels=labels)
                     total_loss += outputs.loss.item()
@@ -1025,6 +1022,15 @@ class Validator:
                     totalks=self.totalks,
                     time_min=time_min,
                     time_max=time_max,
+                    # Dense running mean only pays off with many peers
+                    accumulator=tplr.compress.GradientAccumulator(
+                        self.compressor,
+                        self.xshapes,
+                        self.totalks,
+                        self.config.device,
+                    )
+                    if len(self.comms.peers) >= self.hparams.accumulator_min_peers
+                    else None,
                 )
 
                 if gather_result is None:
@@ -1038,6 +1044,10 @@ class Validator:
                     continue
                 skipped_uids = gather_result.skipped_uids
                 success_rate = gather_result.success_rate
+
+                # No aggregation to load, so the next window will most likely
+                # be gathered too: start fetching it while this one is evaluated
+                self.comms.start_prefetch(self.sync_window + 1, self.comms.peers)
             else:
                 tplr.log_with_context(
                     level="info",
@@ -1224,90 +1234,42 @@ class Validator:
             avg_loss_after_per_batch_random = 0.0
             evaluated_peers = 0
 
-            # Pre-load common random loader for all evaluated UIDs in this window.
+            # Load the sampled batches of the random data and of every UID in
+            # the bin up front; the random batches are shared by all UIDs.
             data_start_random = tplr.T()
-
-            # Load the random loader directly
             random_seed = random.randint(
                 1000, 10000000
             )  # Using high seed number for random context
             tplr.log_with_context(
                 level="info",
-                message=f"Loading common random dataloader with seed {random_seed}",
+                message=f"Loading evaluation data for random seed {random_seed} and UIDs {evaluation_uids}",
                 sync_window=self.sync_window,
                 current_window=self.current_window,
             )
-            try:
-                random_loader_data = await self.preload_dataloader(seed=random_seed)
-                if random_loader_data:
-                    common_loader_random = random_loader_data["loader"]
-                    tplr.log_with_context(
-                        level="info",
-                        message=f"{tplr.P(self.sync_window, tplr.T() - data_start_random)} Loaded common random loader for evaluation.",
-                        sync_window=self.sync_window,
-                        current_window=self.current_window,
-                    )
-                else:
-                    tplr.log_with_context(
-                        level="error",
-                        message="Random loader was None, cannot continue evaluation",
-                        sync_window=self.sync_window,
-                        current_window=self.current_window,
-                    )
-                    continue
-            except Exception as e:
+            self.eval_data.start(self.sync_window, [random_seed, *evaluation_uids])
+            random_data = await self.eval_data.get(random_seed)
+            if random_data is None:
                 tplr.log_with_context(
                     level="error",
-                    message=f"Error loading random loader: {str(e)}",
+                    message="Random evaluation data could not be loaded, cannot continue evaluation",
                     sync_window=self.sync_window,
                     current_window=self.current_window,
                 )
+                self.eval_data.stop()
                 continue
+            tplr.log_with_context(
+                level="info",
+                message=f"{tplr.P(self.sync_window, tplr.T() - data_start_random)} Loaded common random data for evaluation: {len(random_data)}/{random_data.total} batches ({self.hparams.validator_sample_rate * 100:.1f}%)",
+                sync_window=self.sync_window,
+                current_window=self.current_window,
+            )
+            # The base model does not change while the bin is evaluated, so its
+            # loss on the shared random batches is computed once
+            loss_before_random_shared = None
 
-            # Setup for sliding window approach
-            evaluation_uids_queue = list(
-                evaluation_uids
-            )  # Create a copy of the list to work with
-            next_uid_dataloader_task = None
-            next_uid = None
-
-            # If we have at least one UID to evaluate, start loading the first one
-            if evaluation_uids_queue:
-                next_uid = evaluation_uids_queue.pop(0)
-                tplr.log_with_context(
-                    level="info",
-                    message=f"Starting preload for first UID: {next_uid}",
-                    sync_window=self.sync_window,
-                    current_window=self.current_window,
-                )
-                next_uid_dataloader_task = asyncio.create_task(
-                    self.preload_dataloader(seed=next_uid)
-                )
-
-            # Process each UID with sliding window loading
-            while next_uid is not None:
-                eval_uid = next_uid
-                eval_uid_dataloader_task = next_uid_dataloader_task
+            for eval_uid in evaluation_uids:
                 self.peers_last_eval_window[eval_uid] = self.sync_window
 
-                if eval_uid_dataloader_task is None:
-                    tplr.log_with_context(
-                        level="error",
-                        message=f"Error loading data for UID {eval_uid}",
-                        sync_window=self.sync_window,
-                        current_window=self.current_window,
-                        eval_uid=eval_uid,
-                    )
-                    # TODO: Skip to next UID without penalizing current one for validator data loading issues
-                    next_uid = None
-                    next_uid_dataloader_task = None
-                    if evaluation_uids_queue:
-                        next_uid = evaluation_uids_queue.pop(0)
-                        next_uid_dataloader_task = asyncio.create_task(
-                            self.preload_dataloader(seed=next_uid)
-                        )
-                    continue
-
                 tplr.log_with_context(
                     level="info",
                     message=f"Evaluating UID: {eval_uid}",
@@ -1331,38 +1293,16 @@ class Validator:
 
                 # Wait for the current UID's data to be loaded
                 data_start = tplr.T()
-                try:
-                    loader_data = await eval_uid_dataloader_task
-                    # Start loading the next UID if there are more in the queue
-                    next_uid = None
-                    next_uid_dataloader_task = None
-                    if evaluation_uids_queue:
-                        next_uid = evaluation_uids_queue.pop(0)
-                        tplr.log_with_context(
-                            level="info",
-                            message=f"Starting preload for next UID: {next_uid}",
-                            sync_window=self.sync_window,
-                            current_window=self.current_window,
-                        )
-                        next_uid_dataloader_task = asyncio.create_task(
-                            self.preload_dataloader(seed=next_uid)
-                        )
-                except Exception as e:
+                eval_data = await self.eval_data.get(eval_uid)
+                if eval_data is None:
                     tplr.log_with_context(
                         level="error",
-                        message=f"Error loading data for UID {eval_uid}: {str(e)}, skipping evaluation without penalty (validator data issue)",
+                        message=f"Error loading data for UID {eval_uid}, skipping evaluation without penalty (validator data issue)",
                         sync_window=self.sync_window,
                         current_window=self.current_window,
                         eval_uid=eval_uid,
                     )
                     # TODO: Skip to next UID without penalizing for validator data loading issues
-                    next_uid = None
-                    next_uid_dataloader_task = None
-                    if evaluation_uids_queue:
-                        next_uid = evaluation_uids_queue.pop(0)
-                        next_uid_dataloader_task = asyncio.create_task(
-                            self.preload_dataloader(seed=next_uid)
-                        )
                     continue
 
                 if (
@@ -1372,13 +1312,12 @@ class Validator:
                         and eval_result.get("__status") in ["TOO_LATE", "TOO_EARLY"]
                     )
                     and eval_result[0] is not None
-                    and loader_data is not None
+                    and eval_data is not None
                 ):
                     state_dict, _ = eval_result
 
-                    # Extract data from loader
-                    loader_own = loader_data["loader"]
-                    local_pages = loader_data["pages"]
+                    # Pages the UID's data was drawn from
+                    local_pages = eval_data.pages
 
                     # Pull miner-sent pages info from metadata
                     miner_pages = None
@@ -1417,7 +1356,7 @@ class Validator:
                             )
                         continue
 
-                    if local_pages is None or loader_own is None:
+                    if local_pages is None:
                         tplr.log_with_context(
                             level="warning",
                             message=f"Invalid loader data for UID {eval_uid}, skipping evaluation without penalty (validator data issue)",
@@ -1472,50 +1411,17 @@ class Validator:
                     # 9. Compute loss before applying gradient
                     self.optimizer.zero_grad()
                     model_own_data_eval.zero_grad()
-                    with torch.no_grad():
-                        model_own_data_eval.eval()
-                        batches_own = []
-                        for batch in loader_own:
-                            batches_own.append(batch)
-
-                        total_batches_own = len(batches_own)
-
-                        # TODO: Skip evaluation without penalty if no batches available
-                        if total_batches_own == 0:
-                            tplr.log_with_context(
-                                level="warning",
-                                message=f"No batches available for UID {eval_uid}, skipping evaluation without penalty (validator data issue)",
-                                sync_window=self.sync_window,
-                                current_window=self.current_window,
-                                eval_uid=eval_uid,
-                            )
-                            continue
-
-                        sample_size_own = max(
-                            1,
-                            int(total_batches_own * self.hparams.validator_sample_rate),
-                        )
-                        # TODO: Ensure sample size doesn't exceed population size
-                        sample_size_own = min(sample_size_own, total_batches_own)
-
-                        sampled_indices_own = random.sample(
-                            range(total_batches_own), sample_size_own
-                        )
-                        sampled_indices_own = sorted(
-                            sampled_indices_own
-                        )  # Sort for sequential access
-
-                        tplr.log_with_context(
-                            level="info",
-                            message=f"Evaluating {sample_size_own}/{total_batches_own} batches ({self.hparams.validator_sample_rate * 100:.1f}%)",
-                            sync_window=self.sync_window,
-                            current_window=self.current_window,
-                            eval_uid=eval_uid,
-                        )
-
-                        loss_before_own, n_batches = self.evaluate_model_on_batches(
-                            model_own_data_eval, batches_own, sampled_indices_own
-                        )
+                    batches_own = eval_data.batches
+                    tplr.log_with_context(
+                        level="info",
+                        message=f"Evaluating {len(eval_data)}/{eval_data.total} batches ({self.hparams.validator_sample_rate * 100:.1f}%)",
+                        sync_window=self.sync_window,
+                        current_window=self.current_window,
+                        eval_uid=eval_uid,
+                    )
+                    loss_before_own, n_batches = self.evaluate_model_on_batches(
+                        model_own_data_eval, batches_own
+                    )
 
                     # TODO: Skip evaluation if no valid batches were processed
                     if n_batches == 0:
@@ -1544,7 +1450,9 @@ class Validator:
                         self.optimizer.zero_grad()
                         model_own_data_eval.zero_grad()
 
-                        # First validate all gradients before applying any
+                        # First validate all gradients before applying any,
+                        # with a single device sync for the whole peer
+                        to_check = {}
                         for n, p in model_own_data_eval.named_parameters():
                             idxs_key = n + "idxs"
                             vals_key = n + "vals"
@@ -1558,90 +1466,49 @@ class Validator:
                                 and vals is not None
                                 and quant_params is not None
                             ):
-                                # Move tensors to device
-                                idxs = idxs.to(self.config.device)
-                                vals = vals.to(self.config.device)
-
-                                # Validate indices are within bounds
-                                if self.totalks.get(n) is None:
-                                    tplr.log_with_context(
-                                        level="warning",
-                                        message=f"Missing totalk for parameter {n}, skipping peer {eval_uid}",
-                                        sync_window=self.sync_window,
-                                        current_window=self.current_window,
-                                        eval_uid=eval_uid,
-                                    )
-                                    raise ValueError(
-                                        f"Invalid gradient data from peer {eval_uid}: Missing totalk for parameter {n}"
-                                    )
-
-                                # Check compressed indices are valid
-                                self.comms.check_compressed_indices(
-                                    idxs_key,
-                                    idxs,
-                                    self.totalks[n],
-                                    allowed_topk=self.hparams.topk_compression,
-                                )
+                                to_check[idxs_key] = idxs.to(self.config.device)
+                                to_check[vals_key] = vals.to(self.config.device)
 
-                                # Check for NaN or Inf values
-                                if torch.isnan(vals).any() or torch.isinf(vals).any():
-                                    tplr.log_with_context(
-                                        level="warning",
-                                        message=f"Values contain NaN or Inf for parameter {vals_key}, skipping peer {eval_uid}",
-                                        sync_window=self.sync_window,
-                                        current_window=self.current_window,
-                                        eval_uid=eval_uid,
-                                    )
-                                    raise ValueError(
-                                        f"Invalid gradient data from peer {eval_uid}: NaN or Inf values in {vals_key}"
-                                    )
+                        (valid,), (first_bad,) = self.comms.check_compressed_batch(
+                            [to_check],
+                            self.totalks,
+                            allowed_topk=self.hparams.topk_compression,
+                        )
+                        if not valid:
+                            param_name, reason = first_bad
+                            tplr.log_with_context(
+                                level="warning",
+                                message=f"Compressed gradient check failed for {param_name}: {reason}, skipping peer {eval_uid}",
+                                sync_window=self.sync_window,
+                                current_window=self.current_window,
+                                eval_uid=eval_uid,
+                            )
+                            raise ValueError(
+                                f"Invalid gradient data from peer {eval_uid}: {reason}"
+                            )
 
                         # If all validations pass, apply the gradients
-                        for n, p in model_own_data_eval.named_parameters():
-                            idxs_key = n + "idxs"
-                            vals_key = n + "vals"
-                            quant_key = n + "quant_params"
-                            idxs = state_dict.get(idxs_key, None)
-                            vals = state_dict.get(vals_key, None)
-                            quant_params = state_dict.get(quant_key, None)
-
-                            if (
-                                idxs is not None
-                                and vals is not None
-                                and quant_params is not None
-                            ):
-                                idxs = idxs.to(self.config.device)
-                                vals = vals.to(self.config.device)
-
-                                grad = self.transformer.decode(
-                                    self.compressor.decompress(
-                                        p.to(self.config.device),
-                                        idxs,
-                                        vals,
-                                        self.xshapes[n],
-                                        self.totalks[n],
-                                        quant_params,
-                                    )
-                                ).to(self.config.device)
-
-                                # Final safety check on the gradient itself
-                                if torch.isnan(grad).any() or torch.isinf(grad).any():
-                                    tplr.log_with_context(
-                                        level="warning",
-                                        message=f"Decompressed gradient for {n} contains NaN/Inf, skipping peer {eval_uid}",
-                                        sync_window=self.sync_window,
-                                        current_window=self.current_window,
-                                        eval_uid=eval_uid,
-                                    )
-                                    raise ValueError(
-                                        f"Invalid gradient from peer {eval_uid}: NaN or Inf in decompressed gradient for {n}"
-                                    )
-
-                                p.data.sub_(
-                                    grad.sign(),
-                                    alpha=self.scheduler.get_last_lr()[0]
-                                    * self.hparams.eval_lr_factor,
+                        for (n, p), grad in self.decode_peer_gradient(
+                            model_own_data_eval, state_dict
+                        ):
+                            # Final safety check on the gradient itself
+                            if torch.isnan(grad).any() or torch.isinf(grad).any():
+                                tplr.log_with_context(
+                                    level="warning",
+                                    message=f"Decompressed gradient for {n} contains NaN/Inf, skipping peer {eval_uid}",
+                                    sync_window=self.sync_window,
+                                    current_window=self.current_window,
+                                    eval_uid=eval_uid,
+                                )
+                                raise ValueError(
+                                    f"Invalid gradient from peer {eval_uid}: NaN or Inf in decompressed gradient for {n}"
                                 )
+
+                            p.data.sub_(
+                                grad.sign(),
+                                alpha=self.scheduler.get_last_lr()[0]
+                                * self.hparams.eval_lr_factor,
+                            )
                     except Exception as e:
                         old_score = self.final_scores[eval_uid].item()
 
@@ -1707,17 +1574,17 @@ class Validator:
                     self.optimizer.zero_grad()
                     model_own_data_eval.zero_grad()
                     loss_after_own, n_batches = self.evaluate_model_on_batches(
-                        model_own_data_eval, batches_own, sampled_indices_own
+                        model_own_data_eval, batches_own
                     )
 
                     # Clean up stored batches
                     del (
                         batches_own,
                         local_pages,
-                        loader_own,
                         model_own_data_eval,
-                        loader_data,
+                        eval_data,
                     )
+                    self.eval_data.release(eval_uid)
                     torch.cuda.empty_cache()
 
                     self.loss_after_per_batch_own = (
@@ -1762,63 +1629,23 @@ class Validator:
                     # 7. Use common random loader for evaluation
                     model_random_data_eval = copy.deepcopy(self.model)
 
-                    loader_random = common_loader_random
+                    batches_random = random_data.batches
 
-                    # 8. Compute initial loss
+                    # 8. Compute initial loss (once per window, see above)
                     self.optimizer.zero_grad()
                     model_random_data_eval.zero_grad()
-                    with torch.no_grad():
-                        model_random_data_eval.eval()
-                        # Sample random batches from the loader
-                        batches_random = []
-                        for batch in loader_random:
-                            batches_random.append(batch)
-
-                        total_batches_random = len(batches_random)
-
-                        # TODO: Skip evaluation without penalty if no random batches available
-                        if total_batches_random == 0:
-                            tplr.log_with_context(
-                                level="warning",
-                                message=f"No random batches available for UID {eval_uid}, skipping evaluation without penalty (validator data issue)",
-                                sync_window=self.sync_window,
-                                current_window=self.current_window,
-                                eval_uid=eval_uid,
-                            )
-                            continue
-
-                        sample_size_random = max(
-                            1,
-                            int(
-                                total_batches_random
-                                * self.hparams.validator_sample_rate
-                            ),
-                        )
-                        # TODO: Ensure sample size doesn't exceed population size
-                        sample_size_random = min(
-                            sample_size_random, total_batches_random
-                        )
-
-                        sampled_indices_random = random.sample(
-                            range(total_batches_random), sample_size_random
-                        )
-                        sampled_indices_random = sorted(
-                            sampled_indices_random
-                        )  # Sort for sequential access
-
+                    if loss_before_random_shared is None:
                         tplr.log_with_context(
                             level="info",
-                            message=f"Evaluating {sample_size_random}/{total_batches_random} batches ({self.hparams.validator_sample_rate * 100:.1f}%)",
+                            message=f"Evaluating {len(random_data)}/{random_data.total} random batches ({self.hparams.validator_sample_rate * 100:.1f}%)",
                             sync_window=self.sync_window,
                             current_window=self.current_window,
                             eval_uid=eval_uid,
                         )
-
-                        loss_before_random, n_batches = self.evaluate_model_on_batches(
-                            model_random_data_eval,
-                            batches_random,
-                            sampled_indices_random,
+                        loss_before_random_shared = self.evaluate_model_on_batches(
+                            model_random_data_eval, batches_random
                         )
+                    loss_before_random, n_batches = loss_before_random_shared
 
                     # TODO: Skip evaluation if no valid random batches were processed
                     if n_batches == 0:
@@ -1846,38 +1673,14 @@ class Validator:
                         self.optimizer.zero_grad()
                         model_random_data_eval.zero_grad()
 
-                        for n, p in model_random_data_eval.named_parameters():
-                            idxs_key = n + "idxs"
-                            vals_key = n + "vals"
-                            quant_key = n + "quant_params"
-                            idxs = state_dict.get(idxs_key, None)
-                            vals = state_dict.get(vals_key, None)
-                            quant_params = state_dict.get(quant_key, None)
-
-                            if (
-                                idxs is not None
-                                and vals is not None
-                                and quant_params is not None
-                            ):
-                                idxs = idxs.to(self.config.device)
-                                vals = vals.to(self.config.device)
-
-                                grad = self.transformer.decode(
-                                    self.compressor.decompress(
-                                        p.to(self.config.device),
-                                        idxs,
-                                        vals,
-                                        self.xshapes[n],
-                                        self.totalks[n],
-                                        quant_params,
-                                    )
-                                ).to(self.config.device)
-
-                                p.data.sub_(
-                                    grad.sign(),
-                                    alpha=self.scheduler.get_last_lr()[0]
-                                    * self.hparams.eval_lr_factor,
-                                )
+                        for (n, p), grad in self.decode_peer_gradient(
+                            model_random_data_eval, state_dict
+                        ):
+                            p.data.sub_(
+                                grad.sign(),
+                                alpha=self.scheduler.get_last_lr()[0]
+                                * self.hparams.eval_lr_factor,
+                            )
                     except Exception as e:
                         tplr.log_with_context(
                             level="error",
@@ -1892,9 +1695,7 @@ class Validator:
                     self.optimizer.zero_grad()
                     model_random_data_eval.zero_grad()
                     loss_after_random, n_batches = self.evaluate_model_on_batches(
-                        model_random_data_eval,
-                        batches_random,
-                        sampled_indices_random,
+                        model_random_data_eval, batches_random
                     )
 
                     # Clean up stored batches, loader & pages
@@ -2109,19 +1910,9 @@ class Validator:
                     current_window=self.current_window,
                 )
 
-            # Cancel any remaining preload task if exiting the loop early
-            if (
-                next_uid_dataloader_task is not None
-                and not next_uid_dataloader_task.done()
-            ):
-                next_uid_dataloader_task.cancel()
-                try:
-                    await next_uid_dataloader_task
-                except asyncio.CancelledError:
-                    pass
-
-            # Clean up common random loader
-            del common_loader_random
+            # Drop the window's evaluation data, cancelling any load still running
+            self.eval_data.stop()
+            del random_data
             torch.cuda.empty_cache()
 
             self.update_openskill_ratings()
@@ -2407,6 +2198,11 @@ class Validator:
                     "model_update_time": float(tplr.T() - update_start),
                     "total_peers": int(len(self.comms.peers)),
                     "total_skipped": int(total_skipped),
+                    "activity_index_staleness": float(
+                        self.comms.activity_index.staleness()
+                    ),
+                    "object_cache_hits": int(self.comms.object_cache.hits),
+                    "object_cache_misses": int(self.comms.object_cache.misses),
                 },
                 with_system_metrics=True,
                 with_gpu_metrics=True,
@@ -2689,6 +2485,10 @@ class Validator:
                 return False
 
             tensors_applied = 0
+            # Plain SGD on a ±1 gradient is a signed lr step: apply it straight
+            # from the packed bits instead of unpacking into param.grad
+            fused = tplr.neurons.sign_sgd_fusable(self.optimizer)
+            lr = self.optimizer.param_groups[0]["lr"]
 
             for name, param in self.model.named_parameters():
                 if name in state_dict:
@@ -2696,6 +2496,13 @@ class Validator:
                     if packed_tensor is None:
                         continue
 
+                    if fused:
+                        tplr.neurons.apply_packed_sign_update_(
+                            param.data, packed_tensor, lr
+                        )
+                        tensors_applied += 1
+                        continue
+
                     # Unpack binary tensor
                     unpacked_tensor = tplr.neurons.unpack_binary_tensor(
                         packed_tensor, param.shape
@@ -2721,7 +2528,8 @@ class Validator:
                 )
 
                 # Update parameters with optimizer
-                self.optimizer.step()
+                if not fused:
+                    self.optimizer.step()
                 self.scheduler.step()
                 torch.cuda.empty_cache()
 
@@ -2750,6 +2558,33 @@ class Validator:
             )
             return False
 
+    def decode_peer_gradient(self, model: torch.nn.Module, state_dict: dict):
+        """
+        Yield ``((name, param), grad)`` for each parameter of ``model`` present
+        in one peer's compressed ``state_dict``, decoded through the batched
+        DCT a bounded batch at a time.
+        """
+
+        def decompressed():
+            for n, p in model.named_parameters():
+                idxs = state_dict.get(n + "idxs", None)
+                vals = state_dict.get(n + "vals", None)
+                quant_params = state_dict.get(n + "quant_params", None)
+                if idxs is not None and vals is not None and quant_params is not None:
+                    yield (
+                        (n, p),
+                        self.compressor.decompress(
+                            p.to(self.config.device),
+                            idxs.to(self.config.device),
+                            vals.to(self.config.device),
+                            self.xshapes[n],
+                            self.totalks[n],
+                            quant_params,
+                        ),
+                    )
+
+        return self.transformer.decode_iter(decompressed())
+
     def apply_gathered_gradients(self, gather_result: SimpleNamespace):
         """
         Apply gathered gradients from peers to the model.
@@ -2764,21 +2599,27 @@ class Validator:
             gather_result: The result object from a gather operation containing
                           compressed gradients from peers
         """
-        for n, p in self.model.named_parameters():
-            idxs_key = n + "idxs"
-            vals_key = n + "vals"
-            quant_key = n + "quant_params"
-
-            idxs = getattr(gather_result.state_dict, idxs_key, None)
-            vals = getattr(gather_result.state_dict, vals_key, None)
-            quant_params = getattr(gather_result.state_dict, quant_key, None)
-            if idxs is not None and vals is not None:
-                if not isinstance(idxs, (list, tuple)):
-                    idxs = [idxs]
-                if not isinstance(vals, (list, tuple)):
-                    vals = [vals]
-                new_grad = self.transformer.decode(
-                    self.compressor.batch_decompress(
+        accumulator = getattr(gather_result, "accumulator", None)
+
+        def decompressed_grads():
+            for n, p in self.model.named_parameters():
+                idxs_key = n + "idxs"
+                vals_key = n + "vals"
+                quant_key = n + "quant_params"
+
+                idxs = getattr(gather_result.state_dict, idxs_key, None)
+                vals = getattr(gather_result.state_dict, vals_key, None)
+                quant_params = getattr(gather_result.state_dict, quant_key, None)
+                decompressed = None
+                if accumulator is not None:
+                    # Peers were already folded into a running mean during gather
+                    decompressed = accumulator.result(n)
+                elif idxs is not None and vals is not None:
+                    if not isinstance(idxs, (list, tuple)):
+                        idxs = [idxs]
+                    if not isinstance(vals, (list, tuple)):
+                        vals = [vals]
+                    decompressed = self.compressor.batch_decompress(
                         p.to(self.config.device),
                         cast(list[torch.Tensor], idxs),
                         cast(list[torch.Tensor], vals),
@@ -2786,19 +2627,23 @@ class Validator:
                         self.totalks[n],
                         quant_params,
                     )
-                )
-                if p.grad is None:
-                    p.grad = new_grad
+                if decompressed is not None:
+                    yield p, decompressed.to(p.dtype)
                 else:
-                    p.grad.copy_(new_grad)
-                p.grad.sign_()
+                    tplr.log_with_context(
+                        level="info",
+                        message=f"Gradient data missing for parameter {n}, skipping.",
+                        sync_window=self.sync_window,
+                        current_window=self.current_window,
+                    )
+
+        # Decode through the batched DCT, a bounded batch at a time
+        for p, new_grad in self.transformer.decode_iter(decompressed_grads()):
+            if p.grad is None:
+                p.grad = new_grad
             else:
-                tplr.log_with_context(
-                    level="info",
-                    message=f"Gradient data missing for parameter {n}, skipping.",
-                    sync_window=self.sync_window,
-                    current_window=self.current_window,
-                )
+                p.grad.copy_(new_grad)
+            p.grad.sign_()
         self.optimizer.step()
         self.scheduler.step()
         torch.cuda.empty_cache()
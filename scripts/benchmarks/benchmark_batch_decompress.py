@@ -0,0 +1,84 @@
+# ruff: noqa
+"""
+benchmark_batch_decompress.py
+
+Compare the per-peer CompressDCT batch_decompress loop with the vectorised
+stacked implementation for several peer counts.
+
+Usage:
+    python scripts/benchmarks/benchmark_batch_decompress.py --rows 4096 \
+        --cols 4096 --peers 1 5 15 50 --iterations 5
+"""
+
+import argparse
+import time
+
+import torch
+
+from tplr.compress import CompressDCT, TransformDCT
+
+
+def _time(fn, iterations, device):
+    fn()  # warm-up
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch_decompress")
+    parser.add_argument("--rows", type=int, default=4096)
+    parser.add_argument("--cols", type=int, default=4096)
+    parser.add_argument("--target-chunk", type=int, default=64)
+    parser.add_argument("--topk", type=int, default=32)
+    parser.add_argument("--peers", type=int, nargs="+", default=[1, 5, 15, 50])
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--device", type=str, default="cpu")
+    args = parser.parse_args()
+
+    device = torch.device(args.device)
+    weight = torch.nn.Linear(args.cols, args.rows, bias=False).to(device)
+    transformer = TransformDCT(weight, target_chunk=args.target_chunk)
+    compressor = CompressDCT(use_quantization=True)
+    p = weight.weight.data
+
+    # One compressed payload per peer, as gather() hands them over
+    payloads = [
+        compressor.compress(transformer.encode(torch.randn_like(p)), args.topk)
+        for _ in range(max(args.peers))
+    ]
+    xshape, totalk = payloads[0][2], payloads[0][3]
+
+    print(f"\n{args.rows}x{args.cols}, topk={args.topk}, device={device}")
+    print(f"{'Peers':>6} {'Loop (ms)':>10} {'Stacked (ms)':>13} {'Speedup':>8}")
+    print("-" * 40)
+    for n_peers in args.peers:
+        idxs = [payload[0] for payload in payloads[:n_peers]]
+        vals = [payload[1] for payload in payloads[:n_peers]]
+        qparams = [payload[4] for payload in payloads[:n_peers]]
+
+        loop_time = _time(
+            lambda: compressor._batch_decompress_loop(
+                p, idxs, vals, xshape, totalk, qparams
+            ),
+            args.iterations,
+            device,
+        )
+        stacked_time = _time(
+            lambda: compressor.batch_decompress(p, idxs, vals, xshape, totalk, qparams),
+            args.iterations,
+            device,
+        )
+        print(
+            f"{n_peers:>6} {loop_time * 1e3:>10.1f} {stacked_time * 1e3:>13.1f} "
+            f"{loop_time / stacked_time:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# ruff: noqa
+"""
+benchmark_binary_pack.py
+
+Throughput of pack_binary_tensor/unpack_binary_tensor over a 7B-parameter
+model, compared with the original implementations (eight strided ORs to
+pack, a stack of eight shifted copies to unpack). The model is simulated
+as repeated layer-sized buffers, so host memory stays at one layer.
+
+Usage:
+    python scripts/benchmarks/benchmark_binary_pack.py --total-params 7e9 \
+        --layer-params 45088768 --device cpu
+"""
+
+import argparse
+import math
+import time
+
+import torch
+
+from tplr.neurons import pack_binary_tensor, unpack_binary_tensor
+
+
+def legacy_pack(tensor, device):
+    tensor = (tensor > 0).to(torch.uint8).view(-1)
+    packed = torch.zeros((tensor.shape[0] + 7) // 8, dtype=torch.uint8, device=device)
+    for i in range(8):
+        packed |= tensor[i::8] << i
+    return packed
+
+
+def legacy_unpack(packed, shape):
+    n_vals = math.prod(shape)
+    bits = torch.stack([(packed >> i) & 1 for i in range(8)], dim=1).reshape(-1)
+    return bits[:n_vals].to(torch.float32).mul_(2).sub_(1).reshape(shape)
+
+
+def _run(fn, layers, device):
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+    start = time.perf_counter()
+    for _ in range(layers):
+        fn()
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark 1-bit pack/unpack")
+    parser.add_argument("--total-params", type=float, default=7e9)
+    parser.add_argument("--layer-params", type=int, default=4096 * 11008)
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    device = torch.device(args.device)
+    layers = math.ceil(args.total_params / args.layer_params)
+    shape = (args.layer_params,)
+    signs = torch.randn(shape, device=device).sign()
+    packed = pack_binary_tensor(signs, device)
+    assert torch.equal(unpack_binary_tensor(packed, shape), signs.float())
+
+    results = {
+        "pack": _run(lambda: pack_binary_tensor(signs, device), layers, device),
+        "unpack": _run(lambda: unpack_binary_tensor(packed, shape), layers, device),
+    }
+    if not args.skip_legacy and args.layer_params % 8 == 0:
+        results["legacy pack"] = _run(
+            lambda: legacy_pack(signs, device), layers, device
+        )
+        results["legacy unpack"] = _run(
+            lambda: legacy_unpack(packed, shape), layers, device
+        )
+
+    total = layers * args.layer_params
+    print(
+        f"\n{total / 1e9:.2f}B params as {layers} x {args.layer_params}, device={device}"
+    )
+    for name, seconds in results.items():
+        print(f"{name:>14}: {seconds:7.2f} s  {total / seconds / 1e9:6.2f} Gparam/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -56,7 +56,7 @@ class PageBenchmark:
 
                 for batch in loader:
                     batch_start = time.time()
-                    input_ids = torch.tensor(batch, dtype=torch.long)
+                    input_ids = torch.as_tensor(batch, dtype=torch.long)
                     total_tokens += input_ids.numel()
                     batch_times.append(time.time() - batch_start)
 
@@ -0,0 +1,119 @@
+# ruff: noqa
+"""
+benchmark_dct.py
+
+Compare the per-parameter TransformDCT.encode/decode loop with the bucketed
+encode_batch/decode_batch engine on a Llama-shaped parameter set.
+
+Usage:
+    python scripts/benchmarks/benchmark_dct.py --hidden-size 1024 \
+        --intermediate-size 3584 --num-layers 4 --iterations 5
+"""
+
+import argparse
+import time
+
+import torch
+
+from tplr.compress import TransformDCT
+
+
+class FakeLlama(torch.nn.Module):
+    """Parameter container with Llama-like shapes (no forward pass needed)."""
+
+    def __init__(self, hidden, intermediate, kv_hidden, layers, vocab):
+        super().__init__()
+        self.embed = torch.nn.Parameter(torch.empty(vocab, hidden))
+        self.layers = torch.nn.ParameterList()
+        for _ in range(layers):
+            self.layers.extend(
+                [
+                    torch.nn.Parameter(torch.empty(hidden, hidden)),  # q
+                    torch.nn.Parameter(torch.empty(kv_hidden, hidden)),  # k
+                    torch.nn.Parameter(torch.empty(kv_hidden, hidden)),  # v
+                    torch.nn.Parameter(torch.empty(hidden, hidden)),  # o
+                    torch.nn.Parameter(torch.empty(intermediate, hidden)),  # gate
+                    torch.nn.Parameter(torch.empty(intermediate, hidden)),  # up
+                    torch.nn.Parameter(torch.empty(hidden, intermediate)),  # down
+                    torch.nn.Parameter(torch.empty(hidden)),  # input norm
+                    torch.nn.Parameter(torch.empty(hidden)),  # post-attn norm
+                ]
+            )
+        self.norm = torch.nn.Parameter(torch.empty(hidden))
+        self.lm_head = torch.nn.Parameter(torch.empty(vocab, hidden))
+
+
+def _time(fn, iterations, device):
+    fn()  # warm-up (basis caching, allocator)
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched DCT engine")
+    parser.add_argument("--hidden-size", type=int, default=1024)
+    parser.add_argument("--intermediate-size", type=int, default=3584)
+    parser.add_argument("--kv-hidden-size", type=int, default=256)
+    parser.add_argument("--num-layers", type=int, default=4)
+    parser.add_argument("--vocab-size", type=int, default=8192)
+    parser.add_argument("--target-chunk", type=int, default=64)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--device", type=str, default="cpu")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    device = torch.device(args.device)
+    model = FakeLlama(
+        args.hidden_size,
+        args.intermediate_size,
+        args.kv_hidden_size,
+        args.num_layers,
+        args.vocab_size,
+    ).to(device)
+    for p in model.parameters():
+        torch.nn.init.normal_(p)
+
+    transformer = TransformDCT(model, target_chunk=args.target_chunk)
+    params = [p.data for p in model.parameters()]
+    n_elems = sum(p.numel() for p in params)
+    encoded = [transformer.encode(p) for p in params]
+
+    results = {
+        "encode loop": _time(
+            lambda: [transformer.encode(p) for p in params], args.iterations, device
+        ),
+        "encode batch": _time(
+            lambda: transformer.encode_batch(params), args.iterations, device
+        ),
+        "decode loop": _time(
+            lambda: [transformer.decode(e) for e in encoded], args.iterations, device
+        ),
+        "decode batch": _time(
+            lambda: transformer.decode_batch(encoded), args.iterations, device
+        ),
+    }
+
+    print(
+        f"\n{len(params)} parameters, {n_elems / 1e6:.1f}M elements, "
+        f"device={device}, {torch.get_num_threads()} threads"
+    )
+    print(f"{'Mode':<14} {'Time (ms)':>10} {'Melem/s':>10}")
+    print("-" * 36)
+    for mode, secs in results.items():
+        print(f"{mode:<14} {secs * 1e3:>10.1f} {n_elems / secs / 1e6:>10.1f}")
+    for direction in ("encode", "decode"):
+        speedup = results[f"{direction} loop"] / results[f"{direction} batch"]
+        print(f"{direction} speedup: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# ruff: noqa
+"""
+benchmark_error_feedback.py
+
+Time the error-feedback step of prepare_gradient_dict: subtracting the
+transmitted top-k gradient from the momentum. Compares the dense path
+(decompress + decode + sub_) with CompressDCT.subtract_transmitted_, which
+rebuilds the residual straight from the sparse payload.
+
+Usage:
+    python scripts/benchmarks/benchmark_error_feedback.py --rows 14336 \
+        --cols 4096 --topk 32 --iterations 5
+"""
+
+import argparse
+import time
+
+import torch
+
+from tplr.compress import CompressDCT, TransformDCT
+
+
+def _time(fn, iterations, device):
+    fn()  # warm-up
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark error-feedback update")
+    parser.add_argument("--rows", type=int, default=4096)
+    parser.add_argument("--cols", type=int, default=4096)
+    parser.add_argument("--target-chunk", type=int, default=64)
+    parser.add_argument("--topk", type=int, default=32)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--device", type=str, default="cpu")
+    args = parser.parse_args()
+
+    device = torch.device(args.device)
+    weight = torch.nn.Linear(args.cols, args.rows, bias=False).to(device)
+    transformer = TransformDCT(weight, target_chunk=args.target_chunk)
+    compressor = CompressDCT(use_quantization=True)
+
+    momentum = torch.randn(args.rows, args.cols, device=device)
+    idxs, vals, xshape, totalk, quant_params = compressor.compress(
+        transformer.encode(momentum), args.topk
+    )
+
+    dense_out = momentum.clone()
+    sparse_out = momentum.clone()
+
+    def dense():
+        decompressed = compressor.decompress(
+            momentum, idxs, vals, xshape, totalk, quant_params
+        )
+        dense_out.sub_(transformer.decode(decompressed))
+
+    def sparse():
+        compressor.subtract_transmitted_(
+            sparse_out, transformer, idxs, vals, xshape, quant_params
+        )
+
+    dense_time = _time(dense, args.iterations, device)
+    sparse_time = _time(sparse, args.iterations, device)
+    max_diff = (dense_out - sparse_out).abs().max().item()
+
+    print(
+        f"\n{args.rows}x{args.cols}, topk={args.topk}, "
+        f"chunk={tuple(xshape[2:])}, device={device}"
+    )
+    print(f"dense  (decompress + decode): {dense_time * 1e3:8.1f} ms")
+    print(f"sparse (subtract_transmitted_): {sparse_time * 1e3:6.1f} ms")
+    print(f"speedup: {dense_time / sparse_time:.2f}x, max abs diff: {max_diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()
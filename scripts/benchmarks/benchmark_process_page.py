@@ -1,20 +1,15 @@
-#!/usr/bin/env -S uv run --script
-# /// script
-# requires-python = ">=3.9"
-# dependencies = [
-#   "argparse",
-#   "asyncio",
-#   "pyarrow",
-#   "numpy",
-#   "s3fs",
-# ]
-# ///
+#!/usr/bin/env python3
 """
 benchmark_process_page.py
 
 Benchmark read_row_group and simulated _process_page (I/O + processing)
 on local Parquet files.
 
+Tokenization runs on the I/O thread pool by default, as in R2DatasetLoader;
+--tokenize-processes N moves it to a tplr.tokenize_pool.TokenizePool of N
+worker processes. --tokenizer loads a real HuggingFace tokenizer instead of
+the mock one, which matters when comparing the two.
+
 Usage:
     benchmark_process_page.py --parquet-files file1.parquet file2.parquet \
     --iterations 20 \
@@ -22,6 +17,10 @@ Usage:
     --rows-per-page 200 \
     --output my_benchmark_results.json \
     --debug
+
+    # Same pages, tokenized in 8 worker processes
+    benchmark_process_page.py --parquet-files file1.parquet \
+    --tokenizer togethercomputer/LLaMA-2-7B-32K --tokenize-processes 8
 """
 
 import argparse
@@ -39,6 +38,8 @@ import pyarrow
 import pyarrow.parquet as pq
 import s3fs
 
+from tplr.tokenize_pool import TokenizePool, tokenize_texts
+
 # Configure pyarrow for optimal performance
 pyarrow.set_io_thread_count(os.cpu_count())
 
@@ -296,6 +297,8 @@ class R2DatasetBenchmark:
         s3_config=None,
         num_rows_per_page=100,
         debug=False,
+        tokenizer=None,
+        tokenize_processes=0,
     ):
         self.parquet_files = parquet_files
         self.metadata_file = metadata_file
@@ -315,7 +318,12 @@ class R2DatasetBenchmark:
         self._fs_cache = {}
         self._executor = None
         self._fs_lock = threading.Lock()
-        self.mock_tokenizer = MockTokenizer()
+        self.mock_tokenizer = tokenizer if tokenizer is not None else MockTokenizer()
+        self.tokenize_pool = (
+            TokenizePool(self.mock_tokenizer, max_workers=tokenize_processes)
+            if tokenize_processes > 0
+            else None
+        )
 
     def debug_log(self, message):
         """Log debug messages if debug mode is enabled"""
@@ -509,7 +517,9 @@ class R2DatasetBenchmark:
 
                     # Store results
                     config_results["total_times"].append(elapsed_ms)
-                    config_results["token_counts"].append(len(tokens) if tokens else 0)
+                    config_results["token_counts"].append(
+                        len(tokens) if tokens is not None else 0
+                    )
 
                     # Get profiler stats for specific functions
                     stats = _profiler.get_stats()
@@ -555,7 +565,7 @@ class R2DatasetBenchmark:
                     print(
                         f"    Total: {elapsed_ms:.2f}ms (I/O: {io_time:.2f}ms [{io_percent:.1f}%], "
                         f"Processing: {elapsed_ms - io_time:.2f}ms [{processing_percent:.1f}%]), "
-                        f"Tokens: {len(tokens) if tokens else 0}"
+                        f"Tokens: {len(tokens) if tokens is not None else 0}"
                     )
 
                 except Exception as e:
@@ -728,34 +738,15 @@ class R2DatasetBenchmark:
     @_profiler.profile("_batch_tokenize")
     async def _batch_tokenize(self, texts):
         """Tokenize a batch of texts (simulating R2DatasetLoader._batch_tokenize)"""
-
-        def _tokenize_batch():
-            all_tokens = []
-
-            chunk_size = 128  # Process in chunks for better efficiency
-            for i in range(0, len(texts), chunk_size):
-                chunk = texts[i : i + chunk_size]
-
-                # Tokenize
-                batch_tokens = self.mock_tokenizer(
-                    chunk,
-                    padding=False,
-                    truncation=True,
-                    max_length=self.sequence_length,
-                    return_tensors=None,
-                )
-
-                # Process results
-                for tokens in batch_tokens["input_ids"]:
-                    if tokens:
-                        all_tokens.extend(tokens)
-                        if tokens[-1] != self.mock_tokenizer.eos_token_id:
-                            all_tokens.append(self.mock_tokenizer.eos_token_id)
-
-            return all_tokens
+        if self.tokenize_pool is not None:
+            return await asyncio.wrap_future(
+                self.tokenize_pool.submit(texts, self.sequence_length)
+            )
 
         executor = self.get_executor()
-        return await asyncio.get_event_loop().run_in_executor(executor, _tokenize_batch)
+        return await asyncio.get_event_loop().run_in_executor(
+            executor, tokenize_texts, self.mock_tokenizer, texts, self.sequence_length
+        )
 
     def __del__(self):
         """Clean up resources"""
@@ -764,6 +755,8 @@ class R2DatasetBenchmark:
 
         self._parquet_cache.clear()
         self._token_cache.clear()
+        if self.tokenize_pool is not None:
+            self.tokenize_pool.shutdown()
 
 
 async def main():
@@ -800,6 +793,18 @@ async def main():
     parser.add_argument(
         "--rows-per-page", type=int, default=100, help="Number of rows per page"
     )
+    parser.add_argument(
+        "--tokenizer",
+        type=str,
+        default=None,
+        help="HuggingFace tokenizer to use instead of the mock tokenizer",
+    )
+    parser.add_argument(
+        "--tokenize-processes",
+        type=int,
+        default=0,
+        help="Tokenize in a process pool of this size (0 = I/O thread pool)",
+    )
 
     # S3 options
     parser.add_argument(
@@ -861,9 +866,16 @@ async def main():
         f"Starting benchmark with {len(valid_files)} parquet files, {args.iterations} iterations per file"
     )
     print(
-        f"Configuration: sequence_length={args.sequence_length}, rows_per_page={args.rows_per_page}"
+        f"Configuration: sequence_length={args.sequence_length}, rows_per_page={args.rows_per_page}, "
+        f"tokenize_processes={args.tokenize_processes}"
     )
 
+    tokenizer = None
+    if args.tokenizer:
+        from transformers import AutoTokenizer
+
+        tokenizer = AutoTokenizer.from_pretrained(args.tokenizer)
+
     # Create benchmark instance
     benchmark = R2DatasetBenchmark(
         parquet_files=valid_files,
@@ -874,6 +886,8 @@ async def main():
         s3_config=s3_config,
         num_rows_per_page=args.rows_per_page,
         debug=args.debug,
+        tokenizer=tokenizer,
+        tokenize_processes=args.tokenize_processes,
     )
 
     # Run benchmark
@@ -0,0 +1,152 @@
+# ruff: noqa
+"""
+benchmark_s3_get.py
+
+Compare the two peer-download request patterns against a local moto S3
+server:
+
+  head+get   HEAD the object, check LastModified against [time_min, time_max],
+             then GET it (the old Comms.s3_get_object behaviour)
+  cond-get   a single GET carrying If-Modified-Since / If-Unmodified-Since,
+             reading LastModified/ContentLength from the GET response
+
+Every S3 call is delayed by --rtt-ms to model the WAN round trip to a peer's
+R2 bucket. Each scenario fetches --peers objects concurrently, as gather does,
+and reports requests issued and wall time per round.
+
+Requires moto's server extra:  pip install "moto[server]"
+
+Usage:
+    python scripts/benchmarks/benchmark_s3_get.py --peers 15 --size-kb 512 \
+        --rtt-ms 40 --rounds 5
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from aiobotocore.session import get_session
+from botocore.exceptions import ClientError
+from moto.server import ThreadedMotoServer
+
+BUCKET = "bench"
+
+
+class CountingClient:
+    """Wraps an aiobotocore client, adding a fixed RTT and counting calls."""
+
+    def __init__(self, client, rtt):
+        self.client = client
+        self.rtt = rtt
+        self.calls = 0
+
+    def __getattr__(self, name):
+        method = getattr(self.client, name)
+
+        async def call(**kwargs):
+            self.calls += 1
+            await asyncio.sleep(self.rtt)
+            return await method(**kwargs)
+
+        return call
+
+
+async def head_then_get(client, key, time_min, time_max):
+    head = await client.head_object(Bucket=BUCKET, Key=key)
+    last_modified = head["LastModified"]
+    if last_modified < time_min:
+        return "TOO_EARLY"
+    if last_modified > time_max:
+        return "TOO_LATE"
+    response = await client.get_object(Bucket=BUCKET, Key=key)
+    async with response["Body"] as stream:
+        return len(await stream.read())
+
+
+async def conditional_get(client, key, time_min, time_max):
+    try:
+        response = await client.get_object(
+            Bucket=BUCKET,
+            Key=key,
+            IfModifiedSince=(time_min - timedelta(microseconds=1)).replace(
+                microsecond=0
+            ),
+            IfUnmodifiedSince=time_max.replace(microsecond=0),
+        )
+    except ClientError as e:
+        status = e.response["ResponseMetadata"]["HTTPStatusCode"]
+        return {304: "TOO_EARLY", 412: "TOO_LATE"}.get(status, status)
+    if response["LastModified"] > time_max:  # endpoint ignored the condition
+        response["Body"].close()
+        return "TOO_LATE"
+    async with response["Body"] as stream:
+        return len(await stream.read())
+
+
+async def run(args):
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=args.port)
+    server.start()
+    try:
+        session = get_session()
+        async with session.create_client(
+            "s3",
+            endpoint_url=f"http://127.0.0.1:{args.port}",
+            region_name="us-east-1",
+            aws_access_key_id="bench",
+            aws_secret_access_key="bench",
+        ) as raw:
+            await raw.create_bucket(Bucket=BUCKET)
+            payload = os.urandom(args.size_kb * 1024)
+            keys = [f"gradient-1-{uid}-v0.pt" for uid in range(args.peers)]
+            for key in keys:
+                await raw.put_object(Bucket=BUCKET, Key=key, Body=payload)
+
+            now = datetime.now(timezone.utc)
+            scenarios = {
+                "in window": (now - timedelta(minutes=5), now + timedelta(minutes=5)),
+                "too early": (now + timedelta(minutes=5), now + timedelta(minutes=10)),
+                "too late": (now - timedelta(minutes=10), now - timedelta(minutes=5)),
+            }
+
+            print(
+                f"\n{args.peers} peers x {args.size_kb}KB, rtt={args.rtt_ms}ms, "
+                f"{args.rounds} rounds"
+            )
+            print(f"{'Scenario':<10} {'Mode':<9} {'Req/obj':>8} {'ms/round':>9}")
+            print("-" * 40)
+            for scenario, (time_min, time_max) in scenarios.items():
+                for mode, fetch in (
+                    ("head+get", head_then_get),
+                    ("cond-get", conditional_get),
+                ):
+                    client = CountingClient(raw, args.rtt_ms / 1e3)
+                    start = time.perf_counter()
+                    for _ in range(args.rounds):
+                        results = await asyncio.gather(
+                            *[fetch(client, k, time_min, time_max) for k in keys]
+                        )
+                    elapsed = (time.perf_counter() - start) / args.rounds
+                    assert len(set(map(str, results))) == 1, results
+                    req = client.calls / (args.rounds * len(keys))
+                    print(f"{scenario:<10} {mode:<9} {req:>8.1f} {elapsed * 1e3:>9.1f}")
+    finally:
+        server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark S3 GET request patterns")
+    parser.add_argument("--peers", type=int, default=15)
+    parser.add_argument("--size-kb", type=int, default=512)
+    parser.add_argument("--rtt-ms", type=float, default=40.0)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--port", type=int, default=5055)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
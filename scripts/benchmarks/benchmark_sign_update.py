@@ -0,0 +1,93 @@
+# ruff: noqa
+"""
+benchmark_sign_update.py
+
+Time applying a 1-bit packed aggregated gradient to a parameter. Compares
+the unpack path (unpack_binary_tensor to float32, copy to param.grad,
+SGD.step) with apply_packed_sign_update_, which steps straight from the
+packed bits chunk by chunk. Also reports peak memory on CUDA.
+
+Usage:
+    python scripts/benchmarks/benchmark_sign_update.py --rows 14336 \
+        --cols 4096 --iterations 5 --device cuda
+"""
+
+import argparse
+import time
+
+import torch
+
+from tplr.neurons import (
+    apply_packed_sign_update_,
+    pack_binary_tensor,
+    unpack_binary_tensor,
+)
+
+
+def _time(fn, iterations, device):
+    fn()  # warm-up
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+        torch.cuda.reset_peak_memory_stats(device)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+    elapsed = (time.perf_counter() - start) / iterations
+    peak = torch.cuda.max_memory_allocated(device) if device.type == "cuda" else 0
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark 1-bit sign updates")
+    parser.add_argument("--rows", type=int, default=4096)
+    parser.add_argument("--cols", type=int, default=4096)
+    parser.add_argument("--lr", type=float, default=4e-4)
+    parser.add_argument("--weight-decay", type=float, default=0.1)
+    parser.add_argument("--chunk-size", type=int, default=1 << 24)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--device", type=str, default="cpu")
+    args = parser.parse_args()
+
+    device = torch.device(args.device)
+    shape = (args.rows, args.cols)
+    packed = pack_binary_tensor(torch.randn(shape).sign(), "cpu")
+
+    unpacked_param = torch.nn.Parameter(torch.randn(shape, device=device))
+    fused_param = unpacked_param.data.clone()
+    optimizer = torch.optim.SGD([unpacked_param], lr=args.lr)
+
+    def unpacked():
+        with torch.no_grad():
+            unpacked_param.mul_(1.0 - args.lr * args.weight_decay)
+        unpacked_param.grad = unpack_binary_tensor(packed, shape).to(device)
+        optimizer.step()
+
+    def fused():
+        apply_packed_sign_update_(
+            fused_param,
+            packed,
+            args.lr,
+            args.weight_decay,
+            chunk_size=args.chunk_size,
+        )
+
+    unpacked_time, unpacked_peak = _time(unpacked, args.iterations, device)
+    unpacked_param.grad = None
+    fused_time, fused_peak = _time(fused, args.iterations, device)
+    max_diff = (unpacked_param.data - fused_param).abs().max().item()
+
+    print(f"\n{args.rows}x{args.cols}, chunk={args.chunk_size}, device={device}")
+    print(f"unpack + SGD.step: {unpacked_time * 1e3:8.1f} ms")
+    print(f"fused packed step: {fused_time * 1e3:8.1f} ms")
+    if device.type == "cuda":
+        print(
+            f"peak memory: {unpacked_peak / 2**20:.0f} MiB vs "
+            f"{fused_peak / 2**20:.0f} MiB"
+        )
+    print(f"speedup: {unpacked_time / fused_time:.2f}x, max abs diff: {max_diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()
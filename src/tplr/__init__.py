@@ -32,6 +32,11 @@ from .r2_dataset import *
 from .hparams import *
 from .logging import *
 from .schemas import *
+from .activity_index import ActivityIndex
+from .prefetch import WindowPrefetcher
+from .eval_data import EvalBatches, EvalDataService
+from .s3_pool import S3ClientPool
+from .wire import *
 from .wandb import initialize_wandb
 from .metrics import *
 from .shard_index import ShardIndex
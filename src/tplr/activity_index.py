@@ -0,0 +1,141 @@
+# The MIT License (MIT)
+# © 2025 tplr.ai
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the "Software"), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+# Global imports
+import re
+import time
+
+# Local imports
+from .schemas import Bucket
+
+GRADIENT_PREFIX = "gradient-"
+_GRADIENT_KEY = re.compile(r"^gradient-(\d+)-(\d+)-v(.+)\.pt$")
+
+
+class ActivityIndex:
+    """
+    In-memory index of the gradient objects present in each peer bucket.
+
+    ``refresh`` lists a bucket's ``gradient-`` keys (paginated, one request per
+    1000 keys) and records the upload time of every ``(window, uid)`` found for
+    ``version``. Activity, upload timestamps and gather readiness are then
+    answered from memory instead of with one HEAD request per key.
+
+    Listings are incremental: each one starts after the oldest retained window,
+    so only the last ``retention_windows`` windows are re-listed. Starting after
+    the last key seen is not safe because keys sort as strings, and a later
+    upload for a lower uid can sort before it.
+
+    Because keys sort as strings, windows with more digits sort before shorter
+    ones. While the retained range spans a power of ten, i.e. for the first
+    ``retention_windows`` windows after one, every listing is a full one.
+    Listings with ``StartAfter`` can also return older windows with fewer digits
+    (``gradient-99-`` sorts after ``gradient-985-``). Every key is therefore
+    kept or dropped by its parsed window, never by its position in the listing.
+    """
+
+    def __init__(self, version: str, retention_windows: int = 10):
+        self.version = version
+        self.retention_windows = retention_windows
+
+        # account/bucket -> {(window, uid): LastModified as POSIX seconds}
+        self._entries: dict[str, dict[tuple[int, int], float]] = {}
+        self._refreshed_at: dict[str, float] = {}
+
+    @staticmethod
+    def bucket_key(bucket: Bucket) -> str:
+        # Bucket names are only unique within an R2 account
+        return f"{bucket.account_id}/{bucket.name}"
+
+    def retain(self, buckets: list[Bucket]) -> None:
+        """Forget every bucket not in ``buckets``, e.g. after commitments change."""
+        keep = {self.bucket_key(bucket) for bucket in buckets}
+        for name in list(self._refreshed_at):
+            if name not in keep:
+                self._entries.pop(name, None)
+                del self._refreshed_at[name]
+
+    def has(self, bucket: Bucket) -> bool:
+        """True once ``bucket`` has been listed at least once."""
+        return self.bucket_key(bucket) in self._refreshed_at
+
+    def _start_after(self, current_window: int) -> str | None:
+        """``StartAfter`` key for a listing, or None while it must be a full one."""
+        floor = max(current_window - self.retention_windows, 0)
+        if len(str(floor)) != len(str(current_window)):
+            return None
+        return f"{GRADIENT_PREFIX}{floor}-"
+
+    async def refresh(self, bucket: Bucket, s3_client, current_window: int) -> int:
+        """
+        List ``bucket`` and merge its recent gradient keys into the index.
+
+        Returns the number of indexed keys. Errors propagate to the caller,
+        which keeps serving the previous (staler) entries for the bucket.
+        """
+        list_args = {"Bucket": bucket.name, "Prefix": GRADIENT_PREFIX}
+        start_after = self._start_after(current_window)
+        if start_after is not None:
+            list_args["StartAfter"] = start_after
+
+        floor = current_window - self.retention_windows
+        found: dict[tuple[int, int], float] = {}
+        paginator = s3_client.get_paginator("list_objects_v2")
+        async for page in paginator.paginate(**list_args):
+            for obj in page.get("Contents", []):
+                match = _GRADIENT_KEY.match(obj["Key"])
+                if match is None or match.group(3) != self.version:
+                    continue
+                window, uid = int(match.group(1)), int(match.group(2))
+                if window >= floor:
+                    found[(window, uid)] = obj["LastModified"].timestamp()
+
+        name = self.bucket_key(bucket)
+        self._entries[name] = found
+        self._refreshed_at[name] = time.time()
+        return len(found)
+
+    def timestamp(self, bucket: Bucket, uid: int, window: int) -> float | None:
+        """Upload time of ``uid``'s gradient for ``window``, or None if not indexed."""
+        return self._entries.get(self.bucket_key(bucket), {}).get(
+            (int(window), int(uid))
+        )
+
+    def is_active(
+        self, bucket: Bucket, uid: int, current_window: int, recent_windows: int
+    ) -> bool:
+        """True if ``uid`` uploaded a gradient in the last ``recent_windows`` windows."""
+        entries = self._entries.get(self.bucket_key(bucket), {})
+        return any(
+            (window, int(uid)) in entries
+            for window in range(current_window - recent_windows, current_window + 1)
+        )
+
+    def ready_uids(self, buckets: dict[int, Bucket], window: int) -> list[int]:
+        """UIDs in ``buckets`` whose gradient for ``window`` is already indexed."""
+        return [
+            uid
+            for uid, bucket in buckets.items()
+            if bucket is not None and self.timestamp(bucket, uid, window) is not None
+        ]
+
+    def staleness(self, now: float | None = None) -> float:
+        """Seconds since the least recently refreshed bucket was listed (-1 if none)."""
+        if not self._refreshed_at:
+            return -1.0
+        now = time.time() if now is None else now
+        return now - min(self._refreshed_at.values())
@@ -0,0 +1,187 @@
+# The MIT License (MIT)
+# © 2025 tplr.ai
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the "Software"), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+# Global imports
+import os
+
+import torch
+
+# A checkpoint ``checkpoint-{window}-{uid}-v{version}`` is a directory (or key
+# prefix) of that name holding ``meta.pt`` (everything but the tensors) and
+# ``shard-NNNNN.pt`` files of roughly ``max_shard_bytes`` each, grouped by layer.
+# The ``{stem}.json`` manifest beside it lists those files and is written last,
+# so a checkpoint only becomes visible once all of its shards are in place.
+CHECKPOINT_FORMAT = "tplr-sharded-v1"
+CHECKPOINT_SHARD_BYTES = 512 * 1024 * 1024  # 512MB per shard file
+META_NAME = "meta.pt"
+
+# Placeholder left in ``meta.pt`` where a tensor was moved into a shard
+TENSOR_REF = "__tplr_tensor__"
+
+
+def checkpoint_stem(window: int, uid, version: str) -> str:
+    """Name shared by a checkpoint's manifest, shard prefix and legacy file."""
+    return f"checkpoint-{window}-{uid}-v{version}"
+
+
+def stem_of(key: str) -> str:
+    """Checkpoint stem of a manifest, shard or legacy single-file key."""
+    if "/" in key:
+        return key.split("/", 1)[0]
+    return os.path.splitext(key)[0]
+
+
+def shard_name(index: int) -> str:
+    return f"shard-{index:05d}.pt"
+
+
+def is_manifest(obj) -> bool:
+    return isinstance(obj, dict) and obj.get("format") == CHECKPOINT_FORMAT
+
+
+def _path_parts(key) -> tuple:
+    # State-dict keys are dotted module paths; split them so layers group
+    if isinstance(key, str):
+        return tuple(key.split("."))
+    return (key,)
+
+
+def _group_of(path: tuple) -> tuple:
+    """Layer a tensor belongs to: its path up to the first numeric component."""
+    for i, part in enumerate(path):
+        if isinstance(part, int) or (isinstance(part, str) and part.isdigit()):
+            return path[: i + 1]
+    return path[:-1]
+
+
+def split_checkpoint(
+    checkpoint: dict, max_shard_bytes: int = CHECKPOINT_SHARD_BYTES
+) -> tuple[dict, list[dict[str, torch.Tensor]]]:
+    """
+    Separate a checkpoint into its tensor-free skeleton and tensor shards.
+
+    Tensors are replaced in the skeleton by ``(TENSOR_REF, name)`` and packed
+    into shards in order, keeping each layer's tensors together; a layer
+    larger than ``max_shard_bytes`` gets a shard of its own.
+    """
+    entries = []  # (group, name, tensor)
+
+    def strip(obj, path):
+        if torch.is_tensor(obj):
+            name = f"t{len(entries)}"
+            entries.append((_group_of(path), name, obj))
+            return (TENSOR_REF, name)
+        if isinstance(obj, dict):
+            return {k: strip(v, path + _path_parts(k)) for k, v in obj.items()}
+        if isinstance(obj, (list, tuple)):
+            items = [strip(v, path + (i,)) for i, v in enumerate(obj)]
+            return items if isinstance(obj, list) else tuple(items)
+        return obj
+
+    skeleton = strip(checkpoint, ())
+
+    # Collect whole layers, then pack layers into shards
+    layers = []
+    for group, name, tensor in entries:
+        if not layers or layers[-1][0] != group:
+            layers.append((group, {}, 0))
+        _, tensors, nbytes = layers[-1]
+        tensors[name] = tensor
+        layers[-1] = (group, tensors, nbytes + tensor.numel() * tensor.element_size())
+
+    shards, shard_bytes = [], 0
+    for _, tensors, nbytes in layers:
+        if not shards or (shard_bytes and shard_bytes + nbytes > max_shard_bytes):
+            shards.append({})
+            shard_bytes = 0
+        shards[-1].update(tensors)
+        shard_bytes += nbytes
+    return skeleton, shards
+
+
+def merge_checkpoint(skeleton, tensors: dict[str, torch.Tensor]):
+    """Inverse of :func:`split_checkpoint`."""
+    if isinstance(skeleton, tuple) and len(skeleton) == 2 and skeleton[0] == TENSOR_REF:
+        return tensors[skeleton[1]]
+    if isinstance(skeleton, dict):
+        return {k: merge_checkpoint(v, tensors) for k, v in skeleton.items()}
+    if isinstance(skeleton, (list, tuple)):
+        items = [merge_checkpoint(v, tensors) for v in skeleton]
+        return items if isinstance(skeleton, list) else tuple(items)
+    return skeleton
+
+
+def _host_copy(tensor: torch.Tensor) -> torch.Tensor:
+    tensor = tensor.detach()
+    if tensor.device.type != "cpu":
+        return tensor.cpu()
+    # torch.save writes whole storages, so views of larger tensors are compacted
+    if (
+        not tensor.is_contiguous()
+        or tensor.untyped_storage().nbytes() != tensor.numel() * tensor.element_size()
+    ):
+        return tensor.clone()
+    return tensor
+
+
+def save_shard(path: str, tensors: dict[str, torch.Tensor]) -> int:
+    """Write one shard, copying to host one shard at a time; returns its size."""
+    torch.save({name: _host_copy(t) for name, t in tensors.items()}, path)
+    return os.path.getsize(path)
+
+
+def save_meta(path: str, skeleton) -> int:
+    torch.save(skeleton, path)
+    return os.path.getsize(path)
+
+
+def make_manifest(window: int, files: list[dict]) -> dict:
+    """Manifest for a checkpoint whose ``meta.pt`` and shards are ``files``."""
+    return {
+        "format": CHECKPOINT_FORMAT,
+        "window": window,
+        "meta": META_NAME,
+        "shards": [f for f in files if f["name"] != META_NAME],
+        "total_bytes": sum(f["nbytes"] for f in files),
+    }
+
+
+def manifest_files(manifest: dict) -> list[str]:
+    """Every file a manifest refers to, relative to the checkpoint directory."""
+    return [manifest["meta"]] + [shard["name"] for shard in manifest["shards"]]
+
+
+def load_sharded_checkpoint(directory: str, manifest: dict) -> dict:
+    """
+    Rebuild a checkpoint from the files in ``directory``.
+
+    Shards are memory-mapped, so the returned tensors occupy no host memory
+    until read; ``load_state_dict`` then copies them straight to the model's
+    device one tensor at a time.
+    """
+    skeleton = torch.load(os.path.join(directory, manifest["meta"]), weights_only=True)
+    tensors = {}
+    for shard in manifest["shards"]:
+        tensors.update(
+            torch.load(
+                os.path.join(directory, shard["name"]),
+                map_location="cpu",
+                mmap=True,
+                weights_only=True,
+            )
+        )
+    return merge_checkpoint(skeleton, tensors)
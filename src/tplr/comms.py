@@ -17,13 +17,18 @@
 # type: ignore
 import asyncio
 import concurrent.futures
+import inspect
+import io
 import json
 import math
 import os
 import random
 import re
+import shutil
+import statistics
 import time
-from datetime import datetime, timezone
+from collections.abc import AsyncIterator, Callable
+from datetime import datetime, timedelta, timezone
 
 # from .hparams import HParams
 from types import SimpleNamespace
@@ -31,9 +36,7 @@ from typing import Any, Dict, List, Literal, Optional, Tuple
 
 import aiofiles
 import bittensor as bt
-import botocore
 import torch
-from aiobotocore.client import AioBaseClient
 from aiobotocore.session import get_session
 from botocore.exceptions import ClientError, ConnectionClosedError
 from torch.optim import SGD
@@ -44,10 +47,36 @@ from transformers import LlamaForCausalLM
 import tplr as tplr
 
 from . import __version__
+from .activity_index import ActivityIndex
 from .chain import ChainManager
-from .compress import CompressDCT, TransformDCT
+from .checkpoint import (
+    META_NAME,
+    checkpoint_stem,
+    is_manifest,
+    load_sharded_checkpoint,
+    make_manifest,
+    manifest_files,
+    save_meta,
+    save_shard,
+    shard_name,
+    split_checkpoint,
+    stem_of,
+)
+from .compress import CompressDCT, GradientAccumulator, TransformDCT
 from .config import BUCKET_SECRETS, client_config
+from .hparams import DEFAULT_HPARAMS
+from .object_cache import ObjectCache
+from .prefetch import GradientPrefetcher, upload_status
+from .s3_pool import S3ClientPool
 from .schemas import Bucket
+from .wire import (
+    WIRE_MAGIC,
+    decode_wire,
+    encode_wire,
+    is_wire_payload,
+    payload_nbytes,
+    payload_to,
+)
 
 # Constants
 CF_REGION_NAME: str = "enam"
@@ -55,6 +84,112 @@ LOCAL_TMP_DIR = "/tmp/local_store"
 PEERS_FILE_PREFIX = "peers_"
 CPU_COUNT = os.cpu_count() or 4
 CPU_MAX_CONNECTIONS = min(100, max(30, CPU_COUNT * 4))
+STREAM_READ_SIZE = 8 * 1024 * 1024  # 8MB reads when filling download buffers
+CHECKPOINT_TRANSFER_CONCURRENCY = 8  # checkpoint shards moved at once
+
+# S3 multipart limits
+S3_MIN_PART_SIZE = 5 * 1024 * 1024  # 5MB
+S3_MAX_PART_SIZE = 5 * 1024 * 1024 * 1024  # 5GB
+S3_MAX_PARTS = 10_000
+
+
+class MultipartPolicy:
+    """
+    Picks part size and in-flight part count for multipart uploads.
+
+    Part size aims for ``target_part_seconds`` per part at the last measured
+    single-part throughput (``default_part_size`` until then), within S3's
+    5MB-5GB part bounds and 10,000-part limit. Concurrency hill-climbs across
+    uploads: it doubles while aggregate throughput keeps improving by more
+    than 10% and steps back to the previous level once it stops.
+    """
+
+    def __init__(
+        self,
+        default_part_size: int = 16 * 1024 * 1024,
+        max_part_size: int = 512 * 1024 * 1024,
+        default_concurrency: int = 8,
+        max_concurrency: int = 32,
+        target_part_seconds: float = 2.0,
+    ):
+        self.default_part_size = default_part_size
+        self.max_part_size = max_part_size
+        self.max_concurrency = max_concurrency
+        self.target_part_seconds = target_part_seconds
+
+        self.concurrency = default_concurrency
+        self.part_bps: float | None = None  # smoothed single-part throughput
+        self._last: tuple[int, float] | None = None  # (concurrency, aggregate B/s)
+
+    def plan(self, size: int) -> tuple[int, int]:
+        """Return ``(part_size, concurrency)`` for an object of ``size`` bytes."""
+        if self.part_bps is None:
+            part_size = self.default_part_size
+        else:
+            part_size = int(self.part_bps * self.target_part_seconds)
+        part_size = min(max(part_size, S3_MIN_PART_SIZE), self.max_part_size)
+        # The part-count limit wins over max_part_size for very large objects
+        part_size = max(part_size, math.ceil(size / S3_MAX_PARTS))
+        part_size = min(-(-part_size // (1 << 20)) << 20, S3_MAX_PART_SIZE)
+
+        n_parts = max(1, math.ceil(size / part_size))
+        return part_size, min(self.concurrency, n_parts)
+
+    def record(
+        self,
+        concurrency: int,
+        parts: list[tuple[int, float]],
+        total_bytes: int,
+        elapsed: float,
+    ) -> None:
+        """Feed back ``(bytes, seconds)`` per part and the whole upload's timing."""
+        if not parts or elapsed <= 0:
+            return
+        part_bps = statistics.median(n / max(t, 1e-6) for n, t in parts)
+        self.part_bps = (
+            part_bps if self.part_bps is None else 0.5 * (self.part_bps + part_bps)
+        )
+
+        # Uploads with fewer parts than slots say nothing about concurrency
+        if concurrency < self.concurrency:
+            return
+        aggregate = total_bytes / elapsed
+        last = self._last
+        if last is None or (concurrency > last[0] and aggregate > 1.1 * last[1]):
+            self.concurrency = min(self.max_concurrency, concurrency * 2)
+        elif concurrency > last[0]:
+            self.concurrency = last[0]
+        self._last = (concurrency, aggregate)
+
+
+def _http_status(error: Exception) -> int | None:
+    """HTTP status code of a botocore error, if it carries one."""
+    response = getattr(error, "response", None) or {}
+    status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    if status is None:
+        code = response.get("Error", {}).get("Code", "")
+        status = int(code) if str(code).isdigit() else None
+    return status
+
+
+def _is_peer_gradient(key: str) -> bool:
+    """Whether ``key`` names a peer gradient, which must never be unpickled."""
+    return os.path.basename(key).startswith("gradient-")
+
+
+def _latency_histogram(latencies: list[float]) -> str:
+    """Render per-part latencies as ``<=bound:count`` buckets plus percentiles."""
+    bounds = (0.25, 0.5, 1, 2, 4, 8, 16, 32)
+    counts = [0] * (len(bounds) + 1)
+    for latency in latencies:
+        counts[next((i for i, b in enumerate(bounds) if latency <= b), -1)] += 1
+    buckets = [f"<={b}s:{c}" for b, c in zip(bounds, counts) if c]
+    if counts[-1]:
+        buckets.append(f">{bounds[-1]}s:{counts[-1]}")
+    ordered = sorted(latencies)
+    p50 = ordered[len(ordered) // 2]
+    p90 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))]
+    return f"p50={p50:.2f}s p90={p90:.2f}s max={ordered[-1]:.2f}s [{' '.join(buckets)}]"
 
 
 class Comms(ChainManager):
@@ -95,11 +230,14 @@ class Comms(ChainManager):
             os.makedirs(self.save_location, exist_ok=True)
         self.key_prefix = key_prefix
 
-        ## a single aiobotocore session and a dictionary of clients
+        ## a single aiobotocore session and a pool of per-bucket clients
         self.session = get_session()
-        self._s3_clients: dict[
-            tuple[str, str, str], AioBaseClient
-        ] = {}  # (acc_key, sec_key, account_id) -> s3_client
+        self.s3_pool = S3ClientPool(
+            self.session,
+            endpoint_url=self.get_base_url,
+            region_name=CF_REGION_NAME,
+            config=client_config,
+        )
 
         self.lock = asyncio.Lock()
         self.active_peers = set()  # Set to store active peers
@@ -109,52 +247,55 @@ class Comms(ChainManager):
         self.recent_windows = (
             self.hparams.recent_windows
         )  # Number of recent windows to check
+        # Gradient keys per peer bucket, refreshed by track_active_peers
+        self.activity_index = ActivityIndex(
+            version=__version__, retention_windows=max(10, self.recent_windows + 1)
+        )
 
         self.client_semaphore = asyncio.Semaphore(CPU_MAX_CONNECTIONS)
         self.gather_semaphore = asyncio.Semaphore(15)
 
+        # Objects up to these sizes are (de)serialised straight from memory
+        self.max_in_memory_download = self._int_hparam("max_in_memory_download_bytes")
+        self.max_in_memory_upload = self._int_hparam("max_in_memory_upload_bytes")
+        self.multipart_policy = MultipartPolicy()
+        # Downloaded objects by ETag; the disk tier is off unless given a budget
+        disk_bytes = self._int_hparam("object_cache_disk_bytes")
+        disk_dir = os.path.join(self.temp_dir, "object_cache") if disk_bytes else None
+        self.object_cache = ObjectCache(
+            max_memory_bytes=self._int_hparam("object_cache_memory_bytes"),
+            disk_dir=disk_dir,
+            max_disk_bytes=disk_bytes,
+        )
+        self.prefetcher = GradientPrefetcher(
+            self,
+            max_bytes=self._int_hparam("prefetch_cache_bytes"),
+        )
+        self.checkpoint_shard_bytes = self._int_hparam("checkpoint_shard_bytes")
+
+    def _int_hparam(self, name: str) -> int:
+        """Integer hparam, falling back to its DEFAULT_HPARAMS value when unset."""
+        value = getattr(self.hparams, name, None)
+        return value if isinstance(value, int) else DEFAULT_HPARAMS[name]
+
     async def _get_s3_client(self, bucket: Bucket):
         """
         Returns a persistent s3_client for the given bucket credentials.
-        We create it if we haven't already, else reuse the existing client.
+        We create it if we haven't already, else reuse the pooled one.
         """
-        key = (bucket.access_key_id, bucket.secret_access_key, bucket.account_id)
-        if key in self._s3_clients:
-            return self._s3_clients[key]
-
-        # Create the base URL
-        endpoint_url = self.get_base_url(bucket.account_id)
-
-        # Create the client (equivalent to `async with`, but we store the client persistently)
-        new_client = self.session.create_client(
-            "s3",
-            endpoint_url=endpoint_url,
-            region_name=CF_REGION_NAME,
-            config=client_config,
-            aws_access_key_id=bucket.access_key_id,
-            aws_secret_access_key=bucket.secret_access_key,
-        )
-        # We must manually do an async enter
-        new_client = await new_client.__aenter__()
-
-        self._s3_clients[key] = new_client
-        return new_client
+        return await self.s3_pool.get(bucket)
 
     async def close_all_s3_clients(self):
         """
         Closes all S3 clients that have been created and stored
         """
-        for key, client in list(self._s3_clients.items()):
-            try:
-                await client.__aexit__(None, None, None)
-            except Exception as e:
-                tplr.logger.warning(f"Error closing s3_client {key}: {e}")
-        self._s3_clients.clear()
+        await self.s3_pool.close_all()
 
-    async def _purge_s3_client(self, bucket: Bucket) -> None:
-        key = (bucket.access_key_id, bucket.secret_access_key, bucket.account_id)
-        if key in self._s3_clients:
-            del self._s3_clients[key]
+    async def _purge_s3_client(
+        self, bucket: Bucket, error: BaseException | None = None
+    ) -> None:
+        """Drop the bucket's client, unless ``error`` shows it is still healthy."""
+        await self.s3_pool.purge(bucket, error)
 
     def start_background_tasks(self):
         self.loop = asyncio.get_running_loop()
@@ -312,13 +453,14 @@ class Comms(ChainManager):
                     continuation_token = response.get("NextContinuationToken")
                 else:
                     break
-        except (ConnectionClosedError, ClientError):
-            await self._purge_s3_client(self.bucket)
+        except (ConnectionClosedError, ClientError) as e:
+            await self._purge_s3_client(self.bucket, e)
 
     async def s3_put_object(
         self,
         key: str,
         file_path: Optional[str] = None,
+        data: bytes | bytearray | None = None,
     ):
         """
         Puts an object into S3 storage, handling different file types appropriately.
@@ -326,7 +468,11 @@ class Comms(ChainManager):
         Args:
             key (str): The key/path to store the data under
             file_path (str, optional): The local file path to upload
-            bucket (Bucket, optional): The bucket to use. Defaults to self.bucket
+            data (bytes | bytearray, optional): In-memory payload to upload
+                instead of ``file_path``; botocore rejects ``memoryview`` bodies
+
+        Returns:
+            bool: False if the upload failed with a client or connection error
         """
         try:
             bucket = self.bucket
@@ -334,31 +480,35 @@ class Comms(ChainManager):
 
             # Handle JSON files
             if key.endswith(".json") or "start_window" in key:
-                if file_path:
+                if data is not None:
+                    data_bytes = data
+                elif file_path:
                     async with aiofiles.open(file_path, "r") as f:
-                        data = await f.read()
-                        data_bytes = data.encode("utf-8")
+                        data_bytes = (await f.read()).encode("utf-8")
                 else:
                     raise ValueError(f"file_path required for JSON file: {key}")
 
                 await s3_client.put_object(Bucket=bucket.name, Key=key, Body=data_bytes)
-                return
+                return True
 
             # Otherwise, likely PyTorch files
-            file_size = os.path.getsize(file_path)
+            file_size = len(data) if data is not None else os.path.getsize(file_path)
             multipart_threshold = 100 * 1024 * 1024  # 100MB
 
             if file_size <= multipart_threshold:
                 # Simple upload for small files
-                async with aiofiles.open(file_path, "rb") as f:
-                    data = await f.read()
-                    await s3_client.put_object(Bucket=bucket.name, Key=key, Body=data)
+                if data is None:
+                    async with aiofiles.open(file_path, "rb") as f:
+                        data = await f.read()
+                await s3_client.put_object(Bucket=bucket.name, Key=key, Body=data)
             else:
                 # Multipart upload for large files
-                await self.upload_large_file(file_path, key, s3_client)
+                await self.upload_large_file(file_path, key, s3_client, data=data)
+            return True
 
-        except (ConnectionClosedError, ClientError):
-            await self._purge_s3_client(bucket)
+        except (ConnectionClosedError, ClientError) as e:
+            await self._purge_s3_client(bucket, e)
+            return False
         except Exception as e:
             tplr.logger.error(f"Error uploading {key} to S3: {e}")
             raise
@@ -370,14 +520,29 @@ class Comms(ChainManager):
         timeout: int = 15,
         time_min: datetime = None,
         time_max: datetime = None,
+        meta: dict | None = None,
+        map_location=None,
     ):
-        """Download object from S3 using asynchronous streaming."""
+        """
+        Download object from S3 using asynchronous streaming.
+
+        If ``meta`` is given, the object's ``LastModified`` and ``ETag`` are
+        stored in it once the response headers arrive. Tensors are decoded
+        onto ``map_location``, the configured device by default.
+        """
         import uuid
 
         temp_file_path = os.path.join(
             self.temp_dir, f"temp_{key}_{uuid.uuid4().hex}.pt"
         )
 
+        # Fail fast on buckets that keep timing out or erroring
+        if not self.s3_pool.allow(bucket):
+            tplr.logger.debug(f"Skipping {key}: circuit open for {bucket.name}")
+            return None
+        request_start = time.perf_counter()
+        healthy = False  # whether the bucket answered properly
+
         s3_client = await self._get_s3_client(bucket)
         try:
             # Normalize timezone info
@@ -386,56 +551,130 @@ class Comms(ChainManager):
             if time_max is not None and not time_max.tzinfo:
                 time_max = time_max.replace(tzinfo=timezone.utc)
 
-            # HEAD the object
+            # A single GET: conditional headers let the server refuse objects
+            # outside [time_min, time_max]. HTTP dates have 1s granularity, so
+            # both bounds are rounded outwards: the server only refuses objects
+            # that are certainly outside, and the rest are re-checked below.
+            conditions = {}
+            if time_min is not None:
+                since = time_min - timedelta(microseconds=1)
+                conditions["IfModifiedSince"] = since.replace(microsecond=0)
+            if time_max is not None:
+                until = time_max.replace(microsecond=0)
+                if until < time_max:
+                    until += timedelta(seconds=1)
+                conditions["IfUnmodifiedSince"] = until
+            # With a cached copy, only revalidate it: a 304 then means "unchanged"
+            # and the time bounds are applied locally to its Last-Modified
+            cached = await self.object_cache.lookup(bucket, key)
+            if cached is not None:
+                conditions = {"IfNoneMatch": cached.etag}
             try:
                 response = await asyncio.wait_for(
-                    s3_client.head_object(Bucket=bucket.name, Key=key),
+                    s3_client.get_object(Bucket=bucket.name, Key=key, **conditions),
                     timeout=timeout,
                 )
-                last_modified = response.get("LastModified")
+                healthy = True
+            except asyncio.TimeoutError:
+                tplr.logger.debug(f"Timeout checking for {key}")
+                return None
+            except (ConnectionClosedError, ClientError) as e:
+                await self._purge_s3_client(bucket, e)
+                status = _http_status(e)
+                if status == 304 and cached is not None:
+                    healthy = True
+                    self.object_cache.record(hit=True)
+                    if meta is not None:
+                        meta["LastModified"] = cached.last_modified
+                        meta["ETag"] = cached.etag
+                    status = upload_status(cached.last_modified, time_min, time_max)
+                    if status is not None:
+                        tplr.logger.info(f"Cached object {key} is {status}.")
+                        return {"__status": status}
+                    return self._decode_payload(
+                        key,
+                        cached.data,
+                        map_location=map_location or self.config.device,
+                        weights_only=False,
+                    )
+                if status == 304:
+                    healthy = True
+                    tplr.logger.info(f"Object {key} was uploaded before time_min.")
+                    return {"__status": "TOO_EARLY"}
+                if status == 412:
+                    healthy = True
+                    tplr.logger.info(f"Object {key} was uploaded after time_max.")
+                    return {"__status": "TOO_LATE"}
+                if status == 404:
+                    healthy = True  # a miss is not an endpoint failure
+                    tplr.log_with_context(
+                        level="debug",
+                        message=f"Object {key} not found in bucket {bucket.name}",
+                    )
+                    return None
+                raise
+
+            # Re-check the window from the response headers, in case the
+            # endpoint ignored the conditions; abort before reading the body
+            last_modified = response.get("LastModified")
+            if meta is not None:
+                meta["LastModified"] = last_modified
+                meta["ETag"] = response.get("ETag")
+            too_early = time_min is not None and last_modified < time_min
+            too_late = time_max is not None and last_modified > time_max
+            if last_modified is None or too_early or too_late:
+                response["Body"].close()
                 if last_modified is None:
                     tplr.logger.info(f"Object does not exist: {key}")
                     return None
-
-                if time_min is not None and last_modified < time_min:
+                if too_early:
                     time_diff = (time_min - last_modified).total_seconds()
                     tplr.logger.info(
                         f"Object {key} was uploaded {time_diff:.2f}s before time_min."
                     )
                     return {"__status": "TOO_EARLY"}
+                time_diff = (last_modified - time_max).total_seconds()
+                tplr.logger.info(
+                    f"Object {key} was uploaded {time_diff:.2f}s after time_max."
+                )
+                return {"__status": "TOO_LATE"}
 
-                if time_max is not None and last_modified > time_max:
-                    time_diff = (last_modified - time_max).total_seconds()
-                    tplr.logger.info(
-                        f"Object {key} was uploaded {time_diff:.2f}s after time_max."
+            file_size = response["ContentLength"]
+            self.object_cache.record(hit=False)
+
+            # Small enough: fill a preallocated buffer and decode it in place
+            if file_size <= self.max_in_memory_download:
+                buffer = bytearray(file_size)
+                async with response["Body"] as stream:
+                    received = await asyncio.wait_for(
+                        self._read_into(stream, memoryview(buffer)), timeout=timeout
                     )
-                    return {"__status": "TOO_LATE"}
-
-            except asyncio.TimeoutError:
-                tplr.logger.debug(f"Timeout checking for {key}")
-                return None
-            except (ConnectionClosedError, ClientError) as e:
-                await self._purge_s3_client(bucket)
-                if "404" in str(e):
-                    tplr.log_with_context(
-                        level="debug",
-                        message=f"Object {key} not found in bucket {bucket.name}",
+                if received != file_size:
+                    raise ValueError(f"Got {received} of {file_size} bytes")
+                etag = response.get("ETag")
+                if etag is not None:
+                    # Cached without a copy; decoding from the same read-only
+                    # view keeps tensors from aliasing the cached bytes
+                    buffer = memoryview(buffer).toreadonly()
+                    await self.object_cache.put(
+                        bucket, key, etag, last_modified, buffer
                     )
-                    return None
-
-            file_size = response["ContentLength"]  # type: ignore
+                return self._decode_payload(
+                    key,
+                    buffer,
+                    map_location=map_location or self.config.device,
+                    weights_only=False,
+                )
 
-            # Download the object
+            # Otherwise stage the object on disk
             if file_size <= 5 * 1024 * 1024 * 1024:  # 5GB
-                response = await asyncio.wait_for(
-                    s3_client.get_object(Bucket=bucket.name, Key=key),
-                    timeout=timeout,
-                )
                 async with aiofiles.open(temp_file_path, "wb") as f:
                     async with response["Body"] as stream:
                         data = await asyncio.wait_for(stream.read(), timeout=timeout)
                         await f.write(data)
             else:
+                # Too big for one stream: fetch in parallel ranges instead
+                response["Body"].close()
                 success = await self.download_large_file(
                     s3_client=s3_client,
                     bucket=bucket,
@@ -444,6 +683,7 @@ class Comms(ChainManager):
                     temp_file_path=temp_file_path,
                 )
                 if not success:
+                    healthy = False
                     return None
 
             # Now load the data
@@ -452,31 +692,119 @@ class Comms(ChainManager):
                     data = await f.read()
                     loaded_data = json.loads(data)
             else:
-                loaded_data = torch.load(
+                loaded_data = self._load_payload(
                     temp_file_path,
-                    map_location=self.config.device,
+                    map_location=map_location or self.config.device,
                     weights_only=False,
+                    key=key,
                 )
 
             return loaded_data
 
         except asyncio.TimeoutError:
+            healthy = False
             tplr.logger.debug(f"Timeout downloading {key}")
             return None
         except Exception as e:
+            healthy = False
             tplr.logger.error(f"Error in s3_get_object for {key}: {e}")
             return None
         finally:
+            self.s3_pool.record(bucket, time.perf_counter() - request_start, healthy)
             if os.path.exists(temp_file_path):
                 os.remove(temp_file_path)
 
+    @staticmethod
+    async def _read_into(stream, out: memoryview) -> int:
+        """Read a streaming body into ``out`` in place; returns bytes read."""
+        pos = 0
+        while pos < len(out):
+            chunk = await stream.read(min(STREAM_READ_SIZE, len(out) - pos))
+            if not chunk:
+                break
+            end = pos + len(chunk)
+            if end > len(out):
+                raise ValueError(f"Body exceeds expected size of {len(out)} bytes")
+            out[pos:end] = chunk
+            pos = end
+        return pos
+
+    async def _download_to_file(
+        self, bucket: Bucket, key: str, path: str, timeout: int = 60
+    ) -> bool:
+        """Stream an object to ``path`` without holding it in memory."""
+        s3_client = await self._get_s3_client(bucket)
+        try:
+            response = await s3_client.get_object(Bucket=bucket.name, Key=key)
+            async with aiofiles.open(path, "wb") as f:
+                async with response["Body"] as stream:
+                    while True:
+                        chunk = await asyncio.wait_for(
+                            stream.read(STREAM_READ_SIZE), timeout=timeout
+                        )
+                        if not chunk:
+                            break
+                        await f.write(chunk)
+            return True
+        except (ConnectionClosedError, ClientError) as e:
+            await self._purge_s3_client(bucket, e)
+        except Exception as e:
+            tplr.logger.error(f"Error downloading {key} to {path}: {e}")
+        return False
+
+    @staticmethod
+    def _decode_payload(
+        key: str, buffer: bytearray, map_location=None, weights_only: bool = True
+    ):
+        """Deserialise an object held in memory, without touching the disk."""
+        if key.endswith(".json") or "start_window" in key:
+            return json.loads(buffer.decode("utf-8"))
+        if is_wire_payload(buffer):
+            return decode_wire(buffer, map_location=map_location)
+        return torch.load(
+            io.BytesIO(buffer),
+            map_location=map_location,
+            weights_only=weights_only or _is_peer_gradient(key),
+        )
+
+    @staticmethod
+    def _load_payload(
+        path: str, map_location=None, weights_only: bool = True, key: str = None
+    ):
+        """Load a stored object, decoding wire-format gradients without pickle."""
+        with open(path, "rb") as f:
+            is_wire = f.read(len(WIRE_MAGIC)) == WIRE_MAGIC
+            if is_wire:
+                f.seek(0)
+                buffer = bytearray(os.fstat(f.fileno()).st_size)
+                f.readinto(buffer)
+        if is_wire:
+            return decode_wire(buffer, map_location=map_location)
+        return torch.load(
+            path,
+            map_location=map_location,
+            weights_only=weights_only or _is_peer_gradient(key or path),
+        )
+
     #  Large File Operations
 
-    async def upload_large_file(self, file_path: str, key: str, s3_client):
-        """Uploads a large file to S3 using asynchronous multipart upload with 5MB chunks."""
+    async def upload_large_file(
+        self,
+        file_path: str | None,
+        key: str,
+        s3_client,
+        data: bytes | bytearray | None = None,
+    ):
+        """
+        Uploads a large file to S3 using asynchronous multipart upload.
+
+        Part size and the number of parts in flight come from
+        ``self.multipart_policy``. Parts are read on demand from one open file
+        handle, or sliced from ``data`` when the payload is already in memory,
+        so at most ``concurrency`` part copies are held at once.
+        """
         upload_id = None
         MAX_RETRIES = 3
-        PART_SIZE = 5 * 1024 * 1024  # 5MB
 
         try:
             async with self.client_semaphore:
@@ -492,26 +820,40 @@ class Comms(ChainManager):
                             raise
                         await asyncio.sleep(2**attempt)
 
-                file_size = os.path.getsize(file_path)
-                total_parts = math.ceil(file_size / PART_SIZE)
+                file_size = (
+                    len(data) if data is not None else os.path.getsize(file_path)
+                )
+                part_size, concurrency = self.multipart_policy.plan(file_size)
+                total_parts = math.ceil(file_size / part_size)
                 parts = []
+                part_timings: list[tuple[int, float]] = []
 
-                async def upload_part(part_number: int):
-                    byte_range_start = (part_number - 1) * PART_SIZE
-                    byte_range_end = min(byte_range_start + PART_SIZE, file_size)
+                async def upload_part(part_number: int, fd: int | None):
+                    byte_range_start = (part_number - 1) * part_size
+                    byte_range_end = min(byte_range_start + part_size, file_size)
 
                     for attempt in range(MAX_RETRIES):
                         try:
-                            async with aiofiles.open(file_path, "rb") as f:
-                                await f.seek(byte_range_start)
-                                data = await f.read(byte_range_end - byte_range_start)
+                            if data is not None:
+                                body = data[byte_range_start:byte_range_end]
+                            else:
+                                body = await asyncio.to_thread(
+                                    os.pread,
+                                    fd,
+                                    byte_range_end - byte_range_start,
+                                    byte_range_start,
+                                )
 
+                            part_start = time.perf_counter()
                             response = await s3_client.upload_part(
                                 Bucket=self.bucket.name,
                                 Key=key,
                                 PartNumber=part_number,
                                 UploadId=upload_id,
-                                Body=data,
+                                Body=body,
+                            )
+                            part_timings.append(
+                                (len(body), time.perf_counter() - part_start)
                             )
                             return {
                                 "ETag": response["ETag"],
@@ -525,18 +867,37 @@ class Comms(ChainManager):
                                 raise
                             await asyncio.sleep(2**attempt)
 
-                # Launch one coroutine per part
+                # A fixed pool of workers pulls part numbers from a shared iterator
+                pending = iter(range(1, total_parts + 1))
+
+                async def worker(fd: int | None):
+                    return [await upload_part(n, fd) for n in pending]
+
+                fd = os.open(file_path, os.O_RDONLY) if data is None else None
+                upload_start = time.perf_counter()
                 try:
-                    part_results = await asyncio.gather(
-                        *[
-                            upload_part(part_number)
-                            for part_number in range(1, total_parts + 1)
-                        ]
+                    worker_results = await asyncio.gather(
+                        *[worker(fd) for _ in range(concurrency)]
                     )
-                    parts.extend(part_results)
+                    for results in worker_results:
+                        parts.extend(results)
                 except Exception as e:
                     tplr.logger.error(f"Multipart upload failed: {e}")
                     raise
+                finally:
+                    if fd is not None:
+                        os.close(fd)
+
+                elapsed = time.perf_counter() - upload_start
+                self.multipart_policy.record(
+                    concurrency, part_timings, file_size, elapsed
+                )
+                tplr.logger.info(
+                    f"Uploaded {total_parts} parts of {part_size / 2**20:.0f}MB "
+                    f"({concurrency} in flight) at "
+                    f"{file_size / max(elapsed, 1e-6) / 2**20:.1f}MB/s; part latency "
+                    f"{_latency_histogram([t for _, t in part_timings])}"
+                )
 
                 parts.sort(key=lambda x: x["PartNumber"])
 
@@ -555,8 +916,8 @@ class Comms(ChainManager):
                             raise
                         await asyncio.sleep(2**attempt)
 
-        except (ConnectionClosedError, ClientError):
-            await self._purge_s3_client(self.bucket)
+        except (ConnectionClosedError, ClientError) as e:
+            await self._purge_s3_client(self.bucket, e)
         except Exception as e:
             tplr.logger.error(f"Error during multipart upload of {key}: {e}")
             if upload_id:
@@ -687,8 +1048,8 @@ class Comms(ChainManager):
             finally:
                 pbar.close()
 
-        except (ConnectionClosedError, ClientError):
-            await self._purge_s3_client(bucket)
+        except (ConnectionClosedError, ClientError) as e:
+            await self._purge_s3_client(bucket, e)
         except Exception as e:
             tplr.logger.error(f"Error in download_large_file for {key}: {e}")
             return False
@@ -718,6 +1079,10 @@ class Comms(ChainManager):
         Returns:
             float: The elapsed time (in seconds) for the PUT operation.
         """
+        if key == "checkpoint":
+            return await self._put_checkpoint(
+                state_dict, uid, window, local=local, remote=not local
+            )
         if key == "aggregator":
             filename = f"{key}-{window}-v{__version__}.pt"
         else:
@@ -741,8 +1106,21 @@ class Comms(ChainManager):
                     "global_step": global_step,
                 }
 
-            # Save to temp file
-            torch.save(save_data, temp_file_path)
+            # Serialise in memory, spilling to a temp file only when the
+            # payload exceeds the memory budget. Gradients use the wire format.
+            buffer = None
+            if payload_nbytes(save_data) <= self.max_in_memory_upload:
+                if key == "gradient":
+                    buffer = encode_wire(state_dict, global_step)
+                else:
+                    stream = io.BytesIO()
+                    torch.save(save_data, stream)
+                    buffer = stream.getvalue()
+            elif key == "gradient":
+                with open(temp_file_path, "wb") as f:
+                    f.write(encode_wire(state_dict, global_step))
+            else:
+                torch.save(save_data, temp_file_path)
 
             if local:
                 # Local storage with per-uid directories
@@ -752,10 +1130,16 @@ class Comms(ChainManager):
                 local_dir = os.path.join(LOCAL_TMP_DIR, str(uid), str(window))
                 os.makedirs(local_dir, exist_ok=True)
                 final_path = os.path.join(local_dir, filename)
+                if buffer is not None:
+                    with open(temp_file_path, "wb") as f:
+                        f.write(buffer)
                 os.replace(temp_file_path, final_path)
             else:
-                await self.s3_put_object(filename, temp_file_path)
                 # Remote storage with automatic handling of large files
+                if buffer is not None:
+                    await self.s3_put_object(filename, data=buffer)
+                else:
+                    await self.s3_put_object(filename, temp_file_path)
                 asyncio.create_task(
                     self.cleanup_s3_data(
                         uid=uid, current_window=window, stale_retention=stale_retention
@@ -770,23 +1154,101 @@ class Comms(ChainManager):
         tplr.logger.info(f"{tplr.P(window, put_end - put_start)} PUT {filename} <--")
         return put_end - put_start
 
+    async def _put_checkpoint(
+        self, checkpoint: dict, uid, window: int, local: bool, remote: bool
+    ) -> float:
+        """
+        Save a checkpoint in the sharded layout, locally and/or to S3.
+
+        Shards are written one at a time, each copied to host only while it is
+        serialised, and each is uploaded as soon as it is on disk. The manifest
+        goes last, and is only uploaded once every shard upload has succeeded.
+        """
+        stem = checkpoint_stem(window, uid, __version__)
+        tplr.logger.debug(f"PUT {stem} -->")
+        put_start = tplr.T()
+
+        if local:
+            await self.cleanup_local_data(
+                uid=uid, current_window=window, stale_retention=10
+            )
+            parent = os.path.join(LOCAL_TMP_DIR, str(uid), str(window))
+        else:
+            parent = self.temp_dir
+        directory = os.path.join(parent, stem)
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+        semaphore = asyncio.Semaphore(CHECKPOINT_TRANSFER_CONCURRENCY)
+
+        async def upload(name: str, path: str) -> bool:
+            async with semaphore:
+                return await self.s3_put_object(f"{stem}/{name}", path)
+
+        skeleton, shards = split_checkpoint(checkpoint, self.checkpoint_shard_bytes)
+        uploads = []
+        try:
+            path = os.path.join(directory, META_NAME)
+            nbytes = await asyncio.to_thread(save_meta, path, skeleton)
+            files = [{"name": META_NAME, "nbytes": nbytes}]
+            if remote:
+                uploads.append(asyncio.create_task(upload(META_NAME, path)))
+            for index, tensors in enumerate(shards):
+                name = shard_name(index)
+                path = os.path.join(directory, name)
+                nbytes = await asyncio.to_thread(save_shard, path, tensors)
+                files.append({"name": name, "nbytes": nbytes})
+                if remote:
+                    uploads.append(asyncio.create_task(upload(name, path)))
+            uploaded = await asyncio.gather(*uploads)
+
+            manifest = json.dumps(make_manifest(window, files)).encode("utf-8")
+            if local:
+                with open(os.path.join(parent, f"{stem}.json"), "wb") as f:
+                    f.write(manifest)
+            if remote and all(uploaded):
+                await self.s3_put_object(f"{stem}.json", data=manifest)
+            elif remote:
+                tplr.logger.error(
+                    f"Not publishing {stem}: "
+                    f"{uploaded.count(False)} of {len(uploaded)} uploads failed"
+                )
+        finally:
+            for task in uploads:
+                task.cancel()
+            if not local:
+                shutil.rmtree(directory, ignore_errors=True)
+
+        put_end = tplr.T()
+        tplr.logger.info(
+            f"{tplr.P(window, put_end - put_start)} PUT {stem} ({len(files)} files) <--"
+        )
+        return put_end - put_start
+
     async def gradient_timestamp(
         self, uid: int, window: int, version: str = tplr.__version__
     ) -> float:
         """
         Return POSIX seconds of the gradient file’s Last-Modified header,
         or 0.0 if it does not exist / fails.
+
+        Served from the activity index when the key has been listed already;
+        otherwise falls back to a HEAD request.
         """
         bucket = self.commitments.get(int(uid))
         if not bucket:
             return 0.0
+        if version == self.activity_index.version:
+            indexed = self.activity_index.timestamp(bucket, uid, window)
+            if indexed is not None:
+                return indexed
         try:
             s3 = await self._get_s3_client(bucket)
             key = f"gradient-{window}-{uid}-v{version}.pt"
             hdr = await s3.head_object(Bucket=bucket.name, Key=key)
             return hdr["LastModified"].timestamp()
-        except Exception:
-            await self._purge_s3_client(bucket)
+        except Exception as e:
+            await self._purge_s3_client(bucket, e)
             return 0.0
 
     async def get(
@@ -815,7 +1277,7 @@ class Comms(ChainManager):
                 if not os.path.exists(local_path):
                     tplr.logger.debug(f"Local file not found: {local_path}")
                     return None
-                loaded_data = torch.load(local_path, weights_only=True)
+                loaded_data = self._load_payload(local_path, weights_only=True)
                 if key == "checkpoint":
                     return loaded_data, None
                 state_dict = loaded_data.get("state_dict")
@@ -828,12 +1290,23 @@ class Comms(ChainManager):
             if not peer_bucket:
                 return None
 
-            loaded_data = await self.s3_get_object(
-                key=filename,
-                bucket=peer_bucket,
-                time_min=time_min,
-                time_max=time_max,
-            )
+            prefetched = await self.prefetcher.take(uid, window, key)
+            if prefetched is not None:
+                # Same acceptance rules as the conditional GET below
+                last_modified, loaded_data = prefetched
+                status = upload_status(last_modified, time_min, time_max)
+                if status is not None:
+                    loaded_data = {"__status": status}
+                else:
+                    # Prefetched payloads are decoded on the CPU
+                    loaded_data = payload_to(loaded_data, self.config.device)
+            else:
+                loaded_data = await self.s3_get_object(
+                    key=filename,
+                    bucket=peer_bucket,
+                    time_min=time_min,
+                    time_max=time_max,
+                )
 
             if loaded_data is None:
                 return None
@@ -938,10 +1411,80 @@ class Comms(ChainManager):
             if state_dict is not None:
                 return state_dict
 
+            # Stop polling a peer whose bucket has tripped its circuit breaker
+            if not local:
+                peer_bucket = self.commitments.get(int(uid))
+                if peer_bucket is not None and not self.s3_pool.allow(peer_bucket):
+                    tplr.logger.debug(
+                        f"Bucket for UID {uid} is unavailable (circuit open). Skipping."
+                    )
+                    return None
+
             # Short delay before retrying
             await asyncio.sleep(0.1)
 
-    async def gather(
+    def _validate_peer_response(
+        self,
+        uid: int,
+        response,
+        totalks: dict,
+        device: str,
+        window: int,
+    ) -> Optional[tuple[dict, int]]:
+        """
+        Check one peer's ``get_with_retry`` response and move it to ``device``.
+
+        Returns the peer's state dict (tensors on ``device``) and global step, or
+        None if the peer has to be skipped.
+        """
+        if isinstance(response, Exception):
+            tplr.log_with_context(
+                level="debug",
+                message=f"Error from UID {uid}: {str(response)}",
+                current_window=window,
+            )
+            return None
+        if response is None:
+            tplr.logger.info(f"Skipped UID {uid} - gradient not found.")
+            return None
+
+        try:
+            state_dict_resp, global_step_resp = response
+            tplr.logger.debug(
+                f"Received state dict and global step {global_step_resp} from UID {uid}"
+            )
+        except (TypeError, ValueError) as e:
+            tplr.log_with_context(
+                level="debug",
+                message=f"Invalid response from UID {uid}: {e}",
+                current_window=window,
+            )
+            return None
+
+        if state_dict_resp is None:
+            tplr.logger.debug(f"Empty state dict from UID {uid}")
+            return None
+
+        # Move to device once; the checks below run on the device copies
+        state_dict = {
+            name: value.to(device) if isinstance(value, torch.Tensor) else value
+            for name, value in state_dict_resp.items()
+        }
+
+        # Indices in bounds and values finite, with one device sync per peer
+        (valid,), (first_bad,) = self.check_compressed_batch(
+            [state_dict], totalks, allowed_topk=self.hparams.topk_compression
+        )
+        if not valid:
+            param_name, reason = first_bad
+            tplr.logger.warning(
+                f"Compressed gradient check failed for {param_name} from UID {uid}: {reason}"
+            )
+            return None
+
+        return state_dict, global_step_resp
+
+    async def gather_stream(
         self,
         my_uid: int | None,
         uids: List[int],
@@ -954,31 +1497,21 @@ class Comms(ChainManager):
         stale_retention: int = 10,
         time_min: datetime = None,
         time_max: datetime = None,
-    ) -> Optional[SimpleNamespace]:
-        """Gather operation with individual gradient normalization and connection management."""
-        start_time = time.time()
-        metrics = {"upload_bytes": 0, "download_bytes": 0, "successes": []}
-
-        tplr.logger.debug(
-            f"Starting gather for window {window} with time window: {time_min} to {time_max}"
-        )
-        tplr.logger.debug(
-            f"Gather operation - my_uid: {my_uid}, window: {window}, key: {key}, timeout: {timeout}"
-        )
-        tplr.log_with_context(
-            level="debug",
-            message=f"Target UIDs for gathering: {uids}",
-            current_window=window,
-        )
-
-        aggregated_state_dict = {}
-        valid_uids = []
-        skipped_uids = []  # Retain UIDs that are skipped.
-        global_steps = []
+    ) -> AsyncIterator[SimpleNamespace]:
+        """
+        Yield each peer's gradient as soon as its download completes.
+
+        Downloads for all ``uids`` run concurrently; every finished response is
+        validated and moved to ``device`` while the remaining peers are still in
+        flight. One namespace is yielded per uid, in completion order, with
+        ``uid``, ``state_dict`` (None if the peer was skipped), ``global_step``
+        and ``download_bytes``. Closing the iterator early cancels the
+        outstanding downloads.
+        """
 
-        async with self.gather_semaphore:
-            batch_tasks = [
-                self.get_with_retry(
+        async def fetch(uid: int):
+            try:
+                return uid, await self.get_with_retry(
                     uid=uid,
                     window=window,
                     key=key,
@@ -988,121 +1521,142 @@ class Comms(ChainManager):
                     time_min=time_min,
                     time_max=time_max,
                 )
-                for uid in uids
-            ]
+            except Exception as e:
+                return uid, e
 
+        async with self.gather_semaphore:
+            tasks = [asyncio.create_task(fetch(uid)) for uid in uids]
             try:
-                download_start = tplr.T()
-                batch_responses = await asyncio.gather(
-                    *batch_tasks, return_exceptions=True
-                )
-                tplr.logger.info(
-                    f"{tplr.P(window, tplr.T() - download_start)} Downloaded peer gradients <--"
-                )
-                process_start = tplr.T()
-                for uid, response in zip(uids, batch_responses):
-                    if isinstance(response, Exception):
-                        tplr.log_with_context(
-                            level="debug",
-                            message=f"Error from UID {uid}: {str(response)}",
-                            current_window=window,
+                for next_done in asyncio.as_completed(tasks):
+                    uid, response = await next_done
+                    validated = self._validate_peer_response(
+                        uid, response, totalks, device, window
+                    )
+                    if validated is None:
+                        yield SimpleNamespace(
+                            uid=uid, state_dict=None, global_step=None, download_bytes=0
                         )
-                        skipped_uids.append(uid)
-                        continue
-                    if response is None:
-                        tplr.logger.info(f"Skipped UID {uid} - gradient not found.")
-                        skipped_uids.append(uid)
                         continue
 
-                    try:
-                        state_dict_resp, global_step_resp = response
-                        tplr.logger.debug(
-                            f"Received state dict and global step {global_step_resp} from UID {uid}"
-                        )
-                    except (TypeError, ValueError) as e:
-                        tplr.log_with_context(
-                            level="debug",
-                            message=f"Invalid response from UID {uid}: {e}",
-                            current_window=window,
-                        )
-                        skipped_uids.append(uid)
-                        continue
+                    state_dict, global_step = validated
+                    yield SimpleNamespace(
+                        uid=uid,
+                        state_dict=state_dict,
+                        global_step=global_step,
+                        download_bytes=sum(
+                            t.element_size() * t.nelement()
+                            for t in state_dict.values()
+                            if isinstance(t, torch.Tensor)
+                        ),
+                    )
+            finally:
+                for task in tasks:
+                    task.cancel()
 
-                    if state_dict_resp is None:
-                        tplr.logger.debug(f"Empty state dict from UID {uid}")
-                        skipped_uids.append(uid)
-                        continue
+    async def gather(
+        self,
+        my_uid: int | None,
+        uids: List[int],
+        window: int,
+        key: str,
+        timeout: int,
+        device: str,
+        totalks: dict,
+        local: bool = True,
+        stale_retention: int = 10,
+        time_min: datetime = None,
+        time_max: datetime = None,
+        on_peer: Optional[Callable[[SimpleNamespace], Any]] = None,
+        accumulator: Optional[GradientAccumulator] = None,
+    ) -> Optional[SimpleNamespace]:
+        """
+        Gather operation with individual gradient normalization and connection management.
 
-                    # ---------- Begin Compressed Indices and Values Check ----------
-                    valid_response = True
-                    for param_name, tensor in state_dict_resp.items():
-                        if param_name.endswith("idxs"):
-                            base_name = param_name[:-4]
-                            totalk = totalks.get(base_name)
-                            if totalk is None:
-                                tplr.logger.warning(
-                                    f"Missing totalk for parameter {base_name} from UID {uid}, skipping UID."
-                                )
-                                valid_response = False
-                                break
-                            try:
-                                self.check_compressed_indices(
-                                    param_name,
-                                    tensor.to(device),
-                                    totalk,
-                                    allowed_topk=self.hparams.topk_compression,
-                                )
-                            except Exception as e:
-                                tplr.logger.warning(
-                                    f"Compressed indices check failed for parameter {param_name} from UID {uid}: {e}"
-                                )
-                                valid_response = False
-                                break
-                        # Check if values are valid (not NaN, not Inf)
-                        elif param_name.endswith("vals"):
-                            tensor_to_check = tensor.to(device)
-                            if (
-                                torch.isnan(tensor_to_check).any()
-                                or torch.isinf(tensor_to_check).any()
-                            ):
-                                tplr.logger.warning(
-                                    f"NaN/Inf in {param_name} from UID {uid}, skipping"
-                                )
-                                valid_response = False
-                                break
+        Built on ``gather_stream``: peers are validated as their downloads
+        complete. ``on_peer``, if given, is called (and awaited if it returns an
+        awaitable) with each valid peer's namespace as soon as it is ready, so
+        callers can start decoding while slower peers are still downloading.
+        Results are returned in ``uids`` order regardless of completion order.
 
-                    # If any check failed, skip this UID entirely
-                    if not valid_response:
-                        tplr.logger.info(
-                            f"Skipping UID {uid} due to validation failures"
-                        )
-                        skipped_uids.append(uid)
-                        continue
-                    # ---------- End Compressed Indices and Values Check ----------
+        With an ``accumulator``, each valid peer is folded into it on arrival and
+        its ``state_dict`` is dropped; ``result.state_dict`` is then empty and
+        callers read the decompressed mean from ``result.accumulator``.
 
-                    # Process tensors (with normalization on 'vals' keys).
-                    for param_name, tensor in state_dict_resp.items():
-                        if isinstance(tensor, torch.Tensor):
-                            aggregated_state_dict.setdefault(param_name, []).append(
-                                tensor.to(device)
-                            )
-                            metrics["download_bytes"] += (
-                                tensor.element_size() * tensor.nelement()
-                            )
-                        elif param_name.endswith("quant_params"):
-                            aggregated_state_dict.setdefault(param_name, []).append(
-                                tensor
-                            )
+        A peer whose ``on_peer`` call or ``accumulator.add`` raises is logged
+        and reported in ``skipped_uids``; the other peers are unaffected.
+        """
+        start_time = time.time()
+        metrics = {"upload_bytes": 0, "download_bytes": 0, "successes": []}
 
-                    valid_uids.append(uid)
-                    global_steps.append(global_step_resp)
+        tplr.logger.debug(
+            f"Starting gather for window {window} with time window: {time_min} to {time_max}"
+        )
+        tplr.logger.debug(
+            f"Gather operation - my_uid: {my_uid}, window: {window}, key: {key}, timeout: {timeout}"
+        )
+        tplr.log_with_context(
+            level="debug",
+            message=f"Target UIDs for gathering: {uids}",
+            current_window=window,
+        )
 
-                tplr.logger.info(
-                    f"{tplr.P(window, tplr.T() - process_start)} Processed peer gradients <--"
-                )
+        received: dict[int, SimpleNamespace] = {}
 
-            except Exception as e:
-                tplr.logger.error(f"Error processing uid batch: {str(e)}")
+        download_start = tplr.T()
+        try:
+            async for peer in self.gather_stream(
+                my_uid=my_uid,
+                uids=uids,
+                window=window,
+                key=key,
+                timeout=timeout,
+                device=device,
+                totalks=totalks,
+                local=local,
+                stale_retention=stale_retention,
+                time_min=time_min,
+                time_max=time_max,
+            ):
+                if peer.state_dict is None:
+                    continue
+
+                metrics["download_bytes"] += peer.download_bytes
+                try:
+                    if on_peer is not None:
+                        ret = on_peer(peer)
+                        if inspect.isawaitable(ret):
+                            await ret
+                    if accumulator is not None:
+                        accumulator.add(peer.state_dict)
+                        peer.state_dict = {}
+                except Exception as e:
+                    # Skip this peer only; the rest of the gather carries on
+                    tplr.logger.warning(f"Skipping UID {peer.uid}: {e}")
+                    continue
+                received[peer.uid] = peer
+        except Exception as e:
+            tplr.logger.error(f"Error processing uid batch: {str(e)}")
+
+        tplr.logger.info(
+            f"{tplr.P(window, tplr.T() - download_start)} Downloaded and processed peer gradients <--"
+        )
+
+        # Assemble in the caller's uid order so results are deterministic
+        aggregated_state_dict = {}
+        valid_uids = []
+        global_steps = []
+        for uid in uids:
+            peer = received.get(uid)
+            if peer is None:
+                continue
+            for param_name, tensor in peer.state_dict.items():
+                if isinstance(tensor, torch.Tensor) or param_name.endswith(
+                    "quant_params"
+                ):
+                    aggregated_state_dict.setdefault(param_name, []).append(tensor)
+            valid_uids.append(uid)
+            global_steps.append(peer.global_step)
+        skipped_uids = [uid for uid in uids if uid not in received]
 
         if not valid_uids:
             tplr.logger.info("No valid gradients received from any UID")
@@ -1123,6 +1677,7 @@ class Comms(ChainManager):
             uids=valid_uids,
             global_steps=global_steps,
             skipped_uids=skipped_uids,
+            accumulator=accumulator,
         )
         return result
 
@@ -1143,27 +1698,78 @@ class Comms(ChainManager):
                     if obj["Key"].startswith("checkpoint"):
                         checkpoint_files.append(obj)
 
-            checkpoint_files.sort(key=lambda x: x["LastModified"], reverse=True)
+            # A sharded checkpoint spans many objects; keep or drop it whole
+            checkpoints = {}
+            for obj in checkpoint_files:
+                checkpoints.setdefault(stem_of(obj["Key"]), []).append(obj)
+            newest = sorted(
+                checkpoints.values(),
+                key=lambda objs: max(obj["LastModified"] for obj in objs),
+                reverse=True,
+            )
 
-            if len(checkpoint_files) > keep_last:
-                to_delete = checkpoint_files[keep_last:]
-                await s3_client.delete_objects(
-                    Bucket=self.bucket.name,
-                    Delete={"Objects": [{"Key": obj["Key"]} for obj in to_delete]},
-                )
-                tplr.logger.info(f"Deleted {len(to_delete)} old checkpoints")
+            if len(newest) > keep_last:
+                to_delete = [
+                    {"Key": obj["Key"]} for objs in newest[keep_last:] for obj in objs
+                ]
+                for i in range(0, len(to_delete), 1000):
+                    await s3_client.delete_objects(
+                        Bucket=self.bucket.name,
+                        Delete={"Objects": to_delete[i : i + 1000]},
+                    )
+                tplr.logger.info(f"Deleted {len(newest) - keep_last} old checkpoints")
 
-        except (ConnectionClosedError, ClientError):
-            await self._purge_s3_client(self.bucket)
+        except (ConnectionClosedError, ClientError) as e:
+            await self._purge_s3_client(self.bucket, e)
         except Exception as e:
             tplr.logger.error(f"Error cleaning up old checkpoints: {e}")
 
     ## Peer Management
 
+    async def _refresh_activity(self, bucket: Bucket) -> bool:
+        """List one peer bucket into the activity index; False if it failed."""
+        if not self.s3_pool.allow(bucket):
+            return False
+        try:
+            s3_client = await self._get_s3_client(bucket)
+            await self.activity_index.refresh(bucket, s3_client, self.current_window)
+            return True
+        except (ConnectionClosedError, ClientError) as e:
+            await self._purge_s3_client(bucket, e)
+        except Exception as e:
+            tplr.logger.error(f"Error listing bucket {bucket.name}: {e}")
+        return False
+
+    async def refresh_activity_index(self) -> None:
+        """Refresh the activity index with one listing per committed bucket."""
+        buckets = {}
+        for bucket in (self.commitments or {}).values():
+            if bucket is not None:
+                buckets[ActivityIndex.bucket_key(bucket)] = bucket
+        self.activity_index.retain(list(buckets.values()))
+
+        semaphore = asyncio.Semaphore(min(30, max(len(buckets), 1)))
+
+        async def refresh(bucket):
+            async with semaphore:
+                await self._refresh_activity(bucket)
+
+        await asyncio.gather(*(refresh(bucket) for bucket in buckets.values()))
+
+    def start_prefetch(
+        self, window: int, uids: list[int], key: str = "gradient"
+    ) -> None:
+        """Start downloading ``uids``' objects for ``window`` as soon as they land."""
+        self.prefetcher.start(window, uids, key)
+
+    def gradients_ready(self, uids: list[int], window: int) -> list[int]:
+        """UIDs whose gradient for ``window`` the activity index has seen."""
+        buckets = {int(uid): self.commitments.get(int(uid)) for uid in uids}
+        return self.activity_index.ready_uids(buckets, window)
+
     async def is_miner_active(self, uid: int, recent_windows: int = 3) -> bool:
         """Check if the miner has uploaded gradients in the last few windows."""
         tplr.logger.debug(f"Checking if UID {uid} is active")
-        current_window = self.current_window
 
         peer_bucket = self.commitments.get(uid)
         if not peer_bucket:
@@ -1174,71 +1780,47 @@ class Comms(ChainManager):
             )
             return False
 
-        try:
-            s3_client = await self._get_s3_client(peer_bucket)
+        if not hasattr(self, "current_window") or self.current_window is None:
+            tplr.logger.error(
+                "current_window is not set in comms. Please set comms.current_window."
+            )
+            return False
 
-            if not hasattr(self, "current_window") or self.current_window is None:
-                tplr.logger.error(
-                    "current_window is not set in comms. Please set comms.current_window."
-                )
+        # Buckets not yet seen by track_active_peers are listed on demand
+        if not self.activity_index.has(peer_bucket):
+            if not await self._refresh_activity(peer_bucket):
                 return False
 
-            current_window = self.current_window
-            for window in range(current_window - recent_windows, current_window + 1):
-                filename = f"gradient-{window}-{uid}-v{__version__}.pt"
-                tplr.logger.debug(f"Checking for {filename} in {peer_bucket.name}")
-                try:
-                    await s3_client.head_object(Bucket=peer_bucket.name, Key=filename)
-                    tplr.logger.debug(f"Found {filename} for UID {uid}")
-                    return True
-                except botocore.exceptions.ClientError as e:
-                    if e.response["Error"]["Code"] not in ["404", "403", "401"]:
-                        tplr.logger.error(f"Error checking activity for {uid}: {e}")
-                        return False
-                    tplr.log_with_context(
-                        level="debug",
-                        message=f"{filename} not found for UID {uid}",
-                        current_window=self.current_window,
-                    )
-
-        except (ConnectionClosedError, ClientError):
-            await self._purge_s3_client(peer_bucket)
-        except Exception as e:
-            tplr.logger.error(f"Error accessing bucket for UID {uid}: {e}")
-            return False
-
-        return False
+        return self.activity_index.is_active(
+            peer_bucket, uid, self.current_window, recent_windows
+        )
 
     async def track_active_peers(self):
         """Background task to keep track of active peers."""
         while True:
-            active_peers = set()
-            max_concurrent = min(30, len(self.commitments) if self.commitments else 10)
-            semaphore = asyncio.Semaphore(max_concurrent)
-
             tplr.logger.debug(f"Commitments: {self.commitments}")
 
-            async def check_peer(uid):
-                async with semaphore:
-                    is_active = await self.is_miner_active(
-                        uid, recent_windows=self.recent_windows
+            if getattr(self, "current_window", None) is None:
+                tplr.logger.error(
+                    "current_window is not set in comms. Please set comms.current_window."
+                )
+                active_peers = set()
+            else:
+                await self.refresh_activity_index()
+                active_peers = {
+                    uid
+                    for uid, bucket in (self.commitments or {}).items()
+                    if bucket is not None
+                    and self.activity_index.is_active(
+                        bucket, uid, self.current_window, self.recent_windows
                     )
-                    if is_active:
-                        active_peers.add(uid)
-
-            # Buffer the processing of commitments to avoid blocking the event loop (over resourcing)
-            batch_size = 50
-            commitment_uids = list(self.commitments.keys())
-
-            for i in range(0, len(commitment_uids), batch_size):
-                batch_uids = commitment_uids[i : i + batch_size]
-                batch_tasks = [check_peer(uid) for uid in batch_uids]
-                await asyncio.gather(*batch_tasks)
+                }
 
             self.active_peers = active_peers
 
             tplr.logger.info(
-                f"Updated active peers: {[int(uid) for uid in self.active_peers]}"
+                f"Updated active peers: {[int(uid) for uid in self.active_peers]} "
+                f"(activity index staleness {self.activity_index.staleness():.1f}s)"
             )
 
             await asyncio.sleep(self.active_check_interval)
@@ -1310,7 +1892,7 @@ class Comms(ChainManager):
     def _load_latest_local_checkpoint(self, version: str):
         try:
             local_dir = os.path.join(LOCAL_TMP_DIR, str(self.uid))
-            pattern = rf"checkpoint-(\d+)-{self.uid}-v{re.escape(version)}\.pt$"
+            pattern = rf"checkpoint-(\d+)-{self.uid}-v{re.escape(version)}\.(pt|json)$"
 
             if not os.path.exists(local_dir):
                 return None
@@ -1338,7 +1920,14 @@ class Comms(ChainManager):
             if checkpoints:
                 # choose the last modified checkpoint
                 latest = max(checkpoints, key=lambda x: x["modified"])
-                checkpoint_data = torch.load(latest["path"], weights_only=True)
+                if latest["path"].endswith(".json"):
+                    with open(latest["path"]) as f:
+                        manifest = json.load(f)
+                    checkpoint_data = load_sharded_checkpoint(
+                        latest["path"][: -len(".json")], manifest
+                    )
+                else:
+                    checkpoint_data = torch.load(latest["path"], weights_only=True)
                 return checkpoint_data, latest["window"]
             else:
                 return None
@@ -1351,7 +1940,11 @@ class Comms(ChainManager):
         try:
             s3_client = await self._get_s3_client(bucket)
 
-            pat = re.compile(rf"^checkpoint-(\d+)-{uid}-v{re.escape(version)}\.pt$")
+            # Sharded checkpoints are found by their manifest; shard keys
+            # contain a "/" and never match
+            pat = re.compile(
+                rf"^checkpoint-(\d+)-{uid}-v{re.escape(version)}\.(pt|json)$"
+            )
 
             # We'll track the largest checkpoint window and its key
             latest_checkpoint = None
@@ -1380,7 +1973,10 @@ class Comms(ChainManager):
                     match = pat.match(key)
                     if match:
                         window_number = int(match.group(1))
-                        if window_number > max_window:
+                        # Prefer the sharded copy of a window saved both ways
+                        if window_number > max_window or (
+                            window_number == max_window and key.endswith(".json")
+                        ):
                             max_window = window_number
                             latest_checkpoint = key
 
@@ -1392,7 +1988,13 @@ class Comms(ChainManager):
                     break
 
             # If we found a valid checkpoint, fetch it
-            if latest_checkpoint:
+            if latest_checkpoint and latest_checkpoint.endswith(".json"):
+                loaded_data = await self._get_sharded_checkpoint(
+                    bucket, latest_checkpoint
+                )
+                if loaded_data:
+                    return loaded_data, max_window
+            elif latest_checkpoint:
                 loaded_data = await self.s3_get_object(
                     key=latest_checkpoint, bucket=bucket
                 )
@@ -1401,10 +2003,41 @@ class Comms(ChainManager):
 
             return None
 
-        except (ConnectionClosedError, ClientError):
-            await self._purge_s3_client(bucket)
+        except (ConnectionClosedError, ClientError) as e:
+            await self._purge_s3_client(bucket, e)
+            return None
+
+    async def _get_sharded_checkpoint(self, bucket: Bucket, manifest_key: str):
+        """Download a sharded checkpoint's files in parallel and map them."""
+        manifest = await self.s3_get_object(key=manifest_key, bucket=bucket)
+        if not is_manifest(manifest):
+            tplr.logger.warning(f"Invalid checkpoint manifest {manifest_key}")
             return None
 
+        stem = stem_of(manifest_key)
+        directory = os.path.join(self.temp_dir, f"{stem}_{os.getpid()}")
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+        semaphore = asyncio.Semaphore(CHECKPOINT_TRANSFER_CONCURRENCY)
+
+        async def fetch(name: str) -> bool:
+            async with semaphore:
+                return await self._download_to_file(
+                    bucket, f"{stem}/{name}", os.path.join(directory, name)
+                )
+
+        try:
+            fetched = await asyncio.gather(
+                *(fetch(name) for name in manifest_files(manifest))
+            )
+            if not all(fetched):
+                tplr.logger.warning(f"Incomplete checkpoint {stem} in {bucket.name}")
+                return None
+            # Mapped shards stay readable after their files are unlinked below
+            return await asyncio.to_thread(load_sharded_checkpoint, directory, manifest)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
     async def load_checkpoint(
         self,
         model,
@@ -1428,13 +2061,9 @@ class Comms(ChainManager):
 
         checkpoint_data, checkpoint_window = result
         try:
-            # 1) Load model and optimizer state
-            model.load_state_dict(
-                {
-                    k: v.to(device)
-                    for k, v in checkpoint_data["model_state_dict"].items()
-                }
-            )
+            # 1) Load model and optimizer state; tensors are copied into the
+            # parameters one at a time, so sharded checkpoints page in lazily
+            model.load_state_dict(checkpoint_data["model_state_dict"])
             model.to(device)
 
             for state in optimizer.state.values():
@@ -1628,8 +2257,8 @@ class Comms(ChainManager):
 
                 return peers_dict["peers"], peers_dict["first_effective_window"]
 
-            except (ConnectionClosedError, ClientError):
-                await self._purge_s3_client(validator_bucket)
+            except (ConnectionClosedError, ClientError) as e:
+                await self._purge_s3_client(validator_bucket, e)
             except Exception as e:
                 tplr.logger.error(f"Error fetching peer list: {e}")
                 await asyncio.sleep(10)
@@ -1695,38 +2324,23 @@ class Comms(ChainManager):
         start_window,
     ):
         """Save checkpoint to R2 and local storage."""
+        # No up-front clone: shards are copied to host one at a time as they
+        # are written, then uploaded from the local copy
         checkpoint_data = {
-            "model_state_dict": {
-                k: v.cpu().clone() for k, v in model.state_dict().items()
-            },
-            "optimizer_state_dict": {
-                k: v.cpu().clone() if torch.is_tensor(v) else v
-                for k, v in optimizer.state_dict().items()
-            },
+            "model_state_dict": model.state_dict(),
+            "optimizer_state_dict": optimizer.state_dict(),
             "scheduler_state_dict": scheduler.state_dict(),
-            "momentum": {k: v.cpu().clone() for k, v in momentum.items()},
+            "momentum": dict(momentum),
             "start_window": start_window,
             "current_window": current_window,
         }
 
-        # save locally
-        await self.put(
-            state_dict=checkpoint_data,
+        await self._put_checkpoint(
+            checkpoint_data,
             uid=str(self.uid),
             window=current_window,
-            key="checkpoint",
-            global_step=global_step,
             local=True,
-        )
-
-        # upload to R2
-        await self.put(
-            state_dict=checkpoint_data,
-            uid=str(self.uid),
-            window=current_window,
-            key="checkpoint",
-            global_step=global_step,
-            local=False,
+            remote=True,
         )
 
         return True
@@ -1908,22 +2522,106 @@ class Comms(ChainManager):
         except Exception as e:
             raise ValueError(f"[{param_name}] Failed to convert indices to tensor: {e}")
 
+        error = self._index_shape_error(param_name, t, allowed_topk)
+        if error is not None:
+            raise ValueError(error)
+        _bounds_check(t)
+
+    @staticmethod
+    def _index_shape_error(
+        param_name: str, t: torch.Tensor, allowed_topk: int
+    ) -> str | None:
+        """Host-side length check for a tensor of compressed indices."""
         if t.ndim == 1:  # flat
             if t.numel() != allowed_topk:
-                raise ValueError(
+                return (
                     f"[{param_name}] Invalid number of indices: "
                     f"{t.numel()} but expected {allowed_topk}"
                 )
-            _bounds_check(t)
-            return
-
         # n-D compressed: last dim must be allowed_topk
-        if t.size(-1) != allowed_topk:
-            raise ValueError(
+        elif t.size(-1) != allowed_topk:
+            return (
                 f"[{param_name}] Last dimension size invalid: "
                 f"{t.size(-1)} but expected {allowed_topk}"
             )
-        _bounds_check(t)
+        if t.numel() == 0:
+            return f"[{param_name}] empty index list"
+        return None
+
+    def check_compressed_batch(
+        self,
+        state_dicts: list[dict],
+        totalks: dict,
+        allowed_topk: int | None = None,
+    ) -> tuple[list[bool], list[tuple[str, str] | None]]:
+        """
+        Validate the compressed gradients of many peers with a single sync.
+
+        Index lengths are checked on the host. Every index bounds check and
+        ``vals`` NaN/Inf check is reduced on-device to a flag, and all flags
+        are read back together instead of syncing once per tensor.
+
+        Args:
+            state_dicts: One compressed state dict per peer.
+            totalks: Chunk size per parameter name (without suffix).
+            allowed_topk: Expected index count; defaults to hparams.topk_compression.
+
+        Returns:
+            A per-peer pass mask, and for each failing peer the first offending
+            ``(param_name, reason)`` in state-dict order.
+        """
+        topk = self.hparams.topk_compression if allowed_topk is None else allowed_topk
+        failures: list[list[tuple[int, str, str]]] = [[] for _ in state_dicts]
+        # Deferred device checks, grouped by device so each group stacks
+        pending: dict[torch.device, list[tuple[int, int, str, str, torch.Tensor]]] = {}
+
+        for peer, state_dict in enumerate(state_dicts):
+            for order, (param_name, value) in enumerate(state_dict.items()):
+                if param_name.endswith("idxs"):
+                    totalk = totalks.get(param_name[:-4])
+                    if totalk is None:
+                        failures[peer].append((order, param_name, "missing totalk"))
+                        break
+                    if not torch.is_tensor(value) or value.ndim == 0:
+                        # Scalars and nested lists are checked on the host
+                        try:
+                            self.check_compressed_indices(
+                                param_name, value, totalk, allowed_topk=topk
+                            )
+                        except Exception as e:
+                            failures[peer].append((order, param_name, str(e)))
+                            break
+                        continue
+                    error = self._index_shape_error(
+                        param_name, value, min(topk, totalk)
+                    )
+                    if error is not None:
+                        failures[peer].append((order, param_name, error))
+                        break
+                    lo, hi = torch.aminmax(value)
+                    flag = (lo < 0) | (hi >= totalk)
+                    reason = f"[{param_name}] Index out of bounds (totalk = {totalk})"
+                elif param_name.endswith("vals") and torch.is_tensor(value):
+                    flag = ~torch.isfinite(value).all()
+                    reason = f"NaN/Inf in {param_name}"
+                else:
+                    continue
+                pending.setdefault(flag.device, []).append(
+                    (peer, order, param_name, reason, flag)
+                )
+
+        for checks in pending.values():
+            flags = torch.stack([check[4] for check in checks]).tolist()
+            for (peer, order, param_name, reason, _), bad in zip(checks, flags):
+                if bad:
+                    failures[peer].append((order, param_name, reason))
+
+        mask = [not peer_failures for peer_failures in failures]
+        first_bad = [
+            min(peer_failures)[1:] if peer_failures else None
+            for peer_failures in failures
+        ]
+        return mask, first_bad
 
     async def s3_get_object_size(self, bucket: Bucket, key: str) -> Optional[int]:
         """Get the size of an S3 object without downloading it using HEAD request."""
@@ -1937,7 +2635,7 @@ class Comms(ChainManager):
             return file_size
 
         except (ConnectionClosedError, ClientError) as e:
-            await self._purge_s3_client(bucket)
+            await self._purge_s3_client(bucket, e)
             if "404" in str(e):
                 tplr.log_with_context(
                     level="debug",
@@ -1951,9 +2649,20 @@ class Comms(ChainManager):
             return None
 
     async def s3_get_object_range(
-        self, bucket: Bucket, key: str, start: int, end: int, timeout: int = 30
-    ) -> Optional[bytes]:
-        """Download a specific byte range from S3 object."""
+        self,
+        bucket: Bucket,
+        key: str,
+        start: int,
+        end: int,
+        timeout: int = 30,
+        out: memoryview | None = None,
+    ) -> Optional[bytes | memoryview]:
+        """
+        Download a specific byte range from S3 object.
+
+        If ``out`` is given, the range is written into it in place (it must be
+        exactly ``end - start + 1`` bytes long) and ``out`` is returned.
+        """
         try:
             s3_client = await self._get_s3_client(bucket)
 
@@ -1965,23 +2674,29 @@ class Comms(ChainManager):
             )
 
             # Read the chunk data
+            expected_size = end - start + 1
             async with response["Body"] as stream:
-                chunk_data = await asyncio.wait_for(stream.read(), timeout=timeout)
+                if out is not None:
+                    received = await asyncio.wait_for(
+                        self._read_into(stream, out), timeout=timeout
+                    )
+                else:
+                    chunk_data = await asyncio.wait_for(stream.read(), timeout=timeout)
+                    received = len(chunk_data)
 
             # Verify chunk size
-            expected_size = end - start + 1
-            if len(chunk_data) != expected_size:
+            if received != expected_size:
                 raise Exception(
-                    f"Chunk size mismatch: got {len(chunk_data)}, expected {expected_size}"
+                    f"Chunk size mismatch: got {received}, expected {expected_size}"
                 )
 
-            return chunk_data
+            return out if out is not None else chunk_data
 
         except asyncio.TimeoutError:
             tplr.logger.error(f"Timeout downloading range {start}-{end} for {key}")
             return None
         except (ConnectionClosedError, ClientError) as e:
-            await self._purge_s3_client(bucket)
+            await self._purge_s3_client(bucket, e)
             tplr.logger.error(
                 f"Client error downloading range {start}-{end} for {key}: {e}"
             )
@@ -2052,6 +2767,34 @@ class Comms(ChainManager):
             # For large files, use multipart download
             tplr.logger.info(f"File size {file_size} bytes, using multipart download")
 
+            if file_size > self.max_in_memory_download:
+                # Too big to hold in memory: stage the ranged chunks on disk
+                temp_file_path = os.path.join(
+                    self.temp_dir, f"temp_aggregation_{window}_{uuid.uuid4().hex}.pt"
+                )
+                try:
+                    success = await self.download_large_file(
+                        s3_client=await self._get_s3_client(bucket),
+                        bucket=bucket,
+                        key=filename,
+                        file_size=file_size,
+                        temp_file_path=temp_file_path,
+                    )
+                    if not success:
+                        raise Exception(f"Failed to download {filename}")
+                    loaded_data = self._load_payload(
+                        temp_file_path,
+                        map_location=self.config.device,
+                        weights_only=False,
+                    )
+                finally:
+                    if os.path.exists(temp_file_path):
+                        os.remove(temp_file_path)
+                tplr.logger.info(
+                    f"Successfully loaded aggregation data for window {window}"
+                )
+                return loaded_data
+
             # Calculate chunks
             chunks_info = []
             for start in range(0, file_size, chunk_size):
@@ -2064,6 +2807,10 @@ class Comms(ChainManager):
 
             semaphore = asyncio.Semaphore(max_concurrent)
 
+            # Every chunk lands directly in its slice of one preallocated buffer
+            buffer = bytearray(file_size)
+            view = memoryview(buffer)
+
             async def download_chunk(
                 start, end, max_retries: int = 3, backoff: float = 2.0
             ):
@@ -2081,6 +2828,7 @@ class Comms(ChainManager):
                                 start=start,
                                 end=end,
                                 timeout=45,
+                                out=view[start : end + 1],
                             )
                     except Exception as exc:
                         tplr.logger.warning(
@@ -2099,35 +2847,18 @@ class Comms(ChainManager):
             if None in chunks:
                 raise Exception("One or more chunks failed to download")
 
-            # Combine chunks in order
-            combined_bytes = b"".join(chunks)
-
-            # Create temporary file to deserialize
-            temp_file_path = os.path.join(
-                self.temp_dir, f"temp_aggregation_{window}_{uuid.uuid4().hex}.pt"
+            # Deserialise straight from the filled buffer
+            loaded_data = self._decode_payload(
+                filename,
+                buffer,
+                map_location=self.config.device,
+                weights_only=False,
             )
 
-            try:
-                # Write combined bytes to temporary file
-                async with aiofiles.open(temp_file_path, "wb") as f:
-                    await f.write(combined_bytes)
-
-                # Load the PyTorch data from the temporary file
-                loaded_data = torch.load(
-                    temp_file_path,
-                    map_location=self.config.device,
-                    weights_only=False,
-                )
-
-                tplr.logger.info(
-                    f"Successfully loaded aggregation data for window {window}"
-                )
-                return loaded_data
-
-            finally:
-                # Clean up temporary file
-                if os.path.exists(temp_file_path):
-                    os.remove(temp_file_path)
+            tplr.logger.info(
+                f"Successfully loaded aggregation data for window {window}"
+            )
+            return loaded_data
 
         except Exception as e:
             tplr.logger.error(
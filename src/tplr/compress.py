@@ -21,7 +21,17 @@
 # Global imports
 
 import math
-from typing import Generic, Literal, TypeAlias, TypeVar, cast, overload
+from typing import (
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    Literal,
+    TypeAlias,
+    TypeVar,
+    cast,
+    overload,
+)
 import torch
 import torch.fft
 
@@ -39,6 +49,11 @@ QuantParamsT: TypeAlias = tuple[torch.Tensor, float, int, torch.Tensor, torch.dt
 
 # Boolean flag that propagates the chosen quantisation mode
 Q = TypeVar("Q", Literal[True], Literal[False])
+# Key carried alongside each tensor through encode_iter/decode_iter
+K = TypeVar("K")
+
+# Elements per encode_batch/decode_batch call when streaming a whole model
+DCT_BATCH_NUMEL = 32 * 1024 * 1024
 
 
 class TransformDCT:
@@ -84,9 +99,12 @@ class TransformDCT:
 
     @torch.no_grad()
     def encode(self, x):
+        return self.encode_chunks(x, *(self.shape_dict[s] for s in x.shape))
+
+    @torch.no_grad()
+    def encode_chunks(self, x, n1, n2=None):
+        """Encode ``x`` with explicit chunk sizes (e.g. for a row-slice of a weight)."""
         if len(x.shape) > 1:  # 2D weights
-            n1 = self.shape_dict[x.shape[0]]
-            n2 = self.shape_dict[x.shape[1]]
             n1w = self.f_dict[n1].to(x.device)
             n2w = self.f_dict[n2].to(x.device)
             self.f_dict[n1] = n1w
@@ -96,7 +114,6 @@ class TransformDCT:
             x = self.einsum_2d(x, n1w, n2w)
 
         else:  # 1D weights
-            n1 = self.shape_dict[x.shape[0]]
             n1w = self.f_dict[n1].to(x.device)
             self.f_dict[n1] = n1w
 
@@ -128,6 +145,139 @@ class TransformDCT:
 
         return x
 
+    # ------------------------------------------------------------------ #
+    # Batched engine – one matmul per (n1, n2) bucket instead of per param
+    # ------------------------------------------------------------------ #
+    def _basis(
+        self, table: dict[int, torch.Tensor], n: int, device: torch.device
+    ) -> torch.Tensor:
+        w = table[n]
+        if w.device != device:
+            w = w.to(device)
+            table[n] = w
+        return w
+
+    @torch.no_grad()
+    def encode_batch(self, xs: list[torch.Tensor]) -> list[torch.Tensor]:
+        """
+        Encode many tensors at once. Equivalent to ``[self.encode(x) for x in xs]``.
+
+        Tensors whose chunk shape, dtype and device match are stacked chunk-wise
+        and transformed with a single batched matmul per bucket. The returned
+        tensors are views into the bucket output.
+        """
+        out: list[torch.Tensor | None] = [None] * len(xs)
+        buckets: dict[tuple, list[int]] = {}
+        for i, x in enumerate(xs):
+            chunk = tuple(self.shape_dict[s] for s in x.shape[:2])
+            buckets.setdefault((chunk, x.dtype, x.device), []).append(i)
+
+        for (chunk, dtype, device), members in buckets.items():
+            if len(chunk) == 2:  # 2D weights
+                n1, n2 = chunk
+                counts = [
+                    (xs[i].shape[0] // n1) * (xs[i].shape[1] // n2) for i in members
+                ]
+                stacked = torch.empty(sum(counts), n1, n2, dtype=dtype, device=device)
+                offset = 0
+                for i, count in zip(members, counts):
+                    # "(y h) (x w) -> (y x) h w" written straight into the bucket
+                    stacked[offset : offset + count].view(
+                        xs[i].shape[0] // n1, -1, n1, n2
+                    ).copy_(rearrange(xs[i], "(y h) (x w) -> y x h w", h=n1, w=n2))
+                    offset += count
+
+                n1w = self._basis(self.f_dict, n1, device)
+                n2w = self._basis(self.f_dict, n2, device)
+                _chunk_matmul_(stacked, n1w.T, n2w)
+
+                offset = 0
+                for i, count in zip(members, counts):
+                    out[i] = stacked[offset : offset + count].view(
+                        xs[i].shape[0] // n1, -1, n1, n2
+                    )
+                    offset += count
+
+            else:  # 1D weights
+                (n1,) = chunk
+                stacked = torch.cat([xs[i].reshape(-1, n1) for i in members])
+                encoded = stacked @ self._basis(self.f_dict, n1, device)
+
+                offset = 0
+                for i in members:
+                    rows = xs[i].shape[0] // n1
+                    out[i] = encoded[offset : offset + rows]
+                    offset += rows
+
+        return cast(list[torch.Tensor], out)
+
+    @torch.no_grad()
+    def decode_batch(self, xs: list[torch.Tensor]) -> list[torch.Tensor]:
+        """
+        Decode many tensors at once. Equivalent to ``[self.decode(x) for x in xs]``.
+
+        Inputs are bucketed by their trailing chunk dims, dtype and device and
+        inverse-transformed with a single batched matmul per bucket.
+        """
+        out: list[torch.Tensor | None] = [None] * len(xs)
+        buckets: dict[tuple, list[int]] = {}
+        for i, x in enumerate(xs):
+            chunk = tuple(x.shape[2:]) if x.ndim > 2 else (x.shape[1],)
+            buckets.setdefault((chunk, x.dtype, x.device), []).append(i)
+
+        for (chunk, _, device), members in buckets.items():
+            if len(chunk) == 2:  # 2D weights
+                n1, n2 = chunk
+                stacked = torch.cat([xs[i].reshape(-1, n1, n2) for i in members])
+                n1w = self._basis(self.b_dict, n1, device)
+                n2w = self._basis(self.b_dict, n2, device)
+                _chunk_matmul_(stacked, n1w.T, n2w)
+
+                offset = 0
+                for i in members:
+                    y, x = xs[i].shape[0], xs[i].shape[1]
+                    out[i] = rearrange(
+                        stacked[offset : offset + y * x],
+                        "(y x) h w -> (y h) (x w)",
+                        y=y,
+                    )
+                    offset += y * x
+
+            else:  # 1D weights
+                (n1,) = chunk
+                stacked = torch.cat([xs[i] for i in members])
+                decoded = stacked @ self._basis(self.b_dict, n1, device)
+
+                offset = 0
+                for i in members:
+                    rows = xs[i].shape[0]
+                    out[i] = decoded[offset : offset + rows].reshape(-1)
+                    offset += rows
+
+        return cast(list[torch.Tensor], out)
+
+    def encode_iter(
+        self,
+        items: Iterable[tuple[K, torch.Tensor]],
+        max_numel: int = DCT_BATCH_NUMEL,
+    ) -> Iterator[tuple[K, torch.Tensor]]:
+        """
+        Encode ``(key, tensor)`` pairs lazily, yielding ``(key, encoded)``.
+
+        Inputs are pulled from ``items`` and encoded with :meth:`encode_batch`
+        once a batch holds ``max_numel`` elements, so only one batch of inputs
+        and outputs is alive at a time.
+        """
+        return _in_batches(items, self.encode_batch, max_numel)
+
+    def decode_iter(
+        self,
+        items: Iterable[tuple[K, torch.Tensor]],
+        max_numel: int = DCT_BATCH_NUMEL,
+    ) -> Iterator[tuple[K, torch.Tensor]]:
+        """Decode ``(key, tensor)`` pairs lazily, like :meth:`encode_iter`."""
+        return _in_batches(items, self.decode_batch, max_numel)
+
 
 class CompressDCT(Generic[Q]):
     """DCT-style sparsifier/compressor with optional 8-bit quantisation."""
@@ -198,6 +348,17 @@ class CompressDCT(Generic[Q]):
     @torch.no_grad()
     def compress(self, x: torch.Tensor, topk: int):  # type: ignore[override]
         xshape = x.shape
+        idx, val, totalk = self._select_topk(x, topk)
+
+        # Apply 8-bit quantization if enabled
+        if self.use_quantization:
+            val, quant_params = self._quantize_values(val)
+            return idx, val, xshape, totalk, quant_params
+
+        return idx, val, xshape, totalk
+
+    @torch.no_grad()
+    def _select_topk(self, x: torch.Tensor, topk: int) -> tuple[IdxT, ValT, TotK]:
         if len(x.shape) > 2:  # 2D weights
             x = rearrange(x, "y x h w -> y x (h w)")
 
@@ -211,15 +372,130 @@ class CompressDCT(Generic[Q]):
         val = torch.gather(x, dim=-1, index=idx_int64)
 
         # Cast idx to int16 for saving or transmission
-        idx = idx_int64.to(torch.int16)
+        return idx_int64.to(torch.int16), val, totalk
 
-        # Apply 8-bit quantization if enabled
+    @torch.no_grad()
+    def compress_blockwise(
+        self,
+        x: torch.Tensor,
+        transformer: TransformDCT,
+        topk: int,
+        block_size: int,
+        *,
+        subtract_residual: bool = True,
+    ):
+        """
+        Encode and compress ``x`` one row-block of DCT chunks at a time.
+
+        Produces the same output as ``compress(transformer.encode(x), topk)``
+        without materialising the full encoded tensor. Each block holds whole
+        rows of chunks and at most ``block_size`` elements (never less than
+        one row of chunks). When ``subtract_residual`` is set, the transmitted
+        gradient (dequantised, decompressed and decoded) is subtracted from
+        ``x`` in place, again block by block, so peak extra memory scales with
+        ``block_size`` instead of the parameter size.
+
+        Args:
+            x: Tensor to compress (e.g. the momentum), updated in place.
+            transformer: The DCT transformer used to encode/decode ``x``.
+            topk: Number of coefficients to keep per chunk.
+            block_size: Upper bound on elements of ``x`` processed at once.
+            subtract_residual: Whether to remove the transmitted part from ``x``.
+
+        Returns:
+            Same tuple as :meth:`compress`.
+        """
+        chunks = [transformer.shape_dict[s] for s in x.shape]
+        n1 = chunks[0]
+        n_rows = x.shape[0] // n1
+        row_numel = x[:n1].numel()
+        rows_per_block = max(1, block_size // row_numel)
+
+        idx_blocks, val_blocks = [], []
+        block_shape = totalk = None
+        for r in range(0, n_rows, rows_per_block):
+            encoded = transformer.encode_chunks(
+                x[r * n1 : (r + rows_per_block) * n1], *chunks
+            )
+            block_shape = encoded.shape
+            idx, val, totalk = self._select_topk(encoded, topk)
+            idx_blocks.append(idx)
+            val_blocks.append(val)
+            del encoded
+
+        idx = torch.cat(idx_blocks)
+        val = torch.cat(val_blocks)
+        xshape = torch.Size((n_rows, *block_shape[1:]))  # type: ignore[index]
+        del idx_blocks, val_blocks
+
+        quant_params = None
         if self.use_quantization:
             val, quant_params = self._quantize_values(val)
-            return idx, val, xshape, totalk, quant_params
 
+        if subtract_residual:
+            self.subtract_transmitted_(
+                x, transformer, idx, val, xshape, quant_params, block_size=block_size
+            )
+
+        if self.use_quantization:
+            return idx, val, xshape, totalk, quant_params
         return idx, val, xshape, totalk
 
+    @torch.no_grad()
+    def subtract_transmitted_(
+        self,
+        x: torch.Tensor,
+        transformer: TransformDCT,
+        idx: torch.Tensor,
+        val: torch.Tensor,
+        xshape: ShapeT,
+        quantize_params: QuantParamsT | None = None,
+        *,
+        block_size: int = 16 * 1024 * 1024,
+    ) -> torch.Tensor:
+        """
+        Subtract the transmitted gradient from ``x`` in place, straight from
+        the sparse ``(idx, val, quant_params)`` payload.
+
+        Equivalent to ``x -= transformer.decode(self.decompress(...))``. The
+        DCT basis is orthonormal, so every kept coefficient decodes to a rank-1
+        pattern inside its chunk: ``val * outer(B1[i], B2[j])``. Only the basis
+        rows of the top-k coefficients are gathered, which skips the zero-filled
+        scatter and the dense inverse DCT. Work is done in row-blocks of at
+        most ``block_size`` elements of ``x``.
+        """
+        if self.use_quantization and quantize_params is not None:
+            val = self._dequantize_values(val, quantize_params)
+        val = val.to(device=x.device, dtype=x.dtype)
+        idx = idx.to(device=x.device, dtype=torch.int64)
+
+        if len(xshape) > 2:  # 2D weights
+            n_rows, n_cols, h, w = cast(Shape4D, xshape)
+            b1 = transformer._basis(transformer.b_dict, h, x.device)
+            b2 = transformer._basis(transformer.b_dict, w, x.device)
+            # x as (y, x, h, w) chunks, without copying
+            chunks = x.view(n_rows, h, n_cols, w).permute(0, 2, 1, 3)
+            rows_per_block = max(1, block_size // (n_cols * h * w))
+
+            for r in range(0, n_rows, rows_per_block):
+                block_idx = idx[r : r + rows_per_block]
+                left = b1[block_idx // w] * val[r : r + rows_per_block].unsqueeze(-1)
+                right = b2[block_idx % w]
+                chunks[r : r + rows_per_block].sub_(left.transpose(-1, -2) @ right)
+
+        else:  # 1D weights
+            n_rows, n = xshape
+            b1 = transformer._basis(transformer.b_dict, n, x.device)
+            chunks = x.view(n_rows, n)
+            rows_per_block = max(1, block_size // n)
+
+            for r in range(0, n_rows, rows_per_block):
+                block_val = val[r : r + rows_per_block].unsqueeze(-2)
+                basis = b1[idx[r : r + rows_per_block]]
+                chunks[r : r + rows_per_block].sub_((block_val @ basis).squeeze(-2))
+
+        return x
+
     @torch.no_grad()
     def decompress(
         self,
@@ -271,11 +547,100 @@ class CompressDCT(Generic[Q]):
         if quantize_params is not None and not isinstance(quantize_params, list):
             quantize_params = [quantize_params] * len(val)  # type: ignore[list-item]
 
+        # Peers share the same layout after validation, so stack them and do
+        # everything in a handful of batched ops.
+        if len({tuple(i.shape) for i in idx} | {tuple(v.shape) for v in val}) == 1:
+            return self.batch_decompress_stacked(
+                p,
+                torch.stack([i.to(p.device) for i in idx]),
+                torch.stack([v.to(p.device) for v in val]),
+                xshape,
+                totalk,
+                quantize_params,  # type: ignore[arg-type]
+                normalise=normalise,
+            )
+
+        return self._batch_decompress_loop(
+            p, idx, val, xshape, totalk, quantize_params, normalise=normalise
+        )
+
+    @torch.no_grad()
+    def batch_decompress_stacked(
+        self,
+        p: torch.Tensor,
+        idx: torch.Tensor,
+        val: torch.Tensor,
+        xshape: ShapeT,
+        totalk: int,
+        quantize_params: list[QuantParamsT] | None = None,
+        *,
+        normalise: bool = True,
+    ) -> torch.Tensor:
+        """
+        Vectorised multi-peer decompression.
+
+        Args:
+            p: Parameter giving the output device and dtype.
+            idx: Peer indices stacked as ``[P, ..., k]``.
+            val: Peer values stacked as ``[P, ..., k]`` (quantised if enabled).
+            xshape: Encoded shape of the parameter.
+            totalk: Size of the flattened chunk dimension.
+            quantize_params: One entry per peer, or None.
+            normalise: L2-normalise each peer's values per chunk.
+
+        Returns:
+            The mean of all peers' contributions, scattered in a single op.
+        """
+        n_peers = val.shape[0]
+        idx = idx.to(p.device)
+        val = val.to(p.device)
+
+        if self.use_quantization and quantize_params:
+            shifts = torch.stack(
+                [torch.as_tensor(q[0], device=p.device) for q in quantize_params]
+            ).to(torch.float32)
+            lookups = torch.stack(
+                [torch.as_tensor(q[3], device=p.device) for q in quantize_params]
+            )
+            val = lookups.gather(1, val.reshape(n_peers, -1).long()).view(val.shape)
+            val = (val + shifts.view(-1, *([1] * (val.ndim - 1)))).to(
+                quantize_params[0][4]
+            )
+
+        if normalise:
+            eps = 1e-8
+            if val.ndim > 2:  # 2D weights and biases, per chunk
+                val = val / (torch.norm(val, p=2, dim=-1, keepdim=True) + eps)
+            else:  # Single values
+                l2_norm = torch.norm(val, p=2, dim=-1, keepdim=True)
+                val = torch.where(l2_norm > eps, val / l2_norm, val)
+
+        # [P, ..., k] -> [..., P * k], peer-major like the concatenated layout
+        idx_concat = idx.movedim(0, -2).flatten(-2)
+        val_concat = val.movedim(0, -2).flatten(-2).to(p.dtype)
+
+        return self.decompress(
+            p, idx_concat, val_concat, xshape, totalk, quantize_params=None
+        )
+
+    @torch.no_grad()
+    def _batch_decompress_loop(
+        self,
+        p: torch.Tensor,
+        idx: list[torch.Tensor],
+        val: list[torch.Tensor],
+        xshape: ShapeT,
+        totalk: int,
+        quantize_params: list[QuantParamsT] | None = None,
+        *,
+        normalise: bool = True,
+    ) -> torch.Tensor:
+        """Per-peer fallback for ragged inputs that cannot be stacked."""
         processed_vals: list[torch.Tensor] = []
         for i, v in enumerate(val):
             v = v.to(p.device)
             if self.use_quantization and quantize_params:
-                v = self._dequantize_values(v, quantize_params[i])  # type: ignore[arg-type]
+                v = self._dequantize_values(v, quantize_params[i])
 
             if normalise:
                 eps = 1e-8
@@ -343,6 +708,136 @@ class CompressDCT(Generic[Q]):
         return deq.to(orig_dtype)
 
 
+class GradientAccumulator:
+    """
+    Running mean of peers' decompressed gradients in fixed-size buffers.
+
+    ``batch_decompress`` needs every peer's ``idxs``/``vals`` at once. This
+    folds one peer at a time into a per-parameter scatter-sum and contribution
+    count instead, so memory stays O(model) however many peers are gathered.
+    ``result`` equals ``batch_decompress`` over the same peers.
+
+    The buffers cost about 6 bytes per parameter, against well under one
+    byte per parameter per peer for the sparse lists at usual top-k ratios,
+    so this only pays off with a few hundred peers (``accumulator_min_peers``).
+    """
+
+    def __init__(
+        self,
+        compressor: CompressDCT,
+        xshapes: dict[str, ShapeT],
+        totalks: dict[str, int],
+        device: str | torch.device,
+        dtype: torch.dtype = torch.float32,
+        *,
+        normalise: bool = True,
+    ) -> None:
+        self.compressor = compressor
+        self.xshapes = xshapes
+        self.totalks = totalks
+        self.device = torch.device(device)
+        self.dtype = dtype
+        self.normalise = normalise
+        self.peers = 0
+        self._sums: dict[str, torch.Tensor] = {}
+        # int16 counts halve the buffer cost and still allow 32k peers
+        self._counts: dict[str, torch.Tensor] = {}
+
+    def __len__(self) -> int:
+        return self.peers
+
+    def _buffers(self, name: str) -> tuple[torch.Tensor, torch.Tensor]:
+        if name not in self._sums:
+            xshape = self.xshapes[name]
+            if len(xshape) > 2:  # 2D weights, chunks flattened like decompress
+                shape = (xshape[0], xshape[1], xshape[2] * xshape[3])
+            else:
+                shape = tuple(xshape)
+            self._sums[name] = torch.zeros(shape, device=self.device, dtype=self.dtype)
+            self._counts[name] = torch.zeros(
+                shape, device=self.device, dtype=torch.int16
+            )
+        return self._sums[name], self._counts[name]
+
+    @torch.no_grad()
+    def add(self, state_dict: dict) -> None:
+        """
+        Fold one peer's ``<name>idxs`` / ``vals`` / ``quant_params`` into the mean.
+
+        Every parameter's shapes are checked before any buffer is touched, so
+        a peer that raises leaves the accumulator unchanged.
+        """
+        updates = []
+        for name in self.xshapes:
+            idx = state_dict.get(name + "idxs")
+            val = state_dict.get(name + "vals")
+            if idx is None or val is None:
+                continue
+
+            val = val.to(self.device)
+            qparams = state_dict.get(name + "quant_params")
+            if self.compressor.use_quantization and qparams is not None:
+                val = self.compressor._dequantize_values(val, qparams)
+
+            if self.normalise:
+                eps = 1e-8
+                if val.ndim > 1:  # 2D weights and biases, per chunk
+                    val = val / (torch.norm(val, p=2, dim=-1, keepdim=True) + eps)
+                else:  # Single values
+                    l2_norm = torch.norm(val, p=2)
+                    val = torch.where(l2_norm > eps, val / l2_norm, val)
+
+            sums, counts = self._buffers(name)
+            idx = idx.to(self.device, torch.int64)
+            # Index ranges are already checked by gather; shapes are cheap
+            if idx.shape != val.shape or idx.shape[:-1] != sums.shape[:-1]:
+                raise ValueError(f"Malformed idxs/vals for {name}")
+            updates.append((sums, counts, idx, val))
+
+        for sums, counts, idx, val in updates:
+            sums.scatter_add_(-1, idx, val.to(self.dtype))
+            counts.scatter_add_(-1, idx, torch.ones_like(idx, dtype=torch.int16))
+        self.peers += 1
+
+    @torch.no_grad()
+    def result(self, name: str) -> torch.Tensor | None:
+        """Mean of all folded peers for ``name`` (zero where none contributed)."""
+        sums = self._sums.get(name)
+        if sums is None:
+            return None
+        x = sums / self._counts[name].clamp_min(1)
+        xshape = self.xshapes[name]
+        if len(xshape) > 2:
+            x = rearrange(x, "y x (h w) -> y x h w", h=xshape[2])
+        return x
+
+
+def _in_batches(
+    items: Iterable[tuple[K, torch.Tensor]],
+    transform: Callable[[list[torch.Tensor]], list[torch.Tensor]],
+    max_numel: int,
+) -> Iterator[tuple[K, torch.Tensor]]:
+    keys, batch, numel = [], [], 0
+    for key, x in items:
+        keys.append(key)
+        batch.append(x)
+        numel += x.numel()
+        if numel >= max_numel:
+            yield from zip(keys, transform(batch))
+            keys, batch, numel = [], [], 0
+    if batch:
+        yield from zip(keys, transform(batch))
+
+
+def _chunk_matmul_(
+    stacked: torch.Tensor, left: torch.Tensor, right: torch.Tensor, block: int = 4096
+) -> None:
+    """In-place ``left @ chunk @ right`` over ``[N, n1, n2]``, ``block`` chunks at a time."""
+    for start in range(0, stacked.shape[0], block):
+        chunks = stacked[start : start + block]
+        torch.matmul(torch.matmul(left, chunks), right, out=chunks)
+
+
 # Code modified and sourced from https://github.com/zh217/torch-dct
 def _dct_fft_impl(v):
     return torch.view_as_real(torch.fft.fft(v, dim=1))
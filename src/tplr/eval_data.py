@@ -0,0 +1,155 @@
+# The MIT License (MIT)
+# © 2025 tplr.ai
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the "Software"), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+
+# Global imports
+import asyncio
+import random
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+import torch
+
+# Local imports
+from .logging import logger
+
+
+def sample_batch_indices(total: int, sample_rate: float) -> list[int]:
+    """Sorted random sample of ``max(1, total * sample_rate)`` batch indices."""
+    if total <= 0:
+        return []
+    size = min(max(1, int(total * sample_rate)), total)
+    return sorted(random.sample(range(total), size))
+
+
+def sample_batches(
+    loader, sample_rate: float, pin_memory: bool = False
+) -> tuple[torch.Tensor, int] | None:
+    """
+    Stack a sample of ``loader``'s batches into one tensor.
+
+    Batches are views into the loader's token buffer until the sampled ones
+    are copied out, so only those are kept. Returns the
+    ``(n_sampled, batch_size, sequence_length)`` tensor and the number of
+    batches the loader produced, or None if it produced none.
+    """
+    views = [torch.as_tensor(batch) for batch in loader]
+    indices = sample_batch_indices(len(views), sample_rate)
+    if not indices:
+        return None
+    batches = torch.stack([views[i] for i in indices]).to(torch.long)
+    if pin_memory:
+        batches = batches.pin_memory()
+    return batches, len(views)
+
+
+@dataclass
+class EvalBatches:
+    """The sampled evaluation batches of one seed's pages."""
+
+    batches: torch.Tensor  # (n_sampled, batch_size, sequence_length)
+    total: int  # batches the loader produced before sampling
+    pages: list
+
+    def __len__(self) -> int:
+        return self.batches.shape[0]
+
+
+class EvalDataService:
+    """
+    Loads the evaluation data for a window ahead of its use.
+
+    ``start`` loads the data of every seed (UIDs and the random-data seed) in
+    the background, at most ``max_concurrent`` at a time and in the order
+    given. ``load(seed)`` must return ``{"loader": ..., "pages": ...}`` or
+    None. Each loader is reduced to its sampled batches, stacked into one
+    tensor pinned for fast host-to-device copies, and dropped. ``get`` waits
+    for one seed's batches. Every caller that asks for the same seed gets the
+    same batches until ``release`` or the next ``start``.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[int], Awaitable[dict[str, Any] | None]],
+        sample_rate: float,
+        max_concurrent: int = 4,
+        pin_memory: bool | None = None,
+    ):
+        self.load = load
+        self.sample_rate = sample_rate
+        self.max_concurrent = max_concurrent
+        self.pin_memory = (
+            torch.cuda.is_available() if pin_memory is None else pin_memory
+        )
+        self.window: int | None = None
+        self._tasks: dict[int, asyncio.Task] = {}
+
+    def start(self, window: int, seeds: list[int]) -> None:
+        """Load ``seeds``' batches for ``window``, dropping any previous window."""
+        self.stop()
+        self.window = window
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        for seed in seeds:
+            seed = int(seed)
+            if seed not in self._tasks:
+                self._tasks[seed] = asyncio.create_task(self._fetch(seed, semaphore))
+
+    def stop(self) -> None:
+        """Cancel outstanding loads and drop all loaded batches."""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+        self.window = None
+
+    def release(self, seed: int) -> None:
+        """Drop one seed's batches once they are no longer needed."""
+        task = self._tasks.pop(int(seed), None)
+        if task is not None:
+            task.cancel()
+
+    async def _fetch(
+        self, seed: int, semaphore: asyncio.Semaphore
+    ) -> EvalBatches | None:
+        async with semaphore:
+            data = await self.load(seed)
+            if not data or data.get("loader") is None:
+                return None
+            sampled = await asyncio.to_thread(
+                sample_batches, data["loader"], self.sample_rate, self.pin_memory
+            )
+        if sampled is None:
+            return None
+        batches, total = sampled
+        return EvalBatches(batches=batches, total=total, pages=data["pages"])
+
+    async def get(self, seed: int) -> EvalBatches | None:
+        """The sampled batches for ``seed``, loading them now if not started."""
+        seed = int(seed)
+        task = self._tasks.get(seed)
+        if task is None:
+            task = asyncio.create_task(self._fetch(seed, asyncio.Semaphore(1)))
+            self._tasks[seed] = task
+        try:
+            # Shielded so a cancelled caller does not cancel a shared load
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if task.cancelled():
+                return None
+            raise
+        except Exception as e:
+            logger.warning(f"Failed to load evaluation data for seed {seed}: {e}")
+            return None
@@ -39,6 +39,8 @@ DEFAULT_HPARAMS = {
     "momentum_decay": 0.999,
     "topk_compression": 32,
     "target_chunk": 64,
+    "compression_block_size": None,  # Opt-in max elements per compression block
+    "accumulator_min_peers": 256,  # Peers needed to gather into a dense mean
     "scores_alpha": 0.001,
     # Model architecture (these should be in your hparams.json)
     "tokenizer_name": "huggyllama/llama-7b",
@@ -51,6 +53,16 @@ DEFAULT_HPARAMS = {
     "max_position_embeddings": 2048,
     # Bucket configuration
     "bucket_name": "your-default-bucket-name",
+    "max_in_memory_download_bytes": 1024**3,  # Larger objects are staged on disk
+    "max_in_memory_upload_bytes": 1024**3,  # Larger payloads are serialised to disk
+    "object_cache_memory_bytes": 1024**3,  # Recently downloaded objects by ETag
+    "object_cache_disk_bytes": 0,  # Disk tier of the object cache; 0 disables it
+    "prefetch_cache_bytes": 2 * 1024**3,  # Prefetched peer gradients
+    "checkpoint_shard_bytes": 512 * 1024**2,  # Max size of one checkpoint shard
+    # Catch-up and data loading
+    "catchup_lookahead": 4,  # Aggregation windows downloaded ahead of apply
+    "tokenize_processes": 0,  # >0 tokenizes pages in a process pool of this size
+    "eval_data_concurrency": 4,  # Evaluation loaders built at once by validators
     # Scheduler parameters
     "warmup_steps": 250,
     "alpha_f": 0.1,  # Final learning rate multiplier
@@ -21,6 +21,7 @@ import math
 import time
 from typing import TYPE_CHECKING, TypeVar, cast
 
+import numpy as np
 import torch
 import torch.nn as nn
 from torch._prims_common import DeviceLikeType
@@ -74,11 +75,16 @@ def prepare_gradient_dict(miner, pages, step_window):
     is_first_iteration = miner.gradient_iteration_counter == 1
     # Check if we're in the first 5 iterations
     is_early_iteration = miner.gradient_iteration_counter <= 5
+    # Opt-in bound (in elements) on the working set of the compression step,
+    # for memory-tight devices. Unset, momenta go through the batched DCT
+    # together, which needs more memory but far fewer kernel launches.
+    block_size = miner.hparams.compression_block_size
 
     if isinstance(miner.model, torch.nn.parallel.DistributedDataParallel):
         model_iterator = miner.model.module.named_parameters()
     else:
         model_iterator = miner.model.named_parameters()
+    dense = []  # owned parameters left for the batched compression below
     for n, p in model_iterator:
         # Weight-decay is done by *every* rank
         p.data.mul_(1.0 - lr * miner.hparams.weight_decay)
@@ -104,8 +110,34 @@ def prepare_gradient_dict(miner, pages, step_window):
             # Normal behavior for later iterations
             miner.momentum[n].add_(grad, alpha=lr)
 
+        if block_size:
+            # Encode, compress and subtract the transmitted gradient block by
+            # block, so no full-size encoded/decoded temporaries are created.
+            idxs, vals, xshape, totalk, quant_params = (
+                miner.compressor.compress_blockwise(
+                    miner.momentum[n],
+                    miner.transformer,
+                    miner.hparams.topk_compression,
+                    block_size,
+                    subtract_residual=not is_early_iteration,
+                )
+            )
+            gradient[n + "idxs"] = idxs.cpu()
+            gradient[n + "vals"] = vals.cpu()
+            gradient[n + "quant_params"] = quant_params
+            xshapes[n] = xshape
+            totalks[n] = totalk
+            p.grad = None
+            continue
+
+        dense.append(n)
+        # Clear gradient to free memory
+        p.grad = None
+
+    # Encode the momenta through the batched DCT, a bounded batch at a time
+    momenta = ((n, miner.momentum[n]) for n in dense)
+    for n, encoded in miner.transformer.encode_iter(momenta):
         # Compress momentum
-        encoded = miner.transformer.encode(miner.momentum[n])
         idxs, vals, xshape, totalk, quant_params = miner.compressor.compress(
             encoded, miner.hparams.topk_compression
         )
@@ -113,16 +145,12 @@ def prepare_gradient_dict(miner, pages, step_window):
             print("totalk is None")
         del encoded  # Free the encoded tensor immediately
 
-        # Estimate transmitted gradient
-        decompressed = miner.compressor.decompress(
-            p, idxs, vals, xshape, totalk, quant_params
-        )
-        transmit_grad = miner.transformer.decode(decompressed)
-        del decompressed  # Free intermediate tensor
-
-        # Skip subtracting transmitted gradient in the first 5 iterations
+        # Subtract the transmitted gradient straight from the sparse payload,
+        # skipping it in the first 5 iterations
         if not is_early_iteration:
-            miner.momentum[n].sub_(transmit_grad)
+            miner.compressor.subtract_transmitted_(
+                miner.momentum[n], miner.transformer, idxs, vals, xshape, quant_params
+            )
 
         # Move compressed values to CPU to save GPU memory
         gradient[n + "idxs"] = idxs.cpu() if isinstance(idxs, torch.Tensor) else idxs
@@ -131,11 +159,6 @@ def prepare_gradient_dict(miner, pages, step_window):
         xshapes[n] = xshape
         totalks[n] = totalk
 
-        del transmit_grad
-
-        # Clear gradient to free memory
-        p.grad = None
-
     torch.cuda.empty_cache()
 
     gradient["metadata"] = {"pages_info": pages, "window": step_window}
@@ -215,6 +238,49 @@ async def update_peers(
         logger.info(f"Not time to replace peers: {reason}")
 
 
+async def _compare_with_debug_dict(
+    instance: NeuronT,
+    window: int,
+    debug_task: "asyncio.Task | None",
+    param_slices: dict[str, torch.Tensor],
+    learning_rate: float,
+) -> None:
+    """Compare a post-update snapshot with the validator's debug dict for ``window``."""
+    debug_dict_result = await debug_task if debug_task is not None else None
+    if not (isinstance(debug_dict_result, dict) and "state_dict" in debug_dict_result):
+        # Fetched ahead of time, possibly before the validator posted it
+        debug_dict_result = await instance.comms.get_debug_dict(window)
+    if not (isinstance(debug_dict_result, dict) and "state_dict" in debug_dict_result):
+        logger.warning(f"Invalid debug dict format for window {window}")
+        return
+
+    debug_state_dict = cast(dict[str, list[float]], debug_dict_result["state_dict"])
+    comparison_metrics = compare_slices_with_debug_dict(
+        param_slices, debug_state_dict, learning_rate
+    )
+
+    if comparison_metrics["success"]:
+        # Log the comparison metrics
+        logger.info(
+            f"Window {window} - L2 norm difference between model and debug values: "
+            f"{comparison_metrics['l2_norm']}"
+        )
+        logger.info(
+            f"Window {window} - Average L2 norm per parameter: "
+            f"{comparison_metrics['avg_l2_norm']}"
+        )
+        logger.info(
+            f"Window {window} - Average absolute difference per parameter: "
+            f"{comparison_metrics['avg_abs_diff']}"
+        )
+        logger.info(
+            f"Window {window} - Average steps behind: "
+            f"{comparison_metrics['avg_steps_behind']}"
+        )
+    else:
+        logger.warning(f"Failed to compare model with debug dict for window {window}")
+
+
 async def catchup_with_aggregation_server(
     instance: NeuronT, checkpoint_current_window: int
 ):
@@ -222,181 +288,223 @@ async def catchup_with_aggregation_server(
     Catch up the model by applying aggregated gradients from the aggregation server
     and verifying against the validator's debug dict. Uses retry logic for the most
     recent window if needed.
+
+    Aggregation files for the next ``catchup_lookahead`` windows (hparam,
+    default 4) download concurrently, and the next window is unpacked in a
+    worker thread while the current one is applied. Debug dicts are fetched
+    alongside and compared in the background against a snapshot of the
+    compared parameter slices, so neither sits on the critical path.
     """
     logger.info("Starting catchup with aggregation server...")
 
     # Start from the checkpoint window and continue until we reach the current window
     checkpoint_window = checkpoint_current_window + 1
     target_window = instance.current_window
+    lookahead = max(1, int(instance.hparams.catchup_lookahead))
+    # Plain SGD: apply the packed signs directly, without unpacking to float
+    fused = sign_sgd_fusable(instance.optimizer)
 
     logger.info(
         f"Catching up from window {checkpoint_window} to current window {target_window}"
     )
 
-    # Apply aggregation for each step, checking for current window changes
-    current_step = checkpoint_window
-    while current_step < target_window:
-        logger.info(
-            f"\nProcessing catchup for window {current_step} (Target: {target_window})"
-        )
+    downloads: dict[int, asyncio.Task] = {}
+    debug_dicts: dict[int, asyncio.Task] = {}
+    unpacked: dict[int, asyncio.Task] = {}
+    comparisons: list[asyncio.Task] = []
+
+    def schedule(step: int) -> None:
+        """Start the downloads for ``step`` and the windows after it."""
+        for window in range(step, min(step + lookahead, target_window)):
+            if window not in downloads:
+                downloads[window] = asyncio.create_task(
+                    instance.comms.load_aggregation(window=window)
+                )
+                debug_dicts[window] = asyncio.create_task(
+                    instance.comms.get_debug_dict(window)
+                )
 
-        # Load aggregation for current window
-        agg_data = await instance.comms.load_aggregation(window=current_step)
+    def prepare(agg_data: dict) -> dict | None:
+        if fused:
+            state_dict = agg_data.get("state_dict")
+            return None if state_dict is None else {"packed": state_dict}
+        return process_loaded_data(instance.model, agg_data)
 
-        # For the last window in catchup, we might need to retry a few times
-        if agg_data is None and current_step == target_window - 1:
-            max_retries = 7
-            retry_count = 0
-            retry_delay = 10
+    async def unpack(window: int):
+        agg_data = await downloads[window]
+        if not agg_data:
+            return agg_data, None
+        return agg_data, await asyncio.to_thread(prepare, agg_data)
 
+    # Apply aggregation for each step, checking for current window changes
+    catchup_start = time.time()
+    applied_windows = 0
+    current_step = checkpoint_window
+    try:
+        while current_step < target_window:
             logger.info(
-                f"No aggregation for latest window {current_step}, will retry up to {max_retries} times"
+                f"\nProcessing catchup for window {current_step} (Target: {target_window})"
             )
 
-            while retry_count < max_retries and agg_data is None:
-                retry_count += 1
-                logger.info(
-                    f"Retry {retry_count}/{max_retries} for window {current_step}"
+            # Load aggregation for current window, then start unpacking the next
+            schedule(current_step)
+            if current_step not in unpacked:
+                unpacked[current_step] = asyncio.create_task(unpack(current_step))
+            agg_data, processed_agg_data = await unpacked.pop(current_step)
+            downloads.pop(current_step, None)
+            debug_task = debug_dicts.pop(current_step, None)
+            if current_step + 1 < target_window:
+                schedule(current_step + 1)
+                unpacked[current_step + 1] = asyncio.create_task(
+                    unpack(current_step + 1)
                 )
-                await asyncio.sleep(retry_delay)
 
-                # Try to load aggregation again
-                agg_data = await instance.comms.load_aggregation(window=current_step)
+            # For the last window in catchup, we might need to retry a few times
+            if agg_data is None and current_step == target_window - 1:
+                max_retries = 7
+                retry_count = 0
+                retry_delay = 10
 
-                if agg_data is not None:
-                    logger.info(
-                        f"Successfully loaded aggregation on retry {retry_count}"
-                    )
-
-            if agg_data is None:
-                logger.warning(
-                    f"Failed to load aggregation after {max_retries} retries"
+                logger.info(
+                    f"No aggregation for latest window {current_step}, will retry up to {max_retries} times"
                 )
 
-        # Process the aggregation data if available
-        if agg_data:
-            update_start = time.time()
-
-            # Process the loaded data
-            processed_agg_data = process_loaded_data(instance.model, agg_data)
+                while retry_count < max_retries and agg_data is None:
+                    retry_count += 1
+                    logger.info(
+                        f"Retry {retry_count}/{max_retries} for window {current_step}"
+                    )
+                    await asyncio.sleep(retry_delay)
 
-            if processed_agg_data is not None:
-                # Get learning rate for this step
-                lr = instance.scheduler.get_last_lr()[0]
-                weight_decay = instance.hparams.weight_decay
+                    # Try to load aggregation again
+                    agg_data = await instance.comms.load_aggregation(
+                        window=current_step
+                    )
 
-                # Apply the gradients to the model parameters
-                if isinstance(
-                    instance.model, torch.nn.parallel.DistributedDataParallel
-                ):
-                    model_iterator = instance.model.module.named_parameters()
-                else:
-                    model_iterator = instance.model.named_parameters()
-                for name, param in model_iterator:
-                    if name in processed_agg_data["tensors"]:
-                        # Apply weight decay to the parameter manually if needed
-                        if weight_decay > 0:
-                            with torch.no_grad():
-                                param.data.mul_(1.0 - lr * weight_decay)
-
-                        # Move aggregation tensor to device
-                        agg_tensor = processed_agg_data["tensors"][name].to(
-                            instance.config.device  # type: ignore
+                    if agg_data is not None:
+                        logger.info(
+                            f"Successfully loaded aggregation on retry {retry_count}"
                         )
+                        processed_agg_data = prepare(agg_data)
 
-                        # Set the gradient instead of directly updating the parameter
-                        if param.grad is None:
-                            param.grad = agg_tensor
-                        else:
-                            param.grad.copy_(agg_tensor)
+                if agg_data is None:
+                    logger.warning(
+                        f"Failed to load aggregation after {max_retries} retries"
+                    )
 
-                        del agg_tensor
-                        torch.cuda.empty_cache()
+            # Process the aggregation data if available
+            if agg_data:
+                update_start = time.time()
 
-                logger.info(
-                    f"Window {current_step} - Set gradients in {time.time() - update_start:.2f}s"
-                )
+                if processed_agg_data is not None:
+                    # Get learning rate for this step
+                    lr = instance.scheduler.get_last_lr()[0]
+                    weight_decay = instance.hparams.weight_decay
 
-                # Let the optimizer handle the parameter updates
-                instance.optimizer.step()
-                instance.scheduler.step()
-                torch.cuda.empty_cache()
-
-                logger.info(
-                    f"Successfully applied aggregation for window {current_step}"
-                )
+                    # Apply the gradients to the model parameters
+                    if isinstance(
+                        instance.model, torch.nn.parallel.DistributedDataParallel
+                    ):
+                        model_iterator = instance.model.module.named_parameters()
+                    else:
+                        model_iterator = instance.model.named_parameters()
+                    for name, param in model_iterator:
+                        if fused:
+                            packed = processed_agg_data["packed"].get(name)
+                            if packed is not None:
+                                apply_packed_sign_update_(
+                                    param.data, packed, lr, weight_decay
+                                )
+                        elif name in processed_agg_data["tensors"]:
+                            # Apply weight decay to the parameter manually if needed
+                            if weight_decay > 0:
+                                with torch.no_grad():
+                                    param.data.mul_(1.0 - lr * weight_decay)
+
+                            # Move aggregation tensor to device
+                            agg_tensor = processed_agg_data["tensors"][name].to(
+                                instance.config.device  # type: ignore
+                            )
+
+                            # Set the gradient instead of directly updating the parameter
+                            if param.grad is None:
+                                param.grad = agg_tensor
+                            else:
+                                param.grad.copy_(agg_tensor)
+
+                            del agg_tensor
+                            torch.cuda.empty_cache()
 
-                # Get debug dict and compare with current model parameters
-                debug_dict_result = await instance.comms.get_debug_dict(current_step)
-                if (
-                    isinstance(debug_dict_result, dict)
-                    and "state_dict" in debug_dict_result
-                ):
-                    debug_state_dict = cast(
-                        dict[str, list[float]], debug_dict_result["state_dict"]
+                    logger.info(
+                        f"Window {current_step} - Set gradients in {time.time() - update_start:.2f}s"
                     )
 
-                    # Use our new function to compare model with debug dict
-                    comparison_metrics = await compare_model_with_debug_dict(
-                        model=instance.model,
-                        debug_dict=debug_state_dict,
-                        learning_rate=lr,
+                    # Let the optimizer handle the parameter updates
+                    if not fused:
+                        instance.optimizer.step()
+                    instance.scheduler.step()
+                    torch.cuda.empty_cache()
+                    applied_windows += 1
+
+                    logger.info(
+                        f"Successfully applied aggregation for window {current_step}"
                     )
 
-                    if comparison_metrics["success"]:
-                        # Log the comparison metrics
-                        logger.info(
-                            f"Window {current_step} - L2 norm difference between model and debug values: "
-                            f"{comparison_metrics['l2_norm']}"
-                        )
-                        logger.info(
-                            f"Window {current_step} - Average L2 norm per parameter: "
-                            f"{comparison_metrics['avg_l2_norm']}"
-                        )
-                        logger.info(
-                            f"Window {current_step} - Average absolute difference per parameter: "
-                            f"{comparison_metrics['avg_abs_diff']}"
-                        )
-                        logger.info(
-                            f"Window {current_step} - Average steps behind: "
-                            f"{comparison_metrics['avg_steps_behind']}"
-                        )
-                    else:
-                        logger.warning(
-                            f"Failed to compare model with debug dict for window {current_step}"
+                    # Compare with the debug dict in the background
+                    comparisons.append(
+                        asyncio.create_task(
+                            _compare_with_debug_dict(
+                                instance,
+                                current_step,
+                                debug_task,
+                                debug_param_slices(instance.model),
+                                lr,
+                            )
                         )
+                    )
+                    debug_task = None
                 else:
                     logger.warning(
-                        f"Invalid debug dict format for window {current_step}"
+                        f"Failed to process aggregation data for window {current_step}"
                     )
+                    # Still advance the optimizer and scheduler
+                    instance.optimizer.step()
+                    instance.scheduler.step()
+
+                del processed_agg_data
+                torch.cuda.empty_cache()
             else:
-                logger.warning(
-                    f"Failed to process aggregation data for window {current_step}"
-                )
-                # Still advance the optimizer and scheduler
-                instance.optimizer.step()
-                instance.scheduler.step()
+                logger.warning(f"No aggregation data found for window {current_step}")
+                # Don't advance the optimizer and scheduler
 
-            del processed_agg_data
-            torch.cuda.empty_cache()
-        else:
-            logger.warning(f"No aggregation data found for window {current_step}")
-            # Don't advance the optimizer and scheduler
+            if debug_task is not None:
+                debug_task.cancel()
 
-        # Update global step and move to next window
-        instance.global_step = current_step - instance.start_window
-        current_step += 1
+            # Update global step and move to next window
+            instance.global_step = current_step - instance.start_window
+            current_step += 1
 
-        # Check if current_window has changed during processing
-        if instance.current_window > target_window:
-            target_window = instance.current_window
-            logger.info(
-                f"Current window advanced during catchup, new target: {target_window}"
-            )
+            # Check if current_window has changed during processing
+            if instance.current_window > target_window:
+                target_window = instance.current_window
+                logger.info(
+                    f"Current window advanced during catchup, new target: {target_window}"
+                )
+    finally:
+        for task in [*downloads.values(), *debug_dicts.values(), *unpacked.values()]:
+            task.cancel()
+
+    await asyncio.gather(*comparisons, return_exceptions=True)
 
     # Update global step after catchup
     instance.global_step = target_window - instance.start_window
-    logger.info(f"Catchup complete. Global step updated to {instance.global_step}")
+    elapsed = time.time() - catchup_start
+    windows = current_step - checkpoint_window
+    logger.info(
+        f"Catchup complete. Global step updated to {instance.global_step}. "
+        f"Processed {windows} windows ({applied_windows} applied) in {elapsed:.1f}s "
+        f"({windows / elapsed if elapsed > 0 else 0.0:.2f} windows/s)"
+    )
 
 
 def process_loaded_data(model: torch.nn.Module, compressed_data: dict) -> dict | None:
@@ -436,17 +544,37 @@ def process_loaded_data(model: torch.nn.Module, compressed_data: dict) -> dict |
     return result
 
 
-async def compare_model_with_debug_dict(
-    model: nn.Module,
+def debug_param_slices(
+    model: nn.Module, index_range: tuple[int, int] = (0, 2)
+) -> dict[str, torch.Tensor]:
+    """
+    Copy the parameter slices that debug dicts record, keyed by debug key.
+
+    Taking this snapshot is cheap, so the comparison itself can run later
+    while the model keeps changing.
+    """
+    if isinstance(model, torch.nn.parallel.DistributedDataParallel):
+        model_iterator = model.module.named_parameters()
+    else:
+        model_iterator = model.named_parameters()
+    return {
+        name + "_debug": param.data.flatten()[index_range[0] : index_range[1]]
+        .detach()
+        .clone()
+        for name, param in model_iterator
+    }
+
+
+def compare_slices_with_debug_dict(
+    param_slices: dict[str, torch.Tensor],
     debug_dict: dict[str, list[float]],
     learning_rate: float,
-    index_range: tuple[int, int] = (0, 2),
 ) -> dict[str, bool | float | int]:
     """
-    Compares a model's parameters with a debug dictionary to measure synchronization.
+    Compares parameter slices (see ``debug_param_slices``) with a debug dictionary.
 
     Args:
-        model: The PyTorch model with parameters to compare
+        param_slices: Parameter values keyed by debug key
         debug_dict: Debug dictionary containing parameter debug values
         learning_rate: Current learning rate to normalize differences
 
@@ -460,22 +588,11 @@ async def compare_model_with_debug_dict(
     max_diff = 0.0
 
     # Compare each parameter with its debug entry
-    if isinstance(model, torch.nn.parallel.DistributedDataParallel):
-        model_iterator = model.module.named_parameters()
-    else:
-        model_iterator = model.named_parameters()
-    for name, param in model_iterator:
-        debug_key = name + "_debug"
-
+    for debug_key, param_data in param_slices.items():
         if debug_key in debug_dict and isinstance(debug_dict[debug_key], list):
-            # Get the parameter values (first two elements to match debug dict)
-            param_data = param.data.flatten()[
-                index_range[0] : index_range[1]
-            ].detach()  # Keep on device
-
             # Convert debug data to tensor on the same device
             debug_data = torch.tensor(
-                debug_dict[debug_key], device=param.device, dtype=param.dtype
+                debug_dict[debug_key], device=param_data.device, dtype=param_data.dtype
             )
 
             # Compute differences
@@ -515,45 +632,185 @@ async def compare_model_with_debug_dict(
     return metrics
 
 
-def unpack_binary_tensor(packed_tensor: torch.Tensor, original_shape: torch.Size):
+async def compare_model_with_debug_dict(
+    model: nn.Module,
+    debug_dict: dict[str, list[float]],
+    learning_rate: float,
+    index_range: tuple[int, int] = (0, 2),
+) -> dict[str, bool | float | int]:
+    """
+    Compares a model's parameters with a debug dictionary to measure synchronization.
+
+    Args:
+        model: The PyTorch model with parameters to compare
+        debug_dict: Debug dictionary containing parameter debug values
+        learning_rate: Current learning rate to normalize differences
+
+    Returns:
+        dict: Comparison metrics including L2 norm, absolute differences, and steps behind measurements
+    """
+    return compare_slices_with_debug_dict(
+        debug_param_slices(model, index_range), debug_dict, learning_rate
+    )
+
+
+BINARY_CHUNK_SIZE = 1 << 24  # elements per chunk when (un)packing on device
+
+
+def _unpack_bits(packed_chunk: torch.Tensor) -> torch.Tensor:
+    """Expand packed bytes to one {0,1} uint8 per bit; bit i of byte j -> 8*j + i."""
+    shifts = torch.arange(8, dtype=torch.uint8, device=packed_chunk.device)
+    return ((packed_chunk.unsqueeze(1) >> shifts) & 1).view(-1)
+
+
+def unpack_binary_tensor(
+    packed_tensor: torch.Tensor,
+    original_shape: torch.Size,
+    chunk_size: int = BINARY_CHUNK_SIZE,
+):
     """
     Unpack a 1-bit representation tensor back to ±1 values.
 
+    On CPU this is ``numpy.unpackbits``; elsewhere the bits are expanded
+    ``chunk_size`` elements at a time straight into the output, so the only
+    full-size allocation is the result itself.
+
     Args:
         packed_tensor: The packed binary tensor
         original_shape: The original shape of the tensor
+        chunk_size: Elements per chunk off CPU (rounded up to a multiple of 8)
 
     Returns:
         Unpacked tensor with original shape
     """
     device = packed_tensor.device
-    packed_flat = packed_tensor.to(device=device, dtype=torch.uint8).view(-1)
+    packed_flat = packed_tensor.to(device=device, dtype=torch.uint8).reshape(-1)
 
-    n_vals = int(torch.tensor(original_shape).prod().item())
+    n_vals = math.prod(original_shape)
     n_bytes = (n_vals + 7) // 8
+    if packed_flat.numel() < n_bytes:
+        raise ValueError(
+            f"Packed tensor holds {packed_flat.numel() * 8} bits "
+            f"but the shape {tuple(original_shape)} has {n_vals} elements"
+        )
     packed_flat = packed_flat[:n_bytes]  # drop any padding
 
-    bits = torch.stack(
-        [(packed_flat >> i) & 1 for i in range(8)],
-        dim=1,
-    ).reshape(-1)[:n_vals]
+    if device.type == "cpu":
+        bits = torch.from_numpy(
+            np.unpackbits(packed_flat.numpy(), count=n_vals, bitorder="little")
+        )
+        # {0,1} → {-1,+1}
+        return bits.to(torch.float32).mul_(2).sub_(1).reshape(original_shape)
 
-    # {0,1} → {-1,+1}
-    bits = bits.to(torch.float32).mul_(2).sub_(1)
+    out = torch.empty(n_vals, dtype=torch.float32, device=device)
+    chunk_bytes = max(1, (chunk_size + 7) // 8)
+    for start_byte in range(0, n_bytes, chunk_bytes):
+        start = start_byte * 8
+        end = min(start + chunk_bytes * 8, n_vals)
+        bits = _unpack_bits(packed_flat[start_byte : start_byte + chunk_bytes])
+        # {0,1} → {-1,+1}
+        out[start:end].copy_(bits[: end - start]).mul_(2).sub_(1)
+    return out.reshape(original_shape)
 
-    return bits.reshape(original_shape)
 
+def sign_sgd_fusable(optimizer: torch.optim.Optimizer) -> bool:
+    """
+    True if a ±1 gradient step of ``optimizer`` is exactly ``p -= lr * sign``.
 
-# Function to pack signed weights into 1-bit representation
-def pack_binary_tensor(tensor: torch.Tensor, device: DeviceLikeType):
-    """Pack a tensor of +1/-1 values into a compact binary representation."""
-    tensor = (tensor > 0).to(torch.uint8)  # Convert +1 to 1, -1 to 0
-    tensor = tensor.view(-1)  # Flatten
-    packed_tensor = torch.zeros(
-        (tensor.shape[0] + 7) // 8, dtype=torch.uint8, device=device
+    That holds for plain SGD (no momentum, weight decay, dampening or
+    maximize), which is what the neurons use; anything else has to go
+    through ``optimizer.step()``.
+    """
+    if type(optimizer) is not torch.optim.SGD:
+        return False
+    return all(
+        not group.get("momentum", 0)
+        and not group.get("weight_decay", 0)
+        and not group.get("maximize", False)
+        for group in optimizer.param_groups
     )
 
-    for i in range(8):
-        packed_tensor |= tensor[i::8] << i  # Pack 8 values per byte
 
-    return packed_tensor
+@torch.no_grad()
+def apply_packed_sign_update_(
+    param: torch.Tensor,
+    packed_tensor: torch.Tensor,
+    lr: float,
+    weight_decay: float = 0.0,
+    chunk_size: int = BINARY_CHUNK_SIZE,
+) -> None:
+    """
+    Apply a 1-bit packed sign gradient to ``param`` in place.
+
+    Equivalent to decoupled weight decay ``p *= 1 - lr * weight_decay``
+    followed by an SGD step on ``unpack_binary_tensor(packed_tensor)``, but
+    works through ``chunk_size`` elements at a time, so no full-size float
+    sign tensor is ever materialised.
+
+    Args:
+        param: Parameter (or its ``.data``) to update
+        packed_tensor: Packed bits, in the ``pack_binary_tensor`` layout
+        lr: Learning rate
+        weight_decay: Decoupled weight decay factor
+        chunk_size: Parameter elements per chunk (rounded up to a multiple of 8)
+    """
+    flat = param.view(-1)
+    n_vals = flat.numel()
+    packed_flat = packed_tensor.reshape(-1)
+    if packed_flat.numel() < (n_vals + 7) // 8:
+        raise ValueError(
+            f"Packed tensor holds {packed_flat.numel() * 8} bits "
+            f"but the parameter has {n_vals} elements"
+        )
+
+    step = torch.tensor([lr, -lr], dtype=flat.dtype, device=flat.device)
+    chunk_bytes = max(1, (chunk_size + 7) // 8)
+    for start_byte in range(0, (n_vals + 7) // 8, chunk_bytes):
+        start = start_byte * 8
+        end = min(start + chunk_bytes * 8, n_vals)
+        packed_chunk = packed_flat[start_byte : start_byte + chunk_bytes].to(
+            device=flat.device, dtype=torch.uint8, non_blocking=True
+        )
+        # Set bits are +1 gradients, i.e. a step of -lr
+        bits = _unpack_bits(packed_chunk)[: end - start]
+        target = flat[start:end]
+        if weight_decay > 0:
+            target.mul_(1.0 - lr * weight_decay)
+        target.add_(step[bits.long()])
+
+
+# Function to pack signed weights into 1-bit representation
+def pack_binary_tensor(
+    tensor: torch.Tensor,
+    device: DeviceLikeType,
+    chunk_size: int = BINARY_CHUNK_SIZE,
+):
+    """
+    Pack a tensor of +1/-1 values into a compact binary representation.
+
+    Element ``8*j + i`` becomes bit ``i`` of byte ``j``; a trailing partial
+    byte is zero-padded. Packing runs where ``tensor`` lives (``numpy.packbits``
+    on CPU, ``chunk_size`` elements at a time elsewhere) and the result is
+    moved to ``device``.
+    """
+    flat = tensor.reshape(-1)
+    n_vals = flat.numel()
+
+    if flat.device.type == "cpu":
+        packed = torch.from_numpy(
+            np.packbits((flat > 0).numpy(), bitorder="little")  # +1 to 1, -1 to 0
+        )
+        return packed.to(device)
+
+    packed = torch.empty((n_vals + 7) // 8, dtype=torch.uint8, device=flat.device)
+    weights = 1 << torch.arange(8, dtype=torch.uint8, device=flat.device)
+    chunk = max(8, (chunk_size + 7) // 8 * 8)
+    for start in range(0, n_vals, chunk):
+        bits = (flat[start : start + chunk] > 0).to(torch.uint8)
+        if bits.numel() % 8:
+            bits = torch.nn.functional.pad(bits, (0, 8 - bits.numel() % 8))
+        # Distinct powers of two, so the sum never overflows a byte
+        packed[start // 8 : start // 8 + bits.numel() // 8] = (
+            bits.view(-1, 8) * weights
+        ).sum(dim=1, dtype=torch.uint8)
+    return packed.to(device)
@@ -0,0 +1,203 @@
+# The MIT License (MIT)
+# © 2025 tplr.ai
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the "Software"), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+# Global imports
+import asyncio
+import hashlib
+import os
+import shutil
+from collections import OrderedDict
+from datetime import datetime
+from types import SimpleNamespace
+
+# Local imports
+from .logging import logger
+from .schemas import Bucket
+
+
+class ObjectCache:
+    """
+    Raw bytes of downloaded objects, keyed by ``(bucket, key, ETag)``.
+
+    Entries live in a memory tier bounded by ``max_memory_bytes``; the least
+    recently used ones are demoted to an optional disk tier under ``disk_dir``
+    (bounded by ``max_disk_bytes``) and dropped from there in turn. Only the
+    latest ETag seen for each ``(bucket, key)`` is kept, so a re-uploaded
+    object replaces its old copy. Callers revalidate with ``If-None-Match``
+    and serve the cached bytes on a 304. Stored buffers are kept as read-only
+    views rather than copied. Disk reads and writes run in a worker thread so
+    they never block the event loop.
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int,
+        disk_dir: str | None = None,
+        max_disk_bytes: int = 0,
+    ):
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes if disk_dir else 0
+        self.disk_dir = disk_dir
+        if self.max_disk_bytes:
+            # The index is per process, so files left by a previous run are stale
+            shutil.rmtree(disk_dir, ignore_errors=True)
+            os.makedirs(disk_dir, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        # (bucket, key) -> (etag, last_modified, data or size), least recent first
+        self._memory: OrderedDict[tuple[str, str], tuple[str, datetime, memoryview]] = (
+            OrderedDict()
+        )
+        self._disk: OrderedDict[tuple[str, str], tuple[str, datetime, int]] = (
+            OrderedDict()
+        )
+
+    @staticmethod
+    def _name(bucket: Bucket) -> str:
+        # Bucket names are only unique within an R2 account
+        return f"{bucket.account_id}/{bucket.name}"
+
+    def _path(self, name: str, key: str, etag: str) -> str:
+        digest = hashlib.sha256(f"{name}\0{key}\0{etag}".encode()).hexdigest()
+        return os.path.join(self.disk_dir, digest)
+
+    async def lookup(self, bucket: Bucket, key: str) -> SimpleNamespace | None:
+        """Latest cached copy of ``key`` as ``etag``/``last_modified``/``data``."""
+        entry_key = (self._name(bucket), key)
+        if entry_key in self._memory:
+            self._memory.move_to_end(entry_key)
+            etag, last_modified, data = self._memory[entry_key]
+            return SimpleNamespace(etag=etag, last_modified=last_modified, data=data)
+
+        if entry_key in self._disk:
+            etag, last_modified, size = self._disk.pop(entry_key)
+            self.disk_bytes -= size
+            data = await asyncio.to_thread(self._take, self._path(*entry_key, etag))
+            if data is None:
+                return None
+            # Promote back to memory, which may demote something else, unless a
+            # newer copy was stored while the file was being read
+            if entry_key not in self._memory:
+                await self.put(bucket, key, etag, last_modified, data)
+            return SimpleNamespace(etag=etag, last_modified=last_modified, data=data)
+        return None
+
+    async def put(
+        self,
+        bucket: Bucket,
+        key: str,
+        etag: str,
+        last_modified: datetime,
+        data: bytes | bytearray | memoryview,
+    ) -> None:
+        """
+        Store ``data`` as the latest copy of ``key``, replacing older ETags.
+
+        The buffer is kept without copying, so the caller must not modify it
+        afterwards.
+        """
+        await self.discard(bucket, key)
+        if len(data) > self.max_memory_bytes:
+            return
+        entry_key = (self._name(bucket), key)
+        self._memory[entry_key] = (etag, last_modified, memoryview(data).toreadonly())
+        self.memory_bytes += len(data)
+        while self.memory_bytes > self.max_memory_bytes:
+            await self._demote(*self._memory.popitem(last=False))
+
+    async def discard(self, bucket: Bucket, key: str) -> None:
+        """Forget every cached copy of ``key``."""
+        entry_key = (self._name(bucket), key)
+        entry = self._memory.pop(entry_key, None)
+        if entry is not None:
+            self.memory_bytes -= len(entry[2])
+        entry = self._disk.pop(entry_key, None)
+        if entry is not None:
+            self.disk_bytes -= entry[2]
+            await asyncio.to_thread(self._remove, self._path(*entry_key, entry[0]))
+
+    async def _demote(self, entry_key: tuple[str, str], entry) -> None:
+        # Bookkeeping stays on the event loop; only the file I/O is offloaded
+        etag, last_modified, data = entry
+        self.memory_bytes -= len(data)
+        if len(data) > self.max_disk_bytes:
+            return
+        path = self._path(*entry_key, etag)
+        if not await asyncio.to_thread(self._write, path, data):
+            return
+        current = self._disk.get(entry_key)
+        if entry_key in self._memory or current is not None:
+            # A newer copy arrived while the file was being written
+            if current is None or current[0] != etag:
+                await asyncio.to_thread(self._remove, path)
+            return
+        self._disk[entry_key] = (etag, last_modified, len(data))
+        self.disk_bytes += len(data)
+        stale = []
+        while self.disk_bytes > self.max_disk_bytes:
+            old_key, (old_etag, _, size) = self._disk.popitem(last=False)
+            self.disk_bytes -= size
+            stale.append(self._path(*old_key, old_etag))
+        if stale:
+            await asyncio.to_thread(self._remove, *stale)
+
+    @staticmethod
+    def _write(path: str, data: memoryview) -> bool:
+        try:
+            with open(path, "wb") as f:
+                f.write(data)
+        except OSError as e:
+            logger.debug(f"Could not spill {path} to the object cache: {e}")
+            return False
+        return True
+
+    @staticmethod
+    def _take(path: str) -> bytes | None:
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError as e:
+            logger.debug(f"Object cache file {path} unreadable: {e}")
+            return None
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+    @staticmethod
+    def _remove(*paths: str) -> None:
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def record(self, hit: bool) -> None:
+        """Count one read served from the cache (``hit``) or downloaded."""
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def stats(self) -> dict:
+        """Hit/miss counts and bytes held per tier."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory_bytes": self.memory_bytes,
+            "disk_bytes": self.disk_bytes,
+        }
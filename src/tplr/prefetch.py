@@ -0,0 +1,252 @@
+# The MIT License (MIT)
+# © 2025 tplr.ai
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the "Software"), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+# Global imports
+import asyncio
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable
+
+# Local imports
+from . import __version__
+from .logging import logger
+from .wire import payload_nbytes
+
+
+def upload_status(
+    last_modified: datetime, time_min: datetime = None, time_max: datetime = None
+) -> str | None:
+    """``"TOO_EARLY"``/``"TOO_LATE"`` if an upload time is outside the bounds."""
+    if time_min is not None and not time_min.tzinfo:
+        time_min = time_min.replace(tzinfo=timezone.utc)
+    if time_max is not None and not time_max.tzinfo:
+        time_max = time_max.replace(tzinfo=timezone.utc)
+    if time_min is not None and last_modified < time_min:
+        return "TOO_EARLY"
+    if time_max is not None and last_modified > time_max:
+        return "TOO_LATE"
+    return None
+
+
+class GradientPrefetcher:
+    """
+    Downloads peers' objects for a window as soon as they land in their buckets.
+
+    ``start`` launches a background task that lists the peers' buckets into
+    the comms activity index every ``poll_interval`` seconds and downloads each
+    newly listed key, until all of them are fetched or the window after the
+    target one has closed. Downloads are decoded on the CPU, so they hold no
+    accelerator memory while waiting, and land in an in-memory cache bounded by
+    ``max_bytes`` (oldest entries are evicted first), together with their
+    Last-Modified time so the caller can still apply its ``time_min``/
+    ``time_max`` rules. ``take`` hands an entry out once, waiting for it if
+    its download is still in flight.
+    """
+
+    def __init__(
+        self,
+        comms,
+        max_bytes: int,
+        poll_interval: float = 2.0,
+        max_concurrent: int = 8,
+    ):
+        self.comms = comms
+        self.max_bytes = max_bytes
+        self.poll_interval = poll_interval
+        self.max_concurrent = max_concurrent
+
+        self.window: int | None = None
+        self.hits = 0
+        self.nbytes = 0
+        # (window, uid, key) -> (LastModified, payload, nbytes)
+        self._cache: OrderedDict[tuple[int, int, str], tuple[datetime, Any, int]] = (
+            OrderedDict()
+        )
+        self._inflight: dict[tuple[int, int, str], asyncio.Task] = {}
+        self._task: asyncio.Task | None = None
+
+    def start(self, window: int, uids: list[int], key: str = "gradient") -> None:
+        """Prefetch ``key`` objects of ``uids`` for ``window``, replacing any previous run."""
+        self.stop()
+        self.window = window
+        for cache_key in [k for k in self._cache if k[0] != window]:
+            self._drop(cache_key)
+        self._task = asyncio.create_task(
+            self._run(window, [int(uid) for uid in uids], key)
+        )
+
+    def stop(self) -> None:
+        """Stop polling and cancel outstanding downloads; cached entries are kept."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for task in self._inflight.values():
+            task.cancel()
+        self._inflight.clear()
+
+    async def _run(self, window: int, uids: list[int], key: str) -> None:
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        pending = set(uids)
+        try:
+            while pending:
+                buckets = {uid: self.comms.commitments.get(uid) for uid in pending}
+                listed = {}
+                for bucket in buckets.values():
+                    if bucket is not None:
+                        listed[self.comms.activity_index.bucket_key(bucket)] = bucket
+                await asyncio.gather(
+                    *(self.comms._refresh_activity(b) for b in listed.values())
+                )
+
+                for uid in self.comms.activity_index.ready_uids(buckets, window):
+                    pending.discard(uid)
+                    cache_key = (window, uid, key)
+                    self._inflight[cache_key] = asyncio.create_task(
+                        self._fetch(cache_key, buckets[uid], semaphore)
+                    )
+
+                if not pending or self.comms.current_window > window + 1:
+                    break
+                await asyncio.sleep(self.poll_interval)
+
+            await asyncio.gather(*self._inflight.values(), return_exceptions=True)
+            logger.info(
+                f"Prefetched {sum(k[0] == window for k in self._cache)}/{len(uids)} "
+                f"{key} objects for window {window}"
+            )
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.warning(f"Prefetch for window {window} stopped: {e}")
+
+    async def _fetch(self, cache_key, bucket, semaphore):
+        window, uid, key = cache_key
+        filename = f"{key}-{window}-{uid}-v{__version__}.pt"
+        try:
+            async with semaphore:
+                meta = {}
+                data = await self.comms.s3_get_object(
+                    key=filename, bucket=bucket, meta=meta, map_location="cpu"
+                )
+            last_modified = meta.get("LastModified")
+            if data is None or last_modified is None:
+                return None
+            if isinstance(data, dict) and "__status" in data:
+                return None
+
+            entry = (last_modified, data, payload_nbytes(data))
+            if entry[2] <= self.max_bytes:
+                while self._cache and self.nbytes + entry[2] > self.max_bytes:
+                    self._drop(next(iter(self._cache)))
+                self._cache[cache_key] = entry
+                self.nbytes += entry[2]
+            return entry
+        finally:
+            self._inflight.pop(cache_key, None)
+
+    def _drop(self, cache_key) -> None:
+        entry = self._cache.pop(cache_key, None)
+        if entry is not None:
+            self.nbytes -= entry[2]
+
+    async def take(
+        self, uid: int, window: int, key: str
+    ) -> tuple[datetime, Any] | None:
+        """Return and forget the prefetched ``(LastModified, payload)``, if any."""
+        cache_key = (int(window), int(uid), key)
+        task = self._inflight.get(cache_key)
+        if cache_key not in self._cache and task is not None:
+            try:
+                # Shielded so a cancelled gather does not cancel the download
+                await asyncio.shield(task)
+            except Exception:
+                pass
+
+        entry = self._cache.get(cache_key)
+        if entry is None:
+            return None
+        self._drop(cache_key)
+        self.hits += 1
+        return entry[0], entry[1]
+
+
+class WindowPrefetcher:
+    """
+    Builds a window's data in the background before that window starts.
+
+    ``start(window)`` launches ``build(window)`` as a task; ``get(window)``
+    returns its result, awaiting it if it is still running. A prefetch for a
+    different window (the chain moved on while it was running) is cancelled
+    and ``window`` is built inline. ``get`` counts whether the data was ready
+    (hit), still being built (late) or not prefetched at all (miss).
+    """
+
+    def __init__(self, build: Callable[[int], Awaitable[Any]]):
+        self.build = build
+        self.window: int | None = None
+        self.hits = 0
+        self.late = 0
+        self.misses = 0
+        self._task: asyncio.Task | None = None
+
+    def start(self, window: int) -> None:
+        """Build ``window`` in the background, replacing any other prefetch."""
+        if self._task is not None and self.window == window:
+            return
+        self.cancel()
+        self.window = window
+        self._task = asyncio.create_task(self.build(window))
+
+    def cancel(self) -> None:
+        """Cancel the outstanding prefetch, if any."""
+        if self._task is not None:
+            if not self._task.done():
+                logger.info(f"Cancelling data prefetch for window {self.window}")
+                self._task.cancel()
+            # Retrieve the outcome so a failed build is not reported as unhandled
+            self._task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._task = None
+        self.window = None
+
+    async def get(self, window: int) -> Any:
+        """The data for ``window``, prefetched if possible."""
+        task = self._task if self.window == window else None
+        if task is None:
+            self.cancel()
+            self.misses += 1
+            return await self.build(window)
+
+        self._task = None
+        self.window = None
+        ready = task.done()
+        try:
+            result = await task
+        except Exception as e:
+            logger.warning(f"Data prefetch for window {window} failed: {e}")
+            self.misses += 1
+            return await self.build(window)
+
+        if ready:
+            self.hits += 1
+        else:
+            self.late += 1
+        return result
+
+    def hit_rate(self) -> float:
+        """Fraction of windows whose data was ready before the window started."""
+        total = self.hits + self.late + self.misses
+        return self.hits / total if total else 0.0
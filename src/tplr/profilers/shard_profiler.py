@@ -49,6 +49,9 @@ class ShardProfiler:
                 "row_groups": None,
                 "rows_per_group": None,
                 "metadata": pf_data.get("metadata", {}) if pf_data else {},
+                "pages_read": 0,
+                "bytes_read": 0,
+                "rows_read": 0,
             }
 
         return timer_id
@@ -138,6 +141,28 @@ class ShardProfiler:
             if perf_data["row_groups"] is None:
                 perf_data["row_groups"] = num_row_groups
 
+    def record_bytes(self, shard_path: str, bytes_read: int, rows: int):
+        """
+        Record the bytes a page read pulled from a shard.
+
+        Args:
+            shard_path: Path to the shard file
+            bytes_read: Bytes read from the file for this page
+            rows: Rows the page returned
+        """
+        perf_data = self.shard_performance.get(shard_path)
+        if not perf_data:
+            return
+        perf_data["pages_read"] += 1
+        perf_data["bytes_read"] += bytes_read
+        perf_data["rows_read"] += rows
+
+    @staticmethod
+    def bytes_per_page(stats: Dict) -> float:
+        """Average bytes read per page for one shard's statistics"""
+        pages = stats.get("pages_read", 0)
+        return stats.get("bytes_read", 0) / pages if pages else 0.0
+
     def log_read_complete(self, shard_path: str, elapsed: float):
         """Log completion of a read operation"""
         perf_data = self.shard_performance.get(shard_path)
@@ -148,7 +173,8 @@ class ShardProfiler:
         logger.info(
             f"Row group read completed from {shard_path} in {elapsed:.4f}s "
             f"(avg: {avg_time:.4f}s, min: {perf_data['min_time']:.4f}s, "
-            f"max: {perf_data['max_time']:.4f}s, reads: {perf_data['reads']})"
+            f"max: {perf_data['max_time']:.4f}s, reads: {perf_data['reads']}, "
+            f"avg bytes/page: {self.bytes_per_page(perf_data):.0f})"
         )
 
     def get_stats(self) -> Dict:
@@ -178,6 +204,8 @@ class ShardProfiler:
                     "num_rows": stats["num_rows"],
                     "file_size": stats["file_size"],
                     "total_time": stats["total_time"],
+                    "pages_read": stats.get("pages_read", 0),
+                    "bytes_read": stats.get("bytes_read", 0),
                 }
             )
 
@@ -203,6 +231,12 @@ class ShardProfiler:
             logger.info(f"Overall average read time: {global_avg:.4f}s")
             logger.info(f"Total cumulative read time: {global_total_time:.2f}s")
             logger.info(f"Total number of reads: {global_total_reads}")
+            global_pages = sum(s["pages_read"] for s in shard_stats)
+            if global_pages:
+                global_bytes = sum(s["bytes_read"] for s in shard_stats)
+                logger.info(
+                    f"Average bytes read per page: {global_bytes / global_pages:.0f}"
+                )
 
             outliers = [s for s in shard_stats if s["avg_time"] > global_avg * 2]
             if outliers:
@@ -246,6 +280,10 @@ class ShardProfiler:
                 "rows_per_group": stats.get("rows_per_group"),
                 "metadata": stats.get("metadata", {}),
                 "recent_timings": stats["timings"][-10:],  # Last 10 timings
+                "pages_read": stats.get("pages_read", 0),
+                "bytes_read": stats.get("bytes_read", 0),
+                "rows_read": stats.get("rows_read", 0),
+                "bytes_per_page": self.bytes_per_page(stats),
             }
 
             export_data["summary"]["total_reads"] += stats["reads"]
@@ -297,6 +335,9 @@ class DummyShardProfiler:
     def log_parquet_metadata(self, *args, **kwargs) -> None:
         pass
 
+    def record_bytes(self, *args, **kwargs) -> None:
+        pass
+
     def log_read_complete(self, *args, **kwargs) -> None:
         pass
 
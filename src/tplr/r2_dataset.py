@@ -27,6 +27,7 @@ import numpy as np
 import pyarrow
 import pyarrow.parquet as pq
 import s3fs
+import torch
 import yaml
 
 from tplr import logger
@@ -34,9 +35,33 @@ from tplr.config import BUCKET_SECRETS
 from tplr.dataset import DatasetLoader
 from tplr.profilers import get_shard_profiler, get_timer_profiler
 from tplr.shard_index import ShardIndex
+from tplr.token_cache import TokenCache, tokenizer_fingerprint
+from tplr.tokenize_pool import TokenizePool, tokenize_texts
 
 _timer_profiler = get_timer_profiler("R2DatasetLoader")
 
+
+class _CountingReader:
+    """File wrapper counting the bytes parquet reads pull through it"""
+
+    def __init__(self, f):
+        self._f = f
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = self._f.read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def readinto(self, buffer):
+        n = self._f.readinto(buffer)
+        self.bytes_read += n or 0
+        return n
+
+    def __getattr__(self, name):
+        return getattr(self._f, name)
+
+
 pyarrow.set_io_thread_count(os.cpu_count())
 
 
@@ -87,22 +112,25 @@ class R2DatasetLoader(DatasetLoader):
     _fs = None  # Single filesystem instance
 
     # Static configuration
-    PREFETCH_SIZE = 3  # Number of pages to prefetch
     MAX_CONCURRENT_REQUESTS = 32  # Number of concurrent requests to R2
     BATCH_SIZE = 128  # Increased batch size for tokenization
     READ_BUFFER_SIZE = 32 * 1024 * 1024  # 32MB read buffer
+    PAGE_READ_BUFFER_SIZE = 4 * 1024 * 1024  # 4MB reads for page-sized row slices
+    TOKEN_CACHE_MEMORY_BYTES = 512 * 1024 * 1024  # 512MB of tokenized pages
+    TOKEN_CACHE_DISK_BYTES = 8 * 1024**3  # 8GB under .cache/tplr/tokens
+    TOKENIZE_PROCESSES = 0  # >0 tokenizes in a process pool of this size
 
     # Class-level caches with size limits
     _metadata_cache = {}
     _parquet_cache = {}  # Cache for ParquetFile objects
-    _token_cache = {}  # Cache for tokenized results
+    _token_cache = None  # TokenCache for tokenized pages, created on first use
     _fs = None
-    _prefetch_queue = None
 
     _round_robin_index = 0  # global counter for dataset round-robin selection
     _fs_cache = {}  # maps account_id to a cached s3fs.S3FileSystem
     _fs_lock = threading.Lock()  # lock for fs cache and round robin
     _executor = None  # ThreadPoolExecutor for CPU-bound tasks
+    _tokenize_pools = {}  # tokenizer fingerprint -> TokenizePool
 
     def __init__(
         self,
@@ -130,15 +158,18 @@ class R2DatasetLoader(DatasetLoader):
             pack_samples=pack_samples,
         )
 
-        # Additional buffers from parent class
-        self.used_buffer = []
-        self.padded_buffer = []
-
-        # Prefetch setup
-        self._prefetch_task = None
-        self._current_batch = None
-        self._next_batch = None
-        self._prefetch_queue = asyncio.Queue(maxsize=self.PREFETCH_SIZE)
+        # Token stream as one int64 array. Tokens before ``_buffer_pos`` have
+        # been consumed (the parent's ``used_buffer``), so rewinding for a new
+        # pass only resets the cursor.
+        self.buffer = np.empty(0, dtype=np.int64)
+        self._buffer_pos = 0
+        self._eos_positions = np.empty(0, dtype=np.int64)
+        # Padded tokens live in ``padded_buffer[_padded_start:_padded_end]``.
+        # Space before ``_padded_start`` is never rewritten (a full array is
+        # replaced instead), so batches handed out can be views into it.
+        self.padded_buffer = np.empty(0, dtype=np.int64)
+        self._padded_start = 0
+        self._padded_end = 0
 
     @classmethod
     def get_executor(cls):
@@ -150,6 +181,29 @@ class R2DatasetLoader(DatasetLoader):
             )
         return cls._executor
 
+    @classmethod
+    def get_tokenize_pool(cls, tokenizer) -> TokenizePool | None:
+        """Get or create the tokenizer's process pool, if one is configured"""
+        if cls.TOKENIZE_PROCESSES <= 0:
+            return None
+        fingerprint = tokenizer_fingerprint(tokenizer)
+        if fingerprint not in cls._tokenize_pools:
+            cls._tokenize_pools[fingerprint] = TokenizePool(
+                tokenizer, max_workers=cls.TOKENIZE_PROCESSES
+            )
+        return cls._tokenize_pools[fingerprint]
+
+    @classmethod
+    def get_token_cache(cls) -> TokenCache:
+        """Get or create the shared tokenized-page cache"""
+        if cls._token_cache is None:
+            cls._token_cache = TokenCache(
+                max_memory_bytes=cls.TOKEN_CACHE_MEMORY_BYTES,
+                directory=str(cls._local_cache_dir / "tokens"),
+                max_disk_bytes=cls.TOKEN_CACHE_DISK_BYTES,
+            )
+        return cls._token_cache
+
     def _get_pad_size(self, input_ids):
         """
         Calculate padding size needed for a sequence.
@@ -168,35 +222,63 @@ class R2DatasetLoader(DatasetLoader):
         pad_size = self.sequence_length - remainder
         return pad_size % self.sequence_length
 
+    def _set_tokens(self, tokens: np.ndarray):
+        """Replace the token stream and index its EOS positions once."""
+        self.buffer = np.asarray(tokens, dtype=np.int64)
+        self._buffer_pos = 0
+        self._eos_positions = np.flatnonzero(self.buffer == self.tokenizer.eos_token_id)
+
+    def _push_padded(self, tokens: np.ndarray, pad_size: int):
+        """Append tokens plus ``pad_size`` EOS tokens to the padded buffer."""
+        size = len(tokens) + pad_size
+        if self._padded_end + size > len(self.padded_buffer):
+            live = self.padded_buffer[self._padded_start : self._padded_end]
+            capacity = max(
+                2 * (len(live) + size), 4 * self.sequence_length * self.batch_size
+            )
+            grown = np.empty(capacity, dtype=np.int64)
+            grown[: len(live)] = live
+            self.padded_buffer = grown
+            self._padded_start, self._padded_end = 0, len(live)
+        end = self._padded_end + len(tokens)
+        self.padded_buffer[self._padded_end : end] = tokens
+        self.padded_buffer[end : end + pad_size] = self.tokenizer.eos_token_id
+        self._padded_end = end + pad_size
+
     def _refill_padded_buffer(self):
         """Match DatasetLoader's buffer refill logic exactly"""
+        target = self.sequence_length * self.batch_size
+        eos_positions = self._eos_positions
         while (
-            self.buffer
-            and len(self.padded_buffer) < self.sequence_length * self.batch_size
+            self._buffer_pos < len(self.buffer)
+            and self._padded_end - self._padded_start < target
         ):
-            try:
-                # Find next EOS token
-                eos_index = self.buffer.index(self.tokenizer.eos_token_id)
-
-                # Get sequence up to and including EOS
-                input_ids = self.buffer[: eos_index + 1]
-                self.buffer = self.buffer[eos_index + 1 :]
-
-                # Track used tokens
-                self.used_buffer.extend(input_ids)
-
-                # Add to padded buffer without the EOS token
-                self.padded_buffer.extend(input_ids[:-1])
-
-                # Add padding using EOS tokens (not pad tokens)
-                pad_size = self._get_pad_size(input_ids[:-1])
-                self.padded_buffer.extend([self.tokenizer.eos_token_id] * pad_size)
-
-            except ValueError:  # No EOS token found
-                if self.buffer:  # Add remaining tokens if any
-                    self.padded_buffer.extend(self.buffer)
-                    self.used_buffer.extend(self.buffer)
-                    self.buffer = []
+            pos = self._buffer_pos
+            if self.pack_samples:
+                # Each sample is followed by exactly one EOS, so the padded
+                # stream is the token stream itself: copy every sample up to
+                # the first one that reaches the target in one go
+                needed = target - (self._padded_end - self._padded_start)
+                i = np.searchsorted(eos_positions, pos + needed - 1)
+                end = int(eos_positions[i]) + 1 if i < len(eos_positions) else None
+                end = len(self.buffer) if end is None else end
+                self._push_padded(self.buffer[pos:end], 0)
+                self._buffer_pos = end
+                continue
+
+            # Find next EOS token
+            i = np.searchsorted(eos_positions, pos)
+            if i < len(eos_positions):
+                eos_index = int(eos_positions[i])
+                input_ids = self.buffer[pos:eos_index]
+                self._buffer_pos = eos_index + 1
+
+                # Add to padded buffer without the EOS token, padding with
+                # EOS tokens (not pad tokens)
+                self._push_padded(input_ids, self._get_pad_size(input_ids))
+            else:  # No EOS token found: add remaining tokens
+                self._push_padded(self.buffer[pos:], 0)
+                self._buffer_pos = len(self.buffer)
 
     @staticmethod
     async def fetch_dataset_configs() -> dict:
@@ -273,7 +355,6 @@ class R2DatasetLoader(DatasetLoader):
             pack_samples=pack_samples,
         )
 
-        loader.buffer = []
         loader.pages = pages_info.copy()
 
         await loader._load_r2_metadata()
@@ -283,12 +364,16 @@ class R2DatasetLoader(DatasetLoader):
         tasks = [loader._process_page(page, sem) for page in loader.pages]
         tasks_results = await asyncio.gather(*tasks, return_exceptions=True)
 
+        pages_tokens = []
         for result in tasks_results:
-            if isinstance(result, list):
-                loader.buffer.extend(result)
+            if isinstance(result, (list, np.ndarray)):
+                pages_tokens.append(np.asarray(result, dtype=np.int64))
             elif isinstance(result, Exception):
                 logger.error(f"Page processing error: {result}")
 
+        loader._set_tokens(
+            np.concatenate(pages_tokens) if pages_tokens else np.empty(0, np.int64)
+        )
         return loader
 
     @staticmethod
@@ -409,35 +494,25 @@ class R2DatasetLoader(DatasetLoader):
                 R2DatasetLoader._fs_cache[fs_cache_key] = fs
             return R2DatasetLoader._fs_cache[fs_cache_key]
 
-    async def _get_next_page(self):
-        """Get next page from the queue"""
-        if not self.pages:
-            return None
-        return self.pages.pop(0)
-
-    async def _prefetch_pages(self):
-        """Background task to prefetch pages"""
-        try:
-            while True:
-                page = await self._get_next_page()
-                if page is None:
-                    break
-                await self._prefetch_queue.put(page)  # type: ignore
-        except Exception as e:
-            logger.error(f"Prefetch error: {e}")
-        finally:
-            await self._prefetch_queue.put(None)  # type: ignore # Signal completion
-
     @_timer_profiler.profile("_process_page")
     async def _process_page(self, page, sem):
         """Process page with deterministic shard selection"""
         async with sem:
             config_name, page_number, split = page
-            cache_key = f"{config_name}:{page_number}"
+            # Tokens depend on the tokenizer and on truncation to sequence_length
+            token_cache = self.get_token_cache()
+            cache_key = TokenCache.make_key(
+                config_name,
+                page_number,
+                tokenizer_fingerprint(self.tokenizer),
+                self.sequence_length,
+            )
 
             try:
-                if cache_key in self._token_cache:
-                    return self._token_cache[cache_key]
+                # The lookup mmaps and touches a file, so keep it off the loop
+                cached = await asyncio.to_thread(token_cache.get, cache_key)
+                if cached is not None:
+                    return cached
 
                 metadata = self._metadata_cache.get(config_name)
                 if not metadata:
@@ -458,18 +533,17 @@ class R2DatasetLoader(DatasetLoader):
 
                 pf_data = await self._get_parquet(chosen_shard["path"])
 
-                table = await self.read_row_group(pf_data, chosen_shard, shard_offset)
-
-                start_idx = shard_offset % (
-                    chosen_shard["num_rows"] // pf_data["parquet"].num_row_groups
+                table = await self.read_row_group(
+                    pf_data, chosen_shard, shard_offset, self.num_rows_per_page
                 )
-                texts = table["text"].to_pylist()[
-                    start_idx : start_idx + self.num_rows_per_page
-                ]
 
-                all_tokens = await self._batch_tokenize(texts)
+                texts = table["text"].to_pylist()
+
+                all_tokens = np.asarray(
+                    await self._batch_tokenize(texts), dtype=np.int32
+                )
 
-                self._token_cache[cache_key] = all_tokens
+                await asyncio.to_thread(token_cache.put, cache_key, all_tokens)
                 return all_tokens
 
             except Exception as e:
@@ -516,9 +590,48 @@ class R2DatasetLoader(DatasetLoader):
 
         raise ValueError(f"Failed to get parquet file for {path}")
 
+    @staticmethod
+    def _read_row_slice(pf, group_index: int, start: int, num_rows: int):
+        """
+        Rows ``[start, start + num_rows)`` of one row group's text column.
+
+        Record batches are decoded only up to the end of the slice. With
+        buffered, non-prebuffered reads the column chunk is streamed in
+        ``buffer_size`` pieces, so fetching stops at the buffer holding the
+        slice's last page. Pages before the slice and any dictionary page are
+        still read; pyarrow has no page-index row-range reads.
+        """
+        end = start + num_rows
+        batches, first_row, seen = [], None, 0
+        for batch in pf.iter_batches(
+            batch_size=num_rows,
+            row_groups=[group_index],
+            columns=["text"],
+            use_threads=False,
+            use_pandas_metadata=False,
+        ):
+            if seen + batch.num_rows > start:
+                if first_row is None:
+                    first_row = seen
+                batches.append(batch)
+            seen += batch.num_rows
+            if seen >= end:
+                break
+
+        schema = pyarrow.schema([pf.schema_arrow.field("text")])
+        table = pyarrow.Table.from_batches(batches, schema=schema)
+        if first_row is None:
+            return table
+        return table.slice(start - first_row, num_rows)
+
     @_timer_profiler.profile("read_row_group")
-    async def read_row_group(self, pf_data, chosen_shard, shard_offset):
-        """row group reading with detailed performance tracking"""
+    async def read_row_group(self, pf_data, chosen_shard, shard_offset, num_rows=None):
+        """
+        row group reading with detailed performance tracking
+
+        With ``num_rows`` only that many rows from ``shard_offset``'s position
+        in its row group are read, instead of the whole group.
+        """
         shard_path = chosen_shard["path"]
         shard_profiler = get_shard_profiler()
 
@@ -542,12 +655,27 @@ class R2DatasetLoader(DatasetLoader):
                     rows_per_group,
                 )
 
-                return pf_data["parquet"].read_row_group(
-                    group_index,
-                    columns=["text"],
-                    use_threads=False,
-                    use_pandas_metadata=False,
-                )
+                reader = pf_data.get("reader")
+                bytes_before = reader.bytes_read if reader is not None else 0
+                if num_rows is None:
+                    table = pf_data["parquet"].read_row_group(
+                        group_index,
+                        columns=["text"],
+                        use_threads=False,
+                        use_pandas_metadata=False,
+                    )
+                else:
+                    table = self._read_row_slice(
+                        pf_data["parquet"],
+                        group_index,
+                        shard_offset % rows_per_group,
+                        num_rows,
+                    )
+                if reader is not None:
+                    shard_profiler.record_bytes(
+                        shard_path, reader.bytes_read - bytes_before, table.num_rows
+                    )
+                return table
 
         executor = self.get_executor()
 
@@ -584,65 +712,42 @@ class R2DatasetLoader(DatasetLoader):
     @_timer_profiler.profile("_batch_tokenize")
     async def _batch_tokenize(self, texts):
         """Batch tokenization for better performance"""
-
-        def _tokenize_batch():
-            all_tokens = []
-
-            chunk_size = 128
-            for i in range(0, len(texts), chunk_size):
-                chunk = texts[i : i + chunk_size]
-
-                batch_tokens = self.tokenizer(
-                    chunk,
-                    padding=False,
-                    truncation=True,
-                    max_length=self.sequence_length,
-                    return_tensors=None,
-                )  # type: ignore
-
-                for tokens in batch_tokens["input_ids"]:
-                    if tokens:
-                        all_tokens.extend(tokens)
-                        if tokens[-1] != self.tokenizer.eos_token_id:  # type: ignore
-                            all_tokens.append(self.tokenizer.eos_token_id)  # type: ignore
-
-            return all_tokens
+        pool = self.get_tokenize_pool(self.tokenizer)
+        if pool is not None:
+            return await asyncio.wrap_future(pool.submit(texts, self.sequence_length))
 
         executor = self.get_executor()
-        return await asyncio.get_event_loop().run_in_executor(executor, _tokenize_batch)
+        return await asyncio.get_event_loop().run_in_executor(
+            executor, tokenize_texts, self.tokenizer, texts, self.sequence_length
+        )
 
     def __iter__(self):
         """Reset buffers and prepare for iteration"""
-        self.buffer = self.used_buffer + self.buffer  # Combine buffers
-        self.used_buffer = []  # Reset used buffer
-        self.padded_buffer = []  # Reset padded buffer
+        self._buffer_pos = 0  # Rewind over the used tokens
+        # Fresh padded buffer: batches from the last pass may still view the old one
+        self.padded_buffer = np.empty(0, dtype=np.int64)
+        self._padded_start = self._padded_end = 0
         self._refill_padded_buffer()  # Initial fill
         return self
 
     def __next__(self):
         """Get next batch, exactly matching DatasetLoader's logic"""
-        batch = []
-
-        while len(self.padded_buffer) >= self.sequence_length:
-            # Extract sequence_length tokens
-            sequence = self.padded_buffer[: self.sequence_length]
-            self.padded_buffer = self.padded_buffer[self.sequence_length :]
-
-            batch.append(sequence)
-
-            # Return batch when we have batch_size sequences
-            if len(batch) == self.batch_size:
-                self._refill_padded_buffer()  # Refill after creating batch
-                return np.stack(batch)
-
-            # Refill if needed
-            if len(self.padded_buffer) < self.sequence_length:
-                self._refill_padded_buffer()
-
-        # No more complete batches
-        if batch:  # Partial batch - should not happen with current logic
+        # A refill always tops the padded buffer up to a full batch unless
+        # the token stream has run out
+        size = self.sequence_length * self.batch_size
+        available = self._padded_end - self._padded_start
+        if available < size:
+            # The sequences of the final partial batch are consumed and dropped
+            self._padded_start += available - available % self.sequence_length
             raise StopIteration
-        raise StopIteration
+
+        start = self._padded_start
+        self._padded_start += size
+        batch = self.padded_buffer[start : start + size].reshape(
+            self.batch_size, self.sequence_length
+        )
+        self._refill_padded_buffer()  # Refill after creating batch
+        return torch.from_numpy(batch)
 
     def _read_parquet_table(self, fs, path):
         """
@@ -662,9 +767,6 @@ class R2DatasetLoader(DatasetLoader):
 
     def __del__(self):
         """Cleanup resources"""
-        if self._prefetch_task:
-            self._prefetch_task.cancel()
-
         for pf_data in self._parquet_cache.values():
             with pf_data["lock"]:
                 if pf_data["file"] and not pf_data["file"].closed:
@@ -674,7 +776,6 @@ class R2DatasetLoader(DatasetLoader):
                         logger.debug(f"Error closing parquet file: {e}")
 
         self._parquet_cache.clear()
-        self._token_cache.clear()
 
     @staticmethod
     @_timer_profiler.profile("_get_parquet_file")
@@ -690,12 +791,15 @@ class R2DatasetLoader(DatasetLoader):
             logger.warning(f"Could not get file size for {shard_path}: {e}")
             file_size = "unknown"
 
-        f = fs.open(shard_path, "rb", buffer_size=R2DatasetLoader.READ_BUFFER_SIZE)
+        # Pages need only a slice of a row group: read in small buffered
+        # chunks rather than pre-buffering whole column chunks
+        f = fs.open(shard_path, "rb", buffer_size=R2DatasetLoader.PAGE_READ_BUFFER_SIZE)
+        reader = _CountingReader(f)
         pf = pq.ParquetFile(
-            f,
+            reader,
             memory_map=False,
-            pre_buffer=True,
-            buffer_size=R2DatasetLoader.READ_BUFFER_SIZE,
+            pre_buffer=False,
+            buffer_size=R2DatasetLoader.PAGE_READ_BUFFER_SIZE,
         )
 
         # Use shard profiler for consistent logging
@@ -708,6 +812,7 @@ class R2DatasetLoader(DatasetLoader):
 
         return {
             "file": f,
+            "reader": reader,
             "parquet": pf,
             "lock": threading.Lock(),
             "metadata": {
@@ -722,7 +827,7 @@ class R2DatasetLoader(DatasetLoader):
     @staticmethod
     def _get_tokenized_cache(cache_key: str):
         """Cached tokenization results"""
-        return R2DatasetLoader._token_cache.get(cache_key)
+        return R2DatasetLoader.get_token_cache().get(cache_key)
 
     @staticmethod
     def get_profiling_stats():
@@ -734,6 +839,8 @@ class R2DatasetLoader(DatasetLoader):
         """Log a summary of all timing statistics"""
         _timer_profiler.log_summary()
         ShardIndex.log_profiling_summary()
+        if R2DatasetLoader._token_cache is not None:
+            logger.info(f"Token cache: {R2DatasetLoader._token_cache.stats()}")
         get_shard_profiler().log_analysis()
 
     @staticmethod
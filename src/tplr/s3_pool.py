@@ -0,0 +1,201 @@
+# The MIT License (MIT)
+# © 2025 tplr.ai
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the "Software"), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+# Global imports
+import asyncio
+import time
+from collections.abc import Callable
+
+from aiobotocore.client import AioBaseClient
+from aiobotocore.config import AioConfig
+from botocore.exceptions import ClientError
+
+# Local imports
+from .logging import logger
+from .schemas import Bucket
+
+
+class EndpointStats:
+    """Latency/error counters and circuit-breaker state for one bucket."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.latency_ema: float | None = None
+        self.consecutive_failures = 0
+        self.trips = 0
+        self.open_until = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "latency_ema": self.latency_ema,
+            "consecutive_failures": self.consecutive_failures,
+            "open": time.monotonic() < self.open_until,
+        }
+
+
+class S3ClientPool:
+    """
+    Persistent aiobotocore clients, one per set of bucket credentials.
+
+    Each client gets its own connection limit and keep-alive settings, so a
+    busy peer bucket cannot starve the others. Every request outcome fed to
+    ``record`` updates per-bucket latency/error stats and a circuit breaker:
+    after ``failure_threshold`` consecutive failures the bucket is skipped for
+    ``reset_timeout`` seconds (doubling on each re-trip, up to
+    ``max_reset_timeout``), then retried; one success closes it again.
+    """
+
+    def __init__(
+        self,
+        session,
+        endpoint_url: Callable[[str], str],
+        region_name: str,
+        config,
+        max_connections_per_bucket: int = 32,
+        keepalive_timeout: float = 60.0,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        max_reset_timeout: float = 300.0,
+        latency_alpha: float = 0.2,
+    ):
+        self.session = session
+        self.endpoint_url = endpoint_url
+        self.region_name = region_name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.latency_alpha = latency_alpha
+
+        # Base options (retries, timeouts, ...) plus pool/keep-alive tuning
+        options = dict(getattr(config, "_user_provided_options", {}))
+        options.update(
+            max_pool_connections=max_connections_per_bucket,
+            tcp_keepalive=True,
+            connector_args={"keepalive_timeout": keepalive_timeout},
+        )
+        self.config = AioConfig(**options)
+
+        self._clients: dict[tuple[str, str, str], AioBaseClient] = {}
+        self._locks: dict[tuple[str, str, str], asyncio.Lock] = {}
+        self._stats: dict[str, EndpointStats] = {}
+
+    @staticmethod
+    def _client_key(bucket: Bucket) -> tuple[str, str, str]:
+        return (bucket.access_key_id, bucket.secret_access_key, bucket.account_id)
+
+    async def get(self, bucket: Bucket) -> AioBaseClient:
+        """Return the pooled client for ``bucket``, creating it on first use."""
+        key = self._client_key(bucket)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = await self.session.create_client(
+                    "s3",
+                    endpoint_url=self.endpoint_url(bucket.account_id),
+                    region_name=self.region_name,
+                    config=self.config,
+                    aws_access_key_id=bucket.access_key_id,
+                    aws_secret_access_key=bucket.secret_access_key,
+                ).__aenter__()
+                self._clients[key] = client
+        return client
+
+    async def purge(self, bucket: Bucket, error: BaseException | None = None) -> None:
+        """
+        Drop the client for ``bucket`` after a connection-level failure.
+
+        A ``ClientError`` (404, 403, throttling, ...) means the server answered
+        over a healthy connection, so the client is kept.
+        """
+        if isinstance(error, ClientError):
+            return
+        client = self._clients.pop(self._client_key(bucket), None)
+        if client is not None:
+            # Let in-flight requests on the old client finish before closing
+            asyncio.get_running_loop().call_later(
+                self.reset_timeout,
+                lambda: asyncio.ensure_future(self._close(client)),
+            )
+
+    @staticmethod
+    async def _close(client: AioBaseClient) -> None:
+        try:
+            await client.__aexit__(None, None, None)
+        except Exception as e:
+            logger.warning(f"Error closing s3_client: {e}")
+
+    async def close_all(self) -> None:
+        """Close every pooled client."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await self._close(client)
+
+    @staticmethod
+    def _endpoint_key(bucket: Bucket) -> str:
+        # Bucket names are only unique within an R2 account
+        return f"{bucket.account_id}/{bucket.name}"
+
+    def _endpoint(self, bucket: Bucket) -> EndpointStats:
+        return self._stats.setdefault(self._endpoint_key(bucket), EndpointStats())
+
+    def allow(self, bucket: Bucket) -> bool:
+        """False while the circuit breaker for ``bucket`` is open."""
+        stats = self._stats.get(self._endpoint_key(bucket))
+        return stats is None or time.monotonic() >= stats.open_until
+
+    def record(self, bucket: Bucket, latency: float | None, ok: bool) -> None:
+        """Record one request outcome for ``bucket``."""
+        stats = self._endpoint(bucket)
+        stats.requests += 1
+        if latency is not None:
+            stats.latency_ema = (
+                latency
+                if stats.latency_ema is None
+                else (1 - self.latency_alpha) * stats.latency_ema
+                + self.latency_alpha * latency
+            )
+        if ok:
+            stats.consecutive_failures = 0
+            stats.trips = 0
+            stats.open_until = 0.0
+            return
+
+        stats.errors += 1
+        stats.consecutive_failures += 1
+        if stats.consecutive_failures >= self.failure_threshold:
+            stats.trips += 1
+            backoff = min(
+                self.reset_timeout * 2 ** (stats.trips - 1), self.max_reset_timeout
+            )
+            stats.open_until = time.monotonic() + backoff
+            logger.info(
+                f"Circuit open for bucket {bucket.name} for {backoff:.0f}s after "
+                f"{stats.consecutive_failures} consecutive failures"
+            )
+
+    def stats(self) -> dict[str, dict]:
+        """Per-endpoint (``account/bucket``) counts, latency EMA and breaker state."""
+        return {name: s.as_dict() for name, s in self._stats.items()}
@@ -0,0 +1,217 @@
+# The MIT License (MIT)
+# © 2025 tplr.ai
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the "Software"), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+# Global imports
+import hashlib
+import json
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+# Local imports
+from .logging import logger
+
+# Tokenizer -> fingerprint, computed once per tokenizer object
+_fingerprints: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def tokenizer_fingerprint(tokenizer) -> str:
+    """
+    Short hash identifying a tokenizer's vocabulary and EOS handling.
+
+    Fast tokenizers hash their full serialised definition, slow ones their
+    vocabulary; both are computed once per tokenizer object.
+    """
+    try:
+        return _fingerprints[tokenizer]
+    except (KeyError, TypeError):
+        pass
+
+    backend = getattr(tokenizer, "backend_tokenizer", None)
+    if backend is not None:
+        spec = backend.to_str()
+    elif hasattr(tokenizer, "get_vocab"):
+        spec = json.dumps(sorted(tokenizer.get_vocab().items()))
+    else:
+        spec = ""
+    name = getattr(tokenizer, "name_or_path", type(tokenizer).__name__)
+    eos = getattr(tokenizer, "eos_token_id", None)
+    digest = hashlib.sha256(f"{name}\0{eos}\0{spec}".encode()).hexdigest()[:16]
+    try:
+        _fingerprints[tokenizer] = digest
+    except TypeError:
+        pass
+    return digest
+
+
+class TokenCache:
+    """
+    Tokenised dataset pages as integer arrays.
+
+    Entries are keyed by :meth:`make_key`, which includes the tokenizer and
+    sequence length since both change the tokens produced. A memory tier keeps
+    the most recently used arrays within ``max_memory_bytes``. An optional
+    disk tier of ``.npy`` files under ``directory`` (bounded by
+    ``max_disk_bytes``) survives restarts and is shared by every process on
+    the host; its LRU order is rebuilt from file modification times, which
+    hits refresh. Disk entries are returned memory-mapped.
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int,
+        directory: str | None = None,
+        max_disk_bytes: int = 0,
+    ):
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes if directory else 0
+        self.directory = directory
+
+        self.hits = 0
+        self.misses = 0
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        # key -> tokens / file name -> size, least recent first
+        self._memory: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._disk: OrderedDict[str, int] = OrderedDict()
+        # Tokenisation runs in executor threads, which also fill the cache
+        self._lock = threading.Lock()
+
+        if self.max_disk_bytes:
+            os.makedirs(directory, exist_ok=True)
+            self._scan()
+
+    @staticmethod
+    def make_key(
+        config_name: str, page_number: int, tokenizer_id: str, sequence_length: int
+    ) -> str:
+        raw = f"{config_name}\0{page_number}\0{tokenizer_id}\0{sequence_length}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npy")
+
+    def _scan(self) -> None:
+        """Index the files left by earlier runs, oldest first."""
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if not name.endswith(".npy"):
+                # Left by an interrupted write (recent ones may still be live)
+                if name.endswith(".tmp") and time.time() - stat.st_mtime > 3600:
+                    os.remove(path)
+                continue
+            entries.append((stat.st_mtime, name[: -len(".npy")], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self.disk_bytes += size
+        self._trim_disk()
+
+    def get(self, key: str) -> np.ndarray | None:
+        """Cached tokens for ``key``, or None."""
+        with self._lock:
+            tokens = self._memory.get(key)
+            if tokens is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return tokens
+            if not self.max_disk_bytes:
+                self.misses += 1
+                return None
+
+            path = self._path(key)
+            try:
+                # Another process may have written it since we scanned
+                tokens = np.load(path, mmap_mode="r")
+                os.utime(path)
+            except (OSError, ValueError):
+                self._forget_file(key)
+                self.misses += 1
+                return None
+            if key not in self._disk:
+                size = os.path.getsize(path)
+                self._disk[key] = size
+                self.disk_bytes += size
+            self._disk.move_to_end(key)
+            self.hits += 1
+            return tokens
+
+    def put(self, key: str, tokens: np.ndarray) -> None:
+        """Store ``tokens`` in both tiers, evicting least recently used entries."""
+        tokens = np.ascontiguousarray(tokens)
+        with self._lock:
+            if tokens.nbytes <= self.max_memory_bytes:
+                previous = self._memory.pop(key, None)
+                if previous is not None:
+                    self.memory_bytes -= previous.nbytes
+                self._memory[key] = tokens
+                self.memory_bytes += tokens.nbytes
+                while self.memory_bytes > self.max_memory_bytes:
+                    _, evicted = self._memory.popitem(last=False)
+                    self.memory_bytes -= evicted.nbytes
+
+            if not self.max_disk_bytes or tokens.nbytes > self.max_disk_bytes:
+                return
+            path = self._path(key)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(temp_path, "wb") as f:
+                    np.save(f, tokens)
+                os.replace(temp_path, path)
+            except OSError as e:
+                logger.debug(f"Token cache write for {key} failed: {e}")
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                return
+            self._forget_file(key, remove=False)
+            size = os.path.getsize(path)
+            self._disk[key] = size
+            self.disk_bytes += size
+            self._trim_disk()
+
+    def _forget_file(self, key: str, remove: bool = True) -> None:
+        size = self._disk.pop(key, None)
+        if size is not None:
+            self.disk_bytes -= size
+            if remove and os.path.exists(self._path(key)):
+                os.remove(self._path(key))
+
+    def _trim_disk(self) -> None:
+        while self.disk_bytes > self.max_disk_bytes and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self.disk_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> dict:
+        """Hit/miss counts and bytes held per tier."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory_bytes": self.memory_bytes,
+            "disk_bytes": self.disk_bytes,
+        }
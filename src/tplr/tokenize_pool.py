@@ -0,0 +1,143 @@
+# The MIT License (MIT)
+# © 2025 tplr.ai
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the "Software"), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+# Global imports
+import itertools
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+TOKENIZE_CHUNK_SIZE = 128  # texts per tokenizer call
+
+# The tokenizer of a pool worker, set once by ``_init_worker``
+_worker_tokenizer = None
+
+
+def tokenize_texts(tokenizer, texts: list[str], max_length: int) -> np.ndarray:
+    """
+    Tokenize ``texts`` into one int32 stream, each sample ending in EOS.
+
+    Empty samples are dropped and an EOS is appended to samples that do not
+    already end in one.
+    """
+    eos = tokenizer.eos_token_id
+    samples = []
+    for i in range(0, len(texts), TOKENIZE_CHUNK_SIZE):
+        batch_tokens = tokenizer(
+            texts[i : i + TOKENIZE_CHUNK_SIZE],
+            padding=False,
+            truncation=True,
+            max_length=max_length,
+            return_tensors=None,
+        )  # type: ignore
+        samples.extend(tokens for tokens in batch_tokens["input_ids"] if tokens)
+    if not samples:
+        return np.empty(0, dtype=np.int32)
+
+    lengths = np.fromiter(map(len, samples), dtype=np.int64, count=len(samples))
+    tokens = np.fromiter(
+        itertools.chain.from_iterable(samples), dtype=np.int32, count=lengths.sum()
+    )
+    ends = np.cumsum(lengths)
+    missing_eos = tokens[ends - 1] != eos
+    return np.insert(tokens, ends[missing_eos], eos)
+
+
+def _init_worker(tokenizer) -> None:
+    global _worker_tokenizer
+    _worker_tokenizer = tokenizer
+
+
+def _tokenize_in_worker(texts: list[str], max_length: int) -> tuple[str | None, int]:
+    """Tokenize in a pool worker; the tokens come back in shared memory."""
+    tokens = tokenize_texts(_worker_tokenizer, texts, max_length)
+    if not len(tokens):
+        return None, 0
+    shm = shared_memory.SharedMemory(create=True, size=tokens.nbytes)
+    try:
+        np.ndarray(tokens.shape, dtype=np.int32, buffer=shm.buf)[:] = tokens
+        # The parent unlinks the segment, so this process must not track it
+        _untrack(shm)
+        return shm.name, len(tokens)
+    finally:
+        shm.close()
+
+
+def _untrack(shm: shared_memory.SharedMemory) -> None:
+    try:
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    except Exception:
+        pass
+
+
+class TokenizePool:
+    """
+    Process pool tokenizing pages outside the loader's I/O threads.
+
+    Each worker unpickles its own copy of ``tokenizer`` once at start-up, so
+    tokenization and EOS handling run without contending for the parent's
+    GIL. Results come back as int32 arrays through shared memory instead of
+    pickled token lists. Workers are spawned rather than forked, so the pool
+    is safe to start after CUDA or other threads are running.
+    """
+
+    def __init__(self, tokenizer, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(tokenizer,),
+        )
+
+    def submit(self, texts: list[str], max_length: int) -> Future:
+        """Tokenize ``texts`` in a worker; resolves to an int32 token array."""
+        result = Future()
+
+        def collect(done: Future):
+            # Always runs, so segments are freed even if the caller gave up
+            try:
+                tokens = self._collect(*done.result())
+            except BaseException as e:
+                result.set_exception(e)
+            else:
+                result.set_result(tokens)
+
+        pending = self._executor.submit(_tokenize_in_worker, texts, max_length)
+        pending.add_done_callback(collect)
+        return result
+
+    @staticmethod
+    def _collect(name: str | None, length: int) -> np.ndarray:
+        """Copy a worker's tokens out of shared memory and free the segment."""
+        if name is None:
+            return np.empty(0, dtype=np.int32)
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            return np.ndarray((length,), dtype=np.int32, buffer=shm.buf).copy()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def shutdown(self) -> None:
+        """Drop queued work and wait for the workers to exit."""
+        # Waiting lets running tasks finish and free their shared memory
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,324 @@
+# The MIT License (MIT)
+# © 2025 tplr.ai
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the "Software"), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+"""
+Binary wire format for compressed gradients.
+
+Layout (little-endian)::
+
+    [0:24)    header  = magic (8s) | version (u16) | reserved (u16)
+                        | index length (u32) | global_step (i64)
+    [24:...)  index   = UTF-8 JSON describing every entry
+    [aligned] data    = raw tensor bytes, each tensor 64-byte aligned
+
+The index maps each state-dict key to one of
+    {"tensor": i}                    – i-th entry of the tensor table
+    {"quant": {...}}                 – quant_params tuple (shift/lookup are tensor refs)
+    {"json": value}                  – plain JSON value (e.g. ``metadata``)
+and the tensor table stores ``dtype``, ``shape``, ``offset`` and ``nbytes``
+relative to the start of the data section. Nothing is pickled; decoding
+returns ``torch.frombuffer`` views into the caller's buffer.
+"""
+
+# Global imports
+import json
+import math
+import struct
+import sys
+import warnings
+from typing import Any
+
+import torch
+
+WIRE_MAGIC = b"TPLRGRAD"
+WIRE_VERSION = 1
+
+_HEADER = struct.Struct("<8sHHIq")
+_ALIGN = 64
+
+# Only plain numeric dtypes are allowed on the wire
+_DTYPES: dict[str, torch.dtype] = {
+    "bool": torch.bool,
+    "uint8": torch.uint8,
+    "int8": torch.int8,
+    "int16": torch.int16,
+    "int32": torch.int32,
+    "int64": torch.int64,
+    "float16": torch.float16,
+    "bfloat16": torch.bfloat16,
+    "float32": torch.float32,
+    "float64": torch.float64,
+}
+_DTYPE_NAMES = {v: k for k, v in _DTYPES.items()}
+
+
+def _align(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _dtype_name(dtype: torch.dtype) -> str:
+    try:
+        return _DTYPE_NAMES[dtype]
+    except KeyError:
+        raise ValueError(f"Unsupported dtype for wire format: {dtype}") from None
+
+
+def _dtype_from_name(name: str) -> torch.dtype:
+    try:
+        return _DTYPES[name]
+    except KeyError:
+        raise ValueError(f"Unknown dtype in wire payload: {name!r}") from None
+
+
+def _to_json(value: Any) -> Any:
+    # JSON has no tuples; tag them so e.g. ``pages_info`` round-trips exactly
+    if isinstance(value, tuple):
+        return {"__tuple__": [_to_json(v) for v in value]}
+    if isinstance(value, list):
+        return [_to_json(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _to_json(v) for k, v in value.items()}
+    return value
+
+
+def _from_json(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_from_json(v) for v in value]
+    if isinstance(value, dict):
+        if value.keys() == {"__tuple__"}:
+            return tuple(_from_json(v) for v in value["__tuple__"])
+        return {k: _from_json(v) for k, v in value.items()}
+    return value
+
+
+def payload_nbytes(obj) -> int:
+    """Total tensor bytes in a (nested) payload."""
+    if isinstance(obj, torch.Tensor):
+        return obj.numel() * obj.element_size()
+    if isinstance(obj, dict):
+        return sum(payload_nbytes(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(payload_nbytes(v) for v in obj)
+    return 0
+
+
+def payload_to(obj, device):
+    """Copy of a (nested) payload with every tensor moved to ``device``."""
+    if isinstance(obj, torch.Tensor):
+        return obj.to(device)
+    if isinstance(obj, dict):
+        return {k: payload_to(v, device) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(payload_to(v, device) for v in obj)
+    return obj
+
+
+def is_wire_payload(buffer) -> bool:
+    """Return True if ``buffer`` starts with the wire-format magic."""
+    return bytes(memoryview(buffer)[: len(WIRE_MAGIC)]) == WIRE_MAGIC
+
+
+def encode_wire(state_dict: dict, global_step: int = 0) -> bytearray:
+    """
+    Serialise a compressed-gradient state dict into the wire format.
+
+    Values may be tensors, ``quant_params`` tuples
+    ``(shift, scale, offset, lookup, dtype)`` or JSON-serialisable objects.
+
+    Args:
+        state_dict (dict): Gradient payload as built by ``prepare_gradient_dict``.
+        global_step (int, optional): Sender's global step. Defaults to 0.
+
+    Returns:
+        bytearray: The encoded payload.
+    """
+    if sys.byteorder != "little":
+        raise RuntimeError("Wire format is only supported on little-endian hosts")
+
+    tensors: list[torch.Tensor] = []
+    table: list[dict[str, Any]] = []
+    entries: dict[str, Any] = {}
+    data_size = 0
+
+    def add_tensor(t: torch.Tensor) -> int:
+        nonlocal data_size
+        t = t.detach()
+        nbytes = t.numel() * t.element_size()
+        offset = _align(data_size)
+        table.append(
+            {
+                "dtype": _dtype_name(t.dtype),
+                "shape": list(t.shape),
+                "offset": offset,
+                "nbytes": nbytes,
+            }
+        )
+        tensors.append(t)
+        data_size = offset + nbytes
+        return len(table) - 1
+
+    for name, value in state_dict.items():
+        if isinstance(value, torch.Tensor):
+            entries[name] = {"tensor": add_tensor(value)}
+        elif name.endswith("quant_params") and isinstance(value, (tuple, list)):
+            shift, scale, offset, lookup, orig_dtype = value
+            entries[name] = {
+                "quant": {
+                    "shift": add_tensor(torch.as_tensor(shift)),
+                    "scale": float(scale),
+                    "offset": int(offset),
+                    "lookup": add_tensor(torch.as_tensor(lookup)),
+                    "dtype": _dtype_name(orig_dtype),
+                }
+            }
+        else:
+            entries[name] = {"json": _to_json(value)}
+
+    index = json.dumps(
+        {"tensors": table, "entries": entries}, separators=(",", ":")
+    ).encode("utf-8")
+    data_start = _align(_HEADER.size + len(index))
+
+    buffer = bytearray(data_start + data_size)
+    _HEADER.pack_into(
+        buffer, 0, WIRE_MAGIC, WIRE_VERSION, 0, len(index), int(global_step)
+    )
+    buffer[_HEADER.size : _HEADER.size + len(index)] = index
+
+    for meta, t in zip(table, tensors):
+        if meta["nbytes"] == 0:
+            continue
+        dst = torch.frombuffer(
+            buffer,
+            dtype=torch.uint8,
+            count=meta["nbytes"],
+            offset=data_start + meta["offset"],
+        )
+        dst.copy_(t.reshape(-1).view(torch.uint8))
+    return buffer
+
+
+def _tensor_ref(tensors: list[torch.Tensor], ref: Any) -> torch.Tensor:
+    if type(ref) is not int or not 0 <= ref < len(tensors):
+        raise ValueError(f"Bad tensor reference in wire payload: {ref!r}")
+    return tensors[ref]
+
+
+def _decode_entries(
+    buffer, view: memoryview, index: dict, data_start: int, map_location
+) -> dict[str, Any]:
+    """Rebuild the state dict described by a parsed ``index``."""
+    readonly = view.readonly
+    to_cpu = map_location is None or torch.device(map_location).type == "cpu"
+    tensors: list[torch.Tensor] = []
+    for meta in index["tensors"]:
+        dtype = _dtype_from_name(meta["dtype"])
+        dims = [int(d) for d in meta["shape"]]
+        nbytes, offset = int(meta["nbytes"]), int(meta["offset"])
+        if offset < 0 or any(d < 0 for d in dims):
+            raise ValueError("Negative offset or dimension in wire payload")
+        offset += data_start
+        itemsize = torch.empty((), dtype=dtype).element_size()
+        # Python ints, so oversized dimensions cannot wrap around
+        if (
+            nbytes != math.prod(dims) * itemsize
+            or offset + nbytes > len(view)
+            or any(d >= 2**63 for d in dims)
+        ):
+            raise ValueError("Corrupt tensor table in wire payload")
+        shape = torch.Size(dims)
+        if nbytes == 0:
+            tensors.append(torch.empty(shape, dtype=dtype, device=map_location))
+            continue
+        if readonly and to_cpu:
+            # torch.frombuffer refuses to share immutable memory safely
+            t = torch.frombuffer(bytearray(view[offset : offset + nbytes]), dtype=dtype)
+        elif readonly:
+            # Copied off the buffer by ``.to`` below, so no host copy is needed
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", UserWarning)
+                t = torch.frombuffer(
+                    view, dtype=dtype, count=shape.numel(), offset=offset
+                )
+        else:
+            t = torch.frombuffer(
+                buffer, dtype=dtype, count=shape.numel(), offset=offset
+            )
+        t = t.view(shape)
+        if map_location is not None:
+            t = t.to(map_location)
+        tensors.append(t)
+
+    state_dict: dict[str, Any] = {}
+    for name, entry in index["entries"].items():
+        if "tensor" in entry:
+            state_dict[name] = _tensor_ref(tensors, entry["tensor"])
+        elif "quant" in entry:
+            q = entry["quant"]
+            state_dict[name] = (
+                _tensor_ref(tensors, q["shift"]),
+                q["scale"],
+                q["offset"],
+                _tensor_ref(tensors, q["lookup"]),
+                _dtype_from_name(q["dtype"]),
+            )
+        else:
+            state_dict[name] = _from_json(entry["json"])
+    return state_dict
+
+
+def decode_wire(buffer, map_location: str | torch.device | None = None) -> dict:
+    """
+    Deserialise a wire-format payload.
+
+    On CPU, tensors are zero-copy views into ``buffer``, so it must stay
+    alive (and unmodified) for as long as the tensors are used. Pass a
+    writable buffer (e.g. ``bytearray``) to get writable tensors.
+
+    Args:
+        buffer: Bytes-like object holding the encoded payload.
+        map_location (optional): Device to move tensors to, like
+            ``torch.load``. Defaults to None (CPU views).
+
+    Returns:
+        dict: ``{"state_dict": dict, "global_step": int}``, the same shape
+        ``Comms.put`` wraps around ``torch.save`` payloads.
+
+    Raises:
+        ValueError: If the payload is malformed or of an unknown version.
+    """
+    view = memoryview(buffer)
+    if len(view) < _HEADER.size:
+        raise ValueError("Wire payload shorter than its header")
+    magic, version, _, index_len, global_step = _HEADER.unpack_from(view, 0)
+    if magic != WIRE_MAGIC:
+        raise ValueError("Not a wire-format payload")
+    if version != WIRE_VERSION:
+        raise ValueError(f"Unsupported wire format version {version}")
+
+    index_end = _HEADER.size + index_len
+    if index_end > len(view):
+        raise ValueError("Truncated wire payload index")
+    try:
+        index = json.loads(bytes(view[_HEADER.size : index_end]).decode("utf-8"))
+        state_dict = _decode_entries(
+            buffer, view, index, _align(index_end), map_location
+        )
+    except (KeyError, TypeError, IndexError, AttributeError) as e:
+        raise ValueError(f"Malformed wire payload index: {e!r}") from None
+
+    return {"state_dict": state_dict, "global_step": global_step}
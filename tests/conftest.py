@@ -72,6 +72,8 @@ class DummyHParams:
     active_check_interval = 60
     recent_windows = 5
     topk_compression = 3  # Expected number of indices will be 3 (min(3, totalk))
+    blocks_per_window = hparams.blocks_per_window
+    target_chunk = hparams.target_chunk
 
 
 class DummyMetagraph:
@@ -112,7 +114,9 @@ async def comms_instance():
     )
 
     # Manually add transformer and compressor as production code expects them to be available later.
-    transformer = compress.TransformDCT(None, target_chunk=hparams.target_chunk)
+    transformer = compress.TransformDCT(
+        torch.nn.Sequential(torch.nn.Linear(10, 10)), target_chunk=hparams.target_chunk
+    )
     compressor = compress.CompressDCT()
 
     # Set expected parameter shapes and totalks.
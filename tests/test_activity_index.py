@@ -0,0 +1,121 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+import tplr
+from tplr.activity_index import ActivityIndex
+from tplr.schemas import Bucket
+
+VERSION = tplr.__version__
+
+
+def _bucket(name="peer-bucket"):
+    return Bucket(
+        name=name,
+        account_id="peer-account",
+        access_key_id="key",
+        secret_access_key="secret",
+    )
+
+
+def _obj(window, uid, ts, version=VERSION):
+    return {
+        "Key": f"gradient-{window}-{uid}-v{version}.pt",
+        "LastModified": datetime.fromtimestamp(ts, tz=timezone.utc),
+    }
+
+
+def _client(*pages):
+    """S3 client whose list_objects_v2 paginator yields ``pages`` of objects."""
+    calls = []
+
+    def paginate(**kwargs):
+        calls.append(kwargs)
+
+        async def gen():
+            for contents in pages:
+                yield {"Contents": contents}
+
+        return gen()
+
+    paginator = MagicMock(paginate=MagicMock(side_effect=paginate))
+    client = MagicMock(get_paginator=MagicMock(return_value=paginator))
+    client.head_object = AsyncMock()
+    return client, calls
+
+
+async def test_refresh_indexes_recent_gradients():
+    index = ActivityIndex(version=VERSION, retention_windows=10)
+    bucket = _bucket()
+    client, calls = _client(
+        [_obj(195, 1, 1000.0), _obj(199, 1, 1100.0)],
+        [
+            _obj(180, 1, 900.0),  # older than the retention floor
+            _obj(99, 1, 800.0),  # sorts after "gradient-190-", but is older still
+            _obj(200, 1, 1200.0, version="0.0.1"),  # other version
+            {"Key": "gradient-foo.pt", "LastModified": datetime.now(timezone.utc)},
+        ],
+    )
+
+    assert await index.refresh(bucket, client, current_window=200) == 2
+
+    assert calls[0]["Prefix"] == "gradient-"
+    assert calls[0]["StartAfter"] == "gradient-190-"
+    assert index.timestamp(bucket, uid=1, window=199) == 1100.0
+    assert index.timestamp(bucket, uid=1, window=180) is None
+    assert index.timestamp(bucket, uid=1, window=99) is None
+    assert index.timestamp(bucket, uid=1, window=200) is None
+    assert index.is_active(bucket, 1, current_window=200, recent_windows=3)
+    assert not index.is_active(bucket, 1, current_window=204, recent_windows=3)
+    assert index.ready_uids({1: bucket, 2: bucket, 3: None}, window=195) == [1]
+
+
+async def test_refresh_lists_everything_after_window_digit_rollover():
+    index = ActivityIndex(version=VERSION, retention_windows=10)
+    client, calls = _client([_obj(1001, 4, 1.0)])
+
+    await index.refresh(_bucket(), client, current_window=1005)
+
+    # "gradient-995-" sorts after "gradient-1001-", so no StartAfter here
+    assert "StartAfter" not in calls[0]
+    assert index.timestamp(_bucket(), uid=4, window=1001) == 1.0
+
+    # Full listings last until the retained range is past the rollover
+    for current_window, full in [(1009, True), (1010, False), (1011, False)]:
+        await index.refresh(_bucket(), client, current_window=current_window)
+        assert ("StartAfter" not in calls[-1]) is full
+
+
+async def test_staleness_and_retain():
+    index = ActivityIndex(version=VERSION)
+    first, second = _bucket("a"), _bucket("b")
+    assert index.staleness() == -1.0
+
+    await index.refresh(first, _client([])[0], current_window=50)
+    await index.refresh(second, _client([_obj(50, 2, 1.0)])[0], current_window=50)
+    index._refreshed_at["peer-account/a"] -= 30
+
+    assert index.staleness() == pytest.approx(30, abs=1)
+
+    index.retain([second])
+    assert not index.has(first) and index.has(second)
+    assert index.staleness() < 1
+
+
+async def test_comms_answers_activity_from_index(comms_instance):
+    bucket = _bucket()
+    client, calls = _client([_obj(10, 7, 1234.0)])
+    comms_instance.commitments = {7: bucket, 8: None}
+    comms_instance.current_window = 11
+    comms_instance._get_s3_client = AsyncMock(return_value=client)
+
+    await comms_instance.refresh_activity_index()
+
+    assert await comms_instance.is_miner_active(7, recent_windows=3)
+    assert not await comms_instance.is_miner_active(8, recent_windows=3)
+    assert await comms_instance.gradient_timestamp(7, 10) == 1234.0
+    assert comms_instance.gradients_ready([7, 8], window=10) == [7]
+    # One listing, and no HEAD requests for anything already indexed
+    assert len(calls) == 1
+    client.head_object.assert_not_called()
@@ -0,0 +1,49 @@
+import pytest
+import torch
+
+from tplr.neurons import pack_binary_tensor, unpack_binary_tensor
+
+DEVICES = ["cpu"] + (["cuda"] if torch.cuda.is_available() else [])
+
+
+def _legacy_pack(tensor):
+    """The original 8-way strided implementation (multiples of 8 only)."""
+    tensor = (tensor > 0).to(torch.uint8).view(-1)
+    packed = torch.zeros((tensor.shape[0] + 7) // 8, dtype=torch.uint8)
+    for i in range(8):
+        packed |= tensor[i::8] << i
+    return packed
+
+
+@pytest.mark.parametrize("shape", [(8,), (64, 40), (3, 5, 16)])
+def test_pack_matches_legacy_layout(shape):
+    torch.manual_seed(0)
+    signs = torch.randn(shape).sign()
+
+    assert torch.equal(pack_binary_tensor(signs, "cpu"), _legacy_pack(signs))
+
+
+@pytest.mark.parametrize("device", DEVICES)
+@pytest.mark.parametrize("shape", [(1,), (7,), (9,), (3, 7), (5, 13, 11)])
+@pytest.mark.parametrize("chunk_size", [8, 24, 1 << 24])
+def test_roundtrip_with_ragged_tail(device, shape, chunk_size):
+    torch.manual_seed(0)
+    signs = torch.randn(shape, device=device).sign()
+    signs[signs == 0] = 1
+
+    packed = pack_binary_tensor(signs, device, chunk_size=chunk_size)
+    unpacked = unpack_binary_tensor(packed, signs.shape, chunk_size=chunk_size)
+
+    assert packed.numel() == (signs.numel() + 7) // 8
+    assert unpacked.dtype == torch.float32 and unpacked.shape == signs.shape
+    assert torch.equal(unpacked, signs.float())
+
+
+def test_zeros_pack_as_negative_and_padding_is_ignored():
+    packed = pack_binary_tensor(torch.tensor([0.0, 2.0, -1.0]), "cpu")
+    padded = torch.cat([packed, torch.tensor([255], dtype=torch.uint8)])
+
+    assert packed.tolist() == [0b010]
+    assert unpack_binary_tensor(padded, torch.Size([3])).tolist() == [-1, 1, -1]
+    with pytest.raises(ValueError):
+        unpack_binary_tensor(packed, torch.Size([9]))
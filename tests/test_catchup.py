@@ -0,0 +1,67 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import torch
+import torch.nn as nn
+
+from tplr.neurons import catchup_with_aggregation_server, pack_binary_tensor
+
+
+def _instance(signs, lookahead):
+    torch.manual_seed(0)
+    model = nn.Linear(4, 2, bias=False)
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.1)
+    scheduler = torch.optim.lr_scheduler.LambdaLR(optimizer, lambda _: 1.0)
+    in_flight = {"now": 0, "max": 0}
+
+    async def load_aggregation(window):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        return {"state_dict": {"weight": pack_binary_tensor(signs[window], "cpu")}}
+
+    comms = SimpleNamespace(
+        load_aggregation=AsyncMock(side_effect=load_aggregation),
+        get_debug_dict=AsyncMock(return_value=None),
+    )
+    instance = SimpleNamespace(
+        model=model,
+        optimizer=optimizer,
+        scheduler=scheduler,
+        comms=comms,
+        hparams=SimpleNamespace(weight_decay=0.0, catchup_lookahead=lookahead),
+        config=SimpleNamespace(device="cpu"),
+        current_window=9,
+        start_window=0,
+        global_step=0,
+    )
+    return instance, in_flight
+
+
+async def test_catchup_prefetches_and_matches_sequential_updates():
+    torch.manual_seed(1)
+    signs = {w: torch.randn(2, 4).sign() for w in range(1, 9)}
+    instance, in_flight = _instance(signs, lookahead=4)
+    expected = instance.model.weight.detach().clone()
+    for window in range(1, 9):
+        expected -= 0.1 * signs[window]
+
+    await catchup_with_aggregation_server(instance, checkpoint_current_window=0)
+
+    assert torch.allclose(instance.model.weight, expected)
+    assert instance.comms.load_aggregation.await_count == 8
+    assert in_flight["max"] > 1  # downloads overlapped
+    assert instance.global_step == 9
+
+
+async def test_catchup_lookahead_of_one_is_sequential():
+    signs = {w: torch.ones(2, 4) for w in range(1, 9)}
+    instance, in_flight = _instance(signs, lookahead=1)
+
+    await catchup_with_aggregation_server(instance, checkpoint_current_window=4)
+
+    # Only the current and the next window are ever in flight
+    assert in_flight["max"] <= 2
+    assert instance.comms.load_aggregation.await_count == 4
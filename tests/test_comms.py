@@ -1,5 +1,8 @@
 # ruff: noqa
 
+import io
+import math
+import pickle
 import os
 import random
 from unittest.mock import patch, MagicMock, AsyncMock
@@ -90,7 +93,7 @@ def mock_config():
 
 
 from tplr.schemas import Bucket
-from tplr.compress import TransformDCT, CompressDCT
+from tplr.compress import TransformDCT, CompressDCT, GradientAccumulator
 
 # Load environment variables from .env file
 load_dotenv()
@@ -278,6 +281,83 @@ async def test_get_local(comms_instance):
     assert global_step == test_state_dict["global_step"]
 
 
+async def test_put_get_local_gradient_wire_format(comms_instance):
+    """Gradients are stored in the wire format and round-trip through get()."""
+    gradient = {
+        "weightidxs": torch.tensor([[0, 3]], dtype=torch.int16),
+        "weightvals": torch.tensor([[17, 200]], dtype=torch.uint8),
+        "weightquant_params": (
+            torch.tensor(0.25),
+            0.01,
+            128,
+            torch.linspace(-1, 1, 256),
+            torch.float32,
+        ),
+        "metadata": {"pages_info": [("cfg", 1, "train")], "window": 2},
+    }
+    uid, window = "0", 2
+
+    with patch.object(comms_instance, "cleanup_local_data"):
+        await comms_instance.put(
+            state_dict=gradient,
+            uid=uid,
+            window=window,
+            key="gradient",
+            global_step=5,
+            local=True,
+        )
+        state_dict, global_step = await comms_instance.get(
+            uid=uid, window=window, key="gradient", local=True
+        )
+
+    filename = f"gradient-{window}-{uid}-v{tplr.__version__}.pt"
+    with open(os.path.join("/tmp/local_store", uid, str(window), filename), "rb") as f:
+        assert tplr.is_wire_payload(f.read(16))
+
+    assert global_step == 5
+    assert torch.equal(state_dict["weightidxs"], gradient["weightidxs"])
+    assert torch.equal(state_dict["weightvals"], gradient["weightvals"])
+    shift, scale, offset, lookup, dtype = state_dict["weightquant_params"]
+    assert torch.equal(shift, gradient["weightquant_params"][0])
+    assert (scale, offset, dtype) == (0.01, 128, torch.float32)
+    assert torch.equal(lookup, gradient["weightquant_params"][3])
+    assert state_dict["metadata"] == gradient["metadata"]
+
+
+class _Unpicklable:
+    """Stands in for an arbitrary object a malicious peer could pickle."""
+
+
+def test_peer_gradients_are_never_unpickled(tmp_path):
+    """Non-wire gradient payloads load with weights_only; other keys may pickle."""
+    legacy = io.BytesIO()
+    torch.save(
+        {"state_dict": {"weightvals": torch.arange(4)}, "global_step": 3}, legacy
+    )
+    loaded = Comms._decode_payload(
+        "gradient-1-2-v0.pt", bytearray(legacy.getvalue()), weights_only=False
+    )
+    assert loaded["global_step"] == 3
+    assert torch.equal(loaded["state_dict"]["weightvals"], torch.arange(4))
+
+    payload = io.BytesIO()
+    torch.save({"state_dict": _Unpicklable()}, payload)
+    with pytest.raises(pickle.UnpicklingError):
+        Comms._decode_payload(
+            "gradient-1-2-v0.pt", bytearray(payload.getvalue()), weights_only=False
+        )
+    path = tmp_path / "temp_download.pt"
+    path.write_bytes(payload.getvalue())
+    with pytest.raises(pickle.UnpicklingError):
+        Comms._load_payload(str(path), weights_only=False, key="gradient-1-2-v0.pt")
+
+    # Trusted objects (e.g. aggregation files) keep full unpickling
+    loaded = Comms._decode_payload(
+        "aggregator-1-v0.pt", bytearray(payload.getvalue()), weights_only=False
+    )
+    assert isinstance(loaded["state_dict"], _Unpicklable)
+
+
 @pytest.mark.asyncio
 async def test_gather_basic_functionality(comms_instance):
     """Test 3: Basic Gradient Gathering
@@ -288,9 +368,8 @@ async def test_gather_basic_functionality(comms_instance):
     - Checking accurate tracking of UIDs and global steps
     - Ensuring correct structure of aggregated results
     """
-    comms_instance.check_compressed_indices = (
-        lambda param_name, idxs, totalk, allowed_topk=None: None
-    )
+    # Index count the real gather validation expects from these peers
+    comms_instance.hparams.topk_compression = 3
 
     comms_instance.get_with_retry = AsyncMock()
 
@@ -353,9 +432,8 @@ async def test_gather_normalization(comms_instance):
     - Verifying correct processing of single peer response
     - Ensuring normalization maintains data integrity
     """
-    comms_instance.check_compressed_indices = (
-        lambda param_name, idxs, totalk, allowed_topk=None: None
-    )
+    # Index count the real gather validation expects from these peers
+    comms_instance.hparams.topk_compression = 3
     comms_instance.get_with_retry = AsyncMock()
 
     totalk_value = 100
@@ -549,10 +627,8 @@ async def test_gather_averaging(comms_instance):
     - Validation of UIDs and global steps
     - Tensor shape and size validation
     """
-    # Mock check_compressed_indices as specified.
-    comms_instance.check_compressed_indices = (
-        lambda param_name, idxs, totalk, allowed_topk=None: None
-    )
+    # Index count the real gather validation expects from these peers
+    comms_instance.hparams.topk_compression = 2
 
     # Patch get_with_retry to simulate two peer responses.
     comms_instance.get_with_retry = AsyncMock()
@@ -614,10 +690,8 @@ async def test_gather_complex_normalization(comms_instance):
     - Validation of aggregated results against expected values
     - Proper handling of multiple peer responses
     """
-    # Bypass the compressed indices validation for this test.
-    comms_instance.check_compressed_indices = (
-        lambda param_name, idxs, totalk, allowed_topk=None: None
-    )
+    # Index count the real gather validation expects from these peers
+    comms_instance.hparams.topk_compression = 3
 
     totalk_value = (
         3  # For three indices, allowed_topk = min(topk_compression, totalk_value) = 3
@@ -804,6 +878,133 @@ async def test_s3_put_large_file(comms_instance):
     os.remove("large_file.txt")
 
 
+def _validating_s3_client():
+    """Mock S3 client that runs botocore's request parameter validation."""
+    from botocore.session import get_session
+    from botocore.validate import validate_parameters
+
+    model = get_session().get_service_model("s3")
+
+    def operation(name, response):
+        shape = model.operation_model(name).input_shape
+
+        async def call(**kwargs):
+            validate_parameters(kwargs, shape)
+            return response
+
+        return AsyncMock(side_effect=call)
+
+    client = AsyncMock()
+    client.put_object = operation("PutObject", {})
+    client.create_multipart_upload = operation(
+        "CreateMultipartUpload", {"UploadId": "test_id"}
+    )
+    client.upload_part = operation("UploadPart", {"ETag": "test_etag"})
+    client.complete_multipart_upload = operation("CompleteMultipartUpload", {})
+    return client
+
+
+@pytest.mark.parametrize("key", ["gradient", "debug"])
+async def test_in_memory_put_bodies_pass_botocore_validation(comms_instance, key):
+    """Bodies built by put() are types botocore accepts."""
+    client = _validating_s3_client()
+    comms_instance._get_s3_client = AsyncMock(return_value=client)
+    comms_instance.max_in_memory_upload = 1024 * 1024
+    gradient = {"weightvals": torch.arange(64, dtype=torch.uint8)}
+
+    with patch.object(comms_instance, "cleanup_s3_data", new=AsyncMock()):
+        await comms_instance.put(
+            state_dict=gradient, uid="0", window=1, key=key, local=False
+        )
+
+    client.put_object.assert_awaited_once()
+
+
+async def test_upload_large_file_from_memory(comms_instance):
+    """Multipart parts sliced from an in-memory payload pass validation."""
+    client = _validating_s3_client()
+    comms_instance.multipart_policy = tplr.comms.MultipartPolicy(
+        default_part_size=5 * 1024 * 1024
+    )
+    data = bytearray(os.urandom(12 * 1024 * 1024))
+    await comms_instance.upload_large_file(None, "test_key", client, data=data)
+
+    calls = sorted(
+        client.upload_part.call_args_list, key=lambda c: c.kwargs["PartNumber"]
+    )
+    bodies = [call.kwargs["Body"] for call in calls]
+    assert len(bodies) == 3
+    assert b"".join(bodies) == data
+    client.complete_multipart_upload.assert_awaited_once()
+
+
+def test_multipart_policy_part_limit():
+    """Part size grows so even huge objects stay within 10,000 parts."""
+    policy = tplr.comms.MultipartPolicy()
+
+    part_size, concurrency = policy.plan(100 * 1024 * 1024)
+    assert part_size == policy.default_part_size
+    assert concurrency == 7  # never more slots than parts
+
+    size = 10 * 1024**4  # 10TB
+    part_size, _ = policy.plan(size)
+    assert math.ceil(size / part_size) <= tplr.comms.S3_MAX_PARTS
+    assert tplr.comms.S3_MIN_PART_SIZE <= part_size <= tplr.comms.S3_MAX_PART_SIZE
+
+
+def test_multipart_policy_adapts_to_throughput():
+    """Part size follows measured throughput; concurrency hill-climbs."""
+    policy = tplr.comms.MultipartPolicy(default_concurrency=8)
+    mb = 1024 * 1024
+    parts = [(16 * mb, 0.5)] * 10  # 32MB/s per part
+
+    policy.record(8, parts, 160 * mb, elapsed=1.0)
+    assert policy.concurrency == 16
+    assert policy.plan(1024 * mb)[0] == 64 * mb  # 2s worth at 32MB/s
+
+    policy.record(16, parts, 160 * mb, elapsed=0.5)  # 2x faster: keep climbing
+    assert policy.concurrency == 32
+    policy.record(32, parts, 160 * mb, elapsed=0.5)  # no gain: step back
+    assert policy.concurrency == 16
+
+
+def test_latency_histogram():
+    summary = tplr.comms._latency_histogram([0.1, 0.3, 0.3, 1.5, 40.0])
+    assert "p50=0.30s" in summary
+    assert "<=0.5s:2" in summary
+    assert ">32s:1" in summary
+
+
+@pytest.mark.parametrize("in_memory", [True, False])
+async def test_put_remote_serialises_in_memory(comms_instance, in_memory):
+    """put() uploads straight from memory unless the budget is exceeded."""
+    gradient = {"weightvals": torch.arange(64, dtype=torch.uint8)}
+    comms_instance.max_in_memory_upload = 1024 if in_memory else 0
+    comms_instance.s3_put_object = AsyncMock()
+
+    with patch.object(comms_instance, "cleanup_s3_data", new=AsyncMock()) as cleanup:
+        await comms_instance.put(
+            state_dict=gradient,
+            uid="0",
+            window=1,
+            key="gradient",
+            global_step=4,
+            local=False,
+        )
+        await asyncio.sleep(0)
+
+    # Old objects are cleaned up whichever way the payload was uploaded
+    cleanup.assert_called_once()
+    call = comms_instance.s3_put_object.call_args
+    if in_memory:
+        loaded = tplr.decode_wire(call.kwargs["data"])
+        assert loaded["global_step"] == 4
+        assert torch.equal(loaded["state_dict"]["weightvals"], gradient["weightvals"])
+    else:
+        assert "data" not in call.kwargs
+        assert call.args[1].endswith(call.args[0])
+
+
 async def test_download_large_file(comms_instance):
     """Test 14: Verify downloading of large files
 
@@ -851,6 +1052,289 @@ async def test_download_large_file(comms_instance):
     mock_client.get_object.assert_called()
 
 
+class _ChunkedBody:
+    """Streaming body stand-in that honours ``read(amt)``."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read(self, amt=None):
+        end = len(self.data) if amt is None else self.pos + amt
+        chunk = self.data[self.pos : end]
+        self.pos += len(chunk)
+        return chunk
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.parametrize("in_memory", [True, False])
+async def test_s3_get_object_in_memory_and_disk_fallback(comms_instance, in_memory):
+    """Objects under the memory limit are decoded from RAM, larger ones via disk."""
+    gradient = {"weightvals": torch.arange(100, dtype=torch.uint8)}
+    payload = bytes(tplr.encode_wire(gradient, global_step=3))
+    bucket = Bucket(
+        name="test-bucket",
+        account_id="test-account",
+        access_key_id="test-key",
+        secret_access_key="test-secret",
+    )
+
+    mock_client = AsyncMock()
+    mock_client.get_object = AsyncMock(
+        side_effect=lambda **kwargs: {
+            "Body": _ChunkedBody(payload),
+            "LastModified": datetime.now(timezone.utc),
+            "ContentLength": len(payload),
+        }
+    )
+    comms_instance._get_s3_client = AsyncMock(return_value=mock_client)
+    comms_instance.config.device = "cpu"
+    comms_instance.max_in_memory_download = len(payload) if in_memory else 0
+
+    with (
+        patch("tplr.comms.STREAM_READ_SIZE", 64),
+        patch("tplr.comms.aiofiles.open", wraps=tplr.comms.aiofiles.open) as f_open,
+    ):
+        result = await comms_instance.s3_get_object(
+            key="gradient-1-0-v0.pt", bucket=bucket
+        )
+
+    assert f_open.called is not in_memory
+    assert result["global_step"] == 3
+    assert torch.equal(result["state_dict"]["weightvals"], gradient["weightvals"])
+
+
+async def test_s3_get_object_single_conditional_get(comms_instance):
+    """One GET carries the time window as conditional headers; no HEAD."""
+    payload = bytes(tplr.encode_wire({"x": torch.ones(4)}))
+    bucket = Bucket(
+        name="test-bucket",
+        account_id="test-account",
+        access_key_id="test-key",
+        secret_access_key="test-secret",
+    )
+    time_min = datetime(2025, 1, 1, 12, 0, 0, 500000, tzinfo=timezone.utc)
+    time_max = datetime(2025, 1, 1, 12, 0, 30, 250000, tzinfo=timezone.utc)
+
+    mock_client = AsyncMock()
+    mock_client.get_object = AsyncMock(
+        return_value={
+            "Body": _ChunkedBody(payload),
+            "LastModified": time_min + timedelta(seconds=5),
+            "ContentLength": len(payload),
+        }
+    )
+    comms_instance._get_s3_client = AsyncMock(return_value=mock_client)
+    comms_instance.config.device = "cpu"
+
+    result = await comms_instance.s3_get_object(
+        key="gradient-1-0-v0.pt", bucket=bucket, time_min=time_min, time_max=time_max
+    )
+
+    assert torch.equal(result["state_dict"]["x"], torch.ones(4))
+    mock_client.head_object.assert_not_called()
+    kwargs = mock_client.get_object.call_args.kwargs
+    assert kwargs["IfModifiedSince"] == datetime(
+        2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc
+    )
+    # Rounded up, so objects in (12:00:30, time_max] are not refused
+    assert kwargs["IfUnmodifiedSince"] == datetime(
+        2025, 1, 1, 12, 0, 31, tzinfo=timezone.utc
+    )
+
+
+@pytest.mark.parametrize("offset_ms, too_late", [(-100, False), (100, True)])
+async def test_s3_get_object_rechecks_time_max_below_one_second(
+    comms_instance, offset_ms, too_late
+):
+    """Objects within a second of time_max are judged on their exact Last-Modified."""
+    payload = bytes(tplr.encode_wire({"x": torch.ones(4)}))
+    bucket = Bucket(
+        name="test-bucket",
+        account_id="test-account",
+        access_key_id="test-key",
+        secret_access_key="test-secret",
+    )
+    time_max = datetime(2025, 1, 1, 12, 0, 30, 250000, tzinfo=timezone.utc)
+
+    mock_client = AsyncMock()
+    mock_client.get_object = AsyncMock(
+        return_value={
+            "Body": _ChunkedBody(payload),
+            "LastModified": time_max + timedelta(milliseconds=offset_ms),
+            "ContentLength": len(payload),
+        }
+    )
+    comms_instance._get_s3_client = AsyncMock(return_value=mock_client)
+    comms_instance.config.device = "cpu"
+
+    result = await comms_instance.s3_get_object(
+        key="gradient-1-0-v0.pt", bucket=bucket, time_max=time_max
+    )
+
+    if too_late:
+        assert result == {"__status": "TOO_LATE"}
+    else:
+        assert torch.equal(result["state_dict"]["x"], torch.ones(4))
+
+
+@pytest.mark.parametrize(
+    "status, expected", [(304, "TOO_EARLY"), (412, "TOO_LATE"), (404, None)]
+)
+async def test_s3_get_object_conditional_failures(comms_instance, status, expected):
+    """304/412 from the conditional GET map to TOO_EARLY/TOO_LATE; 404 to None."""
+    from botocore.exceptions import ClientError
+
+    bucket = Bucket(
+        name="test-bucket",
+        account_id="test-account",
+        access_key_id="test-key",
+        secret_access_key="test-secret",
+    )
+    error = ClientError(
+        {
+            "Error": {"Code": str(status)},
+            "ResponseMetadata": {"HTTPStatusCode": status},
+        },
+        "GetObject",
+    )
+    mock_client = AsyncMock()
+    mock_client.get_object = AsyncMock(side_effect=error)
+    comms_instance._get_s3_client = AsyncMock(return_value=mock_client)
+
+    now = datetime.now(timezone.utc)
+    result = await comms_instance.s3_get_object(
+        key="gradient-1-0-v0.pt",
+        bucket=bucket,
+        time_min=now - timedelta(seconds=10),
+        time_max=now,
+    )
+
+    if expected is None:
+        assert result is None
+    else:
+        assert result == {"__status": expected}
+    assert comms_instance.s3_pool.allow(bucket)  # answered, so not a failure
+
+
+async def test_s3_get_object_revalidates_cached_copy(comms_instance):
+    """A second read sends If-None-Match and decodes the cached bytes on 304."""
+    from botocore.exceptions import ClientError
+
+    payload = bytes(tplr.encode_wire({"x": torch.ones(4)}, global_step=7))
+    bucket = Bucket(
+        name="test-bucket",
+        account_id="test-account",
+        access_key_id="test-key",
+        secret_access_key="test-secret",
+    )
+    uploaded = datetime(2025, 1, 1, 12, 0, 5, tzinfo=timezone.utc)
+    not_modified = ClientError(
+        {"Error": {"Code": "304"}, "ResponseMetadata": {"HTTPStatusCode": 304}},
+        "GetObject",
+    )
+    mock_client = AsyncMock()
+    mock_client.get_object = AsyncMock(
+        side_effect=[
+            {
+                "Body": _ChunkedBody(payload),
+                "LastModified": uploaded,
+                "ContentLength": len(payload),
+                "ETag": '"abc"',
+            },
+            not_modified,
+            not_modified,
+        ]
+    )
+    comms_instance._get_s3_client = AsyncMock(return_value=mock_client)
+    comms_instance.config.device = "cpu"
+
+    first = await comms_instance.s3_get_object(key="gradient-1-0-v0.pt", bucket=bucket)
+    second = await comms_instance.s3_get_object(key="gradient-1-0-v0.pt", bucket=bucket)
+    # Time bounds are applied to the cached Last-Modified
+    late = await comms_instance.s3_get_object(
+        key="gradient-1-0-v0.pt",
+        bucket=bucket,
+        time_max=uploaded - timedelta(seconds=1),
+    )
+
+    assert first["global_step"] == second["global_step"] == 7
+    assert torch.equal(second["state_dict"]["x"], torch.ones(4))
+    assert late == {"__status": "TOO_LATE"}
+    kwargs = mock_client.get_object.call_args.kwargs
+    assert kwargs["IfNoneMatch"] == '"abc"' and "IfUnmodifiedSince" not in kwargs
+    assert comms_instance.object_cache.stats()["hits"] == 2
+    assert comms_instance.object_cache.stats()["misses"] == 1
+
+
+async def test_s3_get_object_aborts_on_late_header(comms_instance):
+    """If the endpoint ignores the conditions, the body is closed unread."""
+    bucket = Bucket(
+        name="test-bucket",
+        account_id="test-account",
+        access_key_id="test-key",
+        secret_access_key="test-secret",
+    )
+    now = datetime.now(timezone.utc)
+    body = _ChunkedBody(b"x" * 100)
+    mock_client = AsyncMock()
+    mock_client.get_object = AsyncMock(
+        return_value={
+            "Body": body,
+            "LastModified": now + timedelta(minutes=1),
+            "ContentLength": 100,
+        }
+    )
+    comms_instance._get_s3_client = AsyncMock(return_value=mock_client)
+
+    result = await comms_instance.s3_get_object(
+        key="gradient-1-0-v0.pt", bucket=bucket, time_max=now
+    )
+
+    assert result == {"__status": "TOO_LATE"}
+    assert body.closed and body.pos == 0
+
+
+async def test_s3_get_object_range_into_buffer(comms_instance):
+    """Ranged reads fill the caller's buffer slice in place."""
+    data = os.urandom(1000)
+    bucket = Bucket(
+        name="test-bucket",
+        account_id="test-account",
+        access_key_id="test-key",
+        secret_access_key="test-secret",
+    )
+
+    async def mock_get_object(**kwargs):
+        start, end = map(int, kwargs["Range"].replace("bytes=", "").split("-"))
+        return {"Body": _ChunkedBody(data[start : end + 1])}
+
+    mock_client = AsyncMock()
+    mock_client.get_object = AsyncMock(side_effect=mock_get_object)
+    comms_instance._get_s3_client = AsyncMock(return_value=mock_client)
+
+    buffer = bytearray(len(data))
+    view = memoryview(buffer)
+    with patch("tplr.comms.STREAM_READ_SIZE", 128):
+        for start in range(0, len(data), 300):
+            end = min(start + 299, len(data) - 1)
+            out = await comms_instance.s3_get_object_range(
+                bucket, "key", start, end, out=view[start : end + 1]
+            )
+            assert out is not None
+
+    assert bytes(buffer) == data
+
+
 # Test Checkpoint Operations
 
 
@@ -1012,6 +1496,166 @@ async def test_gather_timeout(comms_instance):
     assert result is None
 
 
+async def test_gather_streams_peers_as_they_complete(comms_instance):
+    """Fast peers reach on_peer before a straggler finishes downloading."""
+    # Index count the real gather validation expects from these peers
+    comms_instance.hparams.topk_compression = 2
+    straggler_done = asyncio.Event()
+
+    async def get_with_retry(uid, **kwargs):
+        if uid == 1:
+            await asyncio.sleep(0.2)
+            straggler_done.set()
+        return (
+            {
+                "0.weightidxs": torch.tensor([0, 1]),
+                "0.weightvals": torch.tensor([0.1 * uid, 0.2]),
+            },
+            uid,
+        )
+
+    comms_instance.get_with_retry = get_with_retry
+    seen = []
+
+    async def on_peer(peer):
+        seen.append((peer.uid, straggler_done.is_set()))
+
+    result = await comms_instance.gather(
+        my_uid=0,
+        uids=[1, 2, 3],
+        window=1,
+        key="gradient",
+        timeout=5,
+        device="cpu",
+        totalks={"0.weight": 10},
+        on_peer=on_peer,
+    )
+
+    assert sorted(seen[:2]) == [(2, False), (3, False)]
+    assert seen[2] == (1, True)
+    # Results keep the requested uid order
+    assert result.uids == [1, 2, 3]
+    assert result.global_steps == [1, 2, 3]
+    assert torch.allclose(
+        result.state_dict.__dict__["0.weightvals"][0][0], torch.tensor(0.1)
+    )
+
+
+async def test_gather_stream_reports_skipped_peers(comms_instance):
+    """gather_stream yields an empty entry for every peer that is skipped."""
+    # Index count the real gather validation expects from these peers
+    comms_instance.hparams.topk_compression = 1
+    responses = {
+        1: (
+            {"0.weightidxs": torch.tensor([0]), "0.weightvals": torch.tensor([1.0])},
+            5,
+        ),
+        2: None,
+        3: (
+            {
+                "0.weightidxs": torch.tensor([0]),
+                "0.weightvals": torch.tensor([float("nan")]),
+            },
+            5,
+        ),
+    }
+    comms_instance.get_with_retry = AsyncMock(
+        side_effect=lambda uid, **kwargs: responses[uid]
+    )
+
+    peers = {
+        peer.uid: peer
+        async for peer in comms_instance.gather_stream(
+            my_uid=0,
+            uids=[1, 2, 3],
+            window=1,
+            key="gradient",
+            timeout=5,
+            device="cpu",
+            totalks={"0.weight": 10},
+        )
+    }
+
+    assert peers[1].state_dict is not None and peers[1].global_step == 5
+    assert peers[1].download_bytes == 8 + 4
+    assert peers[2].state_dict is None
+    assert peers[3].state_dict is None
+
+
+async def test_gather_folds_peers_into_accumulator(comms_instance):
+    """With an accumulator, gather keeps a running mean instead of peer lists."""
+    # Index count the real gather validation expects from these peers
+    comms_instance.hparams.topk_compression = 2
+    responses = {
+        1: ({"wvals": torch.tensor([3.0, 4.0]), "widxs": torch.tensor([0, 1])}, 1),
+        2: ({"wvals": torch.tensor([1.0, 0.0]), "widxs": torch.tensor([1, 2])}, 2),
+    }
+    comms_instance.get_with_retry = AsyncMock(
+        side_effect=lambda uid, **kwargs: responses[uid]
+    )
+    accumulator = GradientAccumulator(CompressDCT(), {"w": (3,)}, {"w": 3}, "cpu")
+
+    result = await comms_instance.gather(
+        my_uid=0,
+        uids=[1, 2],
+        window=1,
+        key="gradient",
+        timeout=5,
+        device="cpu",
+        totalks={"w": 3},
+        accumulator=accumulator,
+    )
+
+    assert result.uids == [1, 2]
+    assert result.accumulator is accumulator
+    assert not hasattr(result.state_dict, "wvals")
+    # Per-peer L2-normalised values, averaged per index
+    torch.testing.assert_close(
+        accumulator.result("w"), torch.tensor([0.6, (0.8 + 1.0) / 2, 0.0])
+    )
+
+
+async def test_gather_skips_peers_that_fail_processing(comms_instance):
+    """A peer failing on_peer or accumulator.add does not end the gather."""
+    comms_instance.hparams.topk_compression = 2
+    good = ({"wvals": torch.tensor([3.0, 4.0]), "widxs": torch.tensor([0, 1])}, 1)
+    # Passes gather's checks but not the accumulator's shape check
+    misshapen = (
+        {"wvals": torch.tensor([[1.0, 0.0]]), "widxs": torch.tensor([1, 2])},
+        2,
+    )
+    responses = {1: good, 2: misshapen, 3: good, 4: good}
+
+    async def get_with_retry(uid, **kwargs):
+        # Peer 1 finishes last, so it is processed after both failures
+        await asyncio.sleep(0.05 if uid == 1 else 0)
+        return responses[uid]
+
+    comms_instance.get_with_retry = get_with_retry
+    accumulator = GradientAccumulator(CompressDCT(), {"w": (3,)}, {"w": 3}, "cpu")
+
+    def on_peer(peer):
+        if peer.uid == 3:
+            raise RuntimeError("boom")
+
+    result = await comms_instance.gather(
+        my_uid=0,
+        uids=[1, 2, 3, 4],
+        window=1,
+        key="gradient",
+        timeout=5,
+        device="cpu",
+        totalks={"w": 3},
+        on_peer=on_peer,
+        accumulator=accumulator,
+    )
+
+    assert result.uids == [1, 4]
+    assert result.skipped_uids == [2, 3]
+    assert len(accumulator) == 2
+    torch.testing.assert_close(accumulator.result("w"), torch.tensor([0.6, 0.8, 0.0]))
+
+
 # Test Start Window Operations
 async def test_get_start_window(comms_instance):
     """Test fetching start window"""
@@ -1410,10 +2054,8 @@ def _get_smaller_split(n, close_to):
 
 @pytest.mark.asyncio
 async def test_valid_response_handling(comms_instance):
-    # Patch out the compressed indices check
-    comms_instance.check_compressed_indices = (
-        lambda param_name, idxs, totalk, allowed_topk=None: None
-    )
+    # Index count the real gather validation expects from these peers
+    comms_instance.hparams.topk_compression = 2
 
     # Patch get_with_retry to simulate three valid peer responses.
     comms_instance.get_with_retry = AsyncMock()
@@ -1531,6 +2173,7 @@ async def test_missing_idxs_key(comms_instance, model):
         return None
 
     comms.check_compressed_indices = patched_check
+    comms.hparams.topk_compression = 2
 
     # Call gather() with our simulated responses.
     result = await comms.gather(
@@ -1639,10 +2282,8 @@ async def test_missing_vals_key(comms_instance, model):
         return None
 
     comms.get_with_retry = AsyncMock(side_effect=mock_get_with_retry)
-    # Patch check_compressed_indices as a no-op.
-    comms.check_compressed_indices = (
-        lambda param_name, data, totalk, allowed_topk=None: None
-    )
+    # Index count the real gather validation expects from these peers
+    comms.hparams.topk_compression = 2
 
     result = await comms.gather(
         my_uid="dummy_uid",
@@ -1696,10 +2337,8 @@ async def test_empty_or_none_state_dict(comms_instance, model):
 
     xshapes, totalks = create_xshapes_totalks(model)
 
-    # Patch check_compressed_indices to be a no-op so that valid responses won't be rejected.
-    comms.check_compressed_indices = (
-        lambda param_name, idxs, totalk, allowed_topk=None: None
-    )
+    # Index count the real gather validation expects from these peers
+    comms.hparams.topk_compression = 2
 
     # Define dummy UIDs.
     uids = ["uid1", "uid2", "uid3"]
@@ -1927,6 +2566,71 @@ def test_topk_auto_adjust_when_totalk_is_lower():
         dummy_comms.check_compressed_indices("param", invalid_list, totalk)
 
 
+def test_check_compressed_batch_mask_and_first_offender():
+    """
+    One call validates several peers: bounds, lengths and NaN/Inf values,
+    reporting the first offending parameter of each failing peer.
+    """
+    dummy_comms = DummyComms()
+    totalks = {"a.": 10, "b.": 10}
+
+    def peer(a_idxs, b_vals):
+        return {
+            "a.idxs": torch.tensor(a_idxs),
+            "a.vals": torch.tensor([0.1, 0.2, 0.3]),
+            "b.idxs": torch.tensor([[0, 1, 2], [3, 4, 5]]),
+            "b.vals": torch.tensor(b_vals),
+        }
+
+    state_dicts = [
+        peer([1, 5, 9], [[0.1] * 3] * 2),  # valid
+        peer([1, 5, 10], [[0.1] * 3] * 2),  # index out of bounds
+        peer([1, 5, 9], [[0.1, float("inf"), 0.1]] * 2),  # Inf value
+        peer([1, 5], [[float("nan")] * 3] * 2),  # too few indices, then NaN
+    ]
+
+    mask, first_bad = dummy_comms.check_compressed_batch(state_dicts, totalks)
+
+    assert mask == [True, False, False, False]
+    assert first_bad[0] is None
+    assert first_bad[1][0] == "a.idxs" and "out of bounds" in first_bad[1][1]
+    assert first_bad[2] == ("b.vals", "NaN/Inf in b.vals")
+    assert first_bad[3][0] == "a.idxs" and "Invalid number" in first_bad[3][1]
+
+
+def test_check_compressed_batch_single_sync():
+    """All device-side flags are read back with one host transfer."""
+    dummy_comms = DummyComms()
+    state_dicts = [
+        {"a.idxs": torch.tensor([0, 1, 2]), "a.vals": torch.ones(3)} for _ in range(4)
+    ]
+
+    # Plain wrappers: autospec cannot bind the C-level tensor methods
+    calls = {"tolist": 0, "item": 0}
+    orig_tolist, orig_item = torch.Tensor.tolist, torch.Tensor.item
+
+    def tolist(self):
+        calls["tolist"] += 1
+        return orig_tolist(self)
+
+    def item(self):
+        calls["item"] += 1
+        return orig_item(self)
+
+    with (
+        patch.object(torch.Tensor, "tolist", tolist),
+        patch.object(torch.Tensor, "item", item),
+    ):
+        mask, _ = dummy_comms.check_compressed_batch(state_dicts, {"a.": 10})
+
+    assert mask == [True] * 4
+    assert calls == {"tolist": 1, "item": 0}
+
+    # Missing totalk is caught on the host
+    mask, first_bad = dummy_comms.check_compressed_batch(state_dicts[:1], {})
+    assert mask == [False] and first_bad[0] == ("a.idxs", "missing totalk")
+
+
 # Tests for `weighted_random_sample_no_replacement`
 async def test_empty_candidates(comms_instance):
     """
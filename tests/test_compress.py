@@ -0,0 +1,235 @@
+import pytest
+import torch
+
+from tplr.compress import CompressDCT, GradientAccumulator, TransformDCT
+
+
+class MixedShapesModel(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.a = torch.nn.Parameter(torch.randn(128, 64))
+        self.b = torch.nn.Parameter(torch.randn(64, 128))
+        self.c = torch.nn.Parameter(torch.randn(128, 64))
+        self.d = torch.nn.Parameter(torch.randn(96, 40))
+        self.bias = torch.nn.Parameter(torch.randn(64))
+        self.odd_bias = torch.nn.Parameter(torch.randn(40))
+
+
+@pytest.fixture
+def model():
+    torch.manual_seed(0)
+    return MixedShapesModel()
+
+
+@pytest.fixture
+def transformer(model):
+    return TransformDCT(model, target_chunk=32)
+
+
+def test_encode_batch_matches_encode(model, transformer):
+    params = [p.data for p in model.parameters()]
+    batched = transformer.encode_batch(params)
+
+    assert len(batched) == len(params)
+    for p, enc in zip(params, batched):
+        expected = transformer.encode(p)
+        assert enc.shape == expected.shape
+        torch.testing.assert_close(enc, expected, rtol=1e-5, atol=1e-5)
+
+
+def test_decode_batch_matches_decode(model, transformer):
+    encoded = [transformer.encode(p.data) for p in model.parameters()]
+    batched = transformer.decode_batch(encoded)
+
+    for enc, dec in zip(encoded, batched):
+        expected = transformer.decode(enc)
+        assert dec.shape == expected.shape
+        torch.testing.assert_close(dec, expected, rtol=1e-5, atol=1e-5)
+
+
+def test_batch_roundtrip(model, transformer):
+    params = [p.data for p in model.parameters()]
+    decoded = transformer.decode_batch(transformer.encode_batch(params))
+
+    for p, dec in zip(params, decoded):
+        torch.testing.assert_close(dec, p, rtol=1e-4, atol=1e-4)
+
+
+def test_batch_empty_input(transformer):
+    assert transformer.encode_batch([]) == []
+    assert transformer.decode_batch([]) == []
+
+
+@pytest.mark.parametrize("max_numel", [1, 128 * 64, 10**9])
+def test_encode_decode_iter_stream_in_batches(model, transformer, max_numel):
+    named = [(n, p.data) for n, p in model.named_parameters()]
+    calls = []
+    encode_batch = transformer.encode_batch
+
+    def counting_encode_batch(xs):
+        calls.append(len(xs))
+        return encode_batch(xs)
+
+    transformer.encode_batch = counting_encode_batch
+    encoded = list(transformer.encode_iter(named, max_numel=max_numel))
+
+    assert [n for n, _ in encoded] == [n for n, _ in named]
+    assert sum(calls) == len(named)
+    # Each batch closes as soon as it reaches the budget
+    assert len(calls) == {1: len(named), 128 * 64: 4, 10**9: 1}[max_numel]
+    for (_, p), (_, enc) in zip(named, encoded):
+        torch.testing.assert_close(enc, transformer.encode(p), rtol=1e-5, atol=1e-5)
+
+    decoded = transformer.decode_iter(encoded, max_numel=max_numel)
+    for (_, p), (_, dec) in zip(named, decoded):
+        torch.testing.assert_close(dec, p, rtol=1e-4, atol=1e-4)
+
+
+def _dense_compress_and_residual(compressor, transformer, x, topk):
+    """Reference path as used by prepare_gradient_dict."""
+    encoded = transformer.encode(x)
+    out = compressor.compress(encoded, topk)
+    idxs, vals, xshape, totalk = out[:4]
+    quant_params = out[4] if len(out) == 5 else None
+    transmitted = transformer.decode(
+        compressor.decompress(x, idxs, vals, xshape, totalk, quant_params)
+    )
+    return out, x - transmitted
+
+
+@pytest.mark.parametrize("use_quantization", [True, False])
+@pytest.mark.parametrize("block_size", [1, 4096, 10**9])
+@pytest.mark.parametrize("name", ["a", "b", "d", "bias", "odd_bias"])
+def test_compress_blockwise_matches_dense(
+    model, transformer, use_quantization, block_size, name
+):
+    compressor = CompressDCT(use_quantization=use_quantization)
+    x = getattr(model, name).data.clone()
+
+    expected, expected_residual = _dense_compress_and_residual(
+        compressor, transformer, x, topk=4
+    )
+    result = compressor.compress_blockwise(x, transformer, 4, block_size)
+
+    assert len(result) == len(expected)
+    assert torch.equal(result[0], expected[0])
+    if use_quantization:
+        assert torch.equal(result[1], expected[1])
+        torch.testing.assert_close(result[4][3], expected[4][3])
+    else:
+        torch.testing.assert_close(result[1], expected[1])
+    assert tuple(result[2]) == tuple(expected[2])
+    assert result[3] == expected[3]
+    torch.testing.assert_close(x, expected_residual, rtol=1e-5, atol=1e-5)
+
+
+def test_compress_blockwise_without_residual(model, transformer):
+    compressor = CompressDCT(use_quantization=True)
+    x = model.a.data.clone()
+    original = x.clone()
+
+    compressor.compress_blockwise(x, transformer, 4, 512, subtract_residual=False)
+
+    assert torch.equal(x, original)
+
+
+@pytest.mark.parametrize("use_quantization", [True, False])
+@pytest.mark.parametrize("block_size", [1, 10**9])
+@pytest.mark.parametrize("name", ["a", "b", "d", "bias", "odd_bias"])
+def test_subtract_transmitted_matches_dense(
+    model, transformer, use_quantization, block_size, name
+):
+    compressor = CompressDCT(use_quantization=use_quantization)
+    x = getattr(model, name).data.clone()
+
+    out, expected_residual = _dense_compress_and_residual(
+        compressor, transformer, x, topk=4
+    )
+    idxs, vals, xshape, _ = out[:4]
+    quant_params = out[4] if use_quantization else None
+
+    compressor.subtract_transmitted_(
+        x, transformer, idxs, vals, xshape, quant_params, block_size=block_size
+    )
+
+    torch.testing.assert_close(x, expected_residual, rtol=1e-5, atol=1e-5)
+
+
+@pytest.mark.parametrize("use_quantization", [True, False])
+@pytest.mark.parametrize("n_peers", [1, 3])
+@pytest.mark.parametrize("name", ["a", "d", "bias"])
+def test_batch_decompress_stacked_matches_loop(
+    model, transformer, use_quantization, n_peers, name
+):
+    compressor = CompressDCT(use_quantization=use_quantization)
+    p = getattr(model, name).data
+
+    idxs, vals, qparams = [], [], []
+    for _ in range(n_peers):
+        out = compressor.compress(transformer.encode(torch.randn_like(p)), 4)
+        idxs.append(out[0])
+        vals.append(out[1])
+        qparams.append(out[4] if use_quantization else None)
+    xshape, totalk = out[2], out[3]
+    qparams = qparams if use_quantization else None
+
+    expected = compressor._batch_decompress_loop(p, idxs, vals, xshape, totalk, qparams)
+    stacked = compressor.batch_decompress_stacked(
+        p, torch.stack(idxs), torch.stack(vals), xshape, totalk, qparams
+    )
+    via_lists = compressor.batch_decompress(p, idxs, vals, xshape, totalk, qparams)
+
+    torch.testing.assert_close(stacked, expected, rtol=1e-5, atol=1e-6)
+    torch.testing.assert_close(via_lists, expected, rtol=1e-5, atol=1e-6)
+
+
+def test_batch_decompress_single_values():
+    compressor = CompressDCT()
+    p = torch.zeros(8)
+    idxs = [torch.tensor([0, 3]), torch.tensor([3, 5])]
+    vals = [torch.tensor([3.0, 4.0]), torch.tensor([0.0, 0.0])]
+
+    expected = compressor._batch_decompress_loop(p, idxs, vals, (8,), 8)
+    result = compressor.batch_decompress(p, idxs, vals, (8,), 8)
+
+    torch.testing.assert_close(result, expected)
+
+
+@pytest.mark.parametrize("use_quantization", [True, False])
+def test_gradient_accumulator_matches_batch_decompress(
+    model, transformer, use_quantization
+):
+    compressor = CompressDCT(use_quantization=use_quantization)
+    xshapes, totalks, peers = {}, {}, []
+    for _ in range(4):
+        state_dict = {}
+        for name, p in model.named_parameters():
+            out = compressor.compress(transformer.encode(torch.randn_like(p)), 4)
+            state_dict[name + "idxs"], state_dict[name + "vals"] = out[0], out[1]
+            if use_quantization:
+                state_dict[name + "quant_params"] = out[4]
+            xshapes[name], totalks[name] = out[2], out[3]
+        peers.append(state_dict)
+
+    accumulator = GradientAccumulator(compressor, xshapes, totalks, "cpu")
+    for state_dict in peers:
+        accumulator.add(state_dict)
+
+    assert len(accumulator) == 4
+    for name, p in model.named_parameters():
+        expected = compressor.batch_decompress(
+            p.data,
+            [sd[name + "idxs"] for sd in peers],
+            [sd[name + "vals"] for sd in peers],
+            xshapes[name],
+            totalks[name],
+            [sd[name + "quant_params"] for sd in peers] if use_quantization else None,
+        )
+        torch.testing.assert_close(accumulator.result(name), expected)
+
+
+def test_gradient_accumulator_missing_param():
+    accumulator = GradientAccumulator(CompressDCT(), {"w": (8,)}, {"w": 8}, "cpu")
+    accumulator.add({"other": torch.ones(1)})
+
+    assert accumulator.result("w") is None
@@ -0,0 +1,105 @@
+import asyncio
+
+import torch
+
+from tplr.eval_data import EvalDataService, sample_batch_indices, sample_batches
+
+
+def _loader(n_batches, batch_size=2, seq_len=4, offset=0):
+    return [
+        torch.full((batch_size, seq_len), offset + i, dtype=torch.long)
+        for i in range(n_batches)
+    ]
+
+
+def test_sample_batch_indices():
+    indices = sample_batch_indices(10, 0.6)
+    assert len(indices) == 6
+    assert indices == sorted(set(indices))
+    assert all(0 <= i < 10 for i in indices)
+    # At least one batch, never more than there are
+    assert len(sample_batch_indices(3, 0.01)) == 1
+    assert len(sample_batch_indices(3, 2.0)) == 3
+    assert sample_batch_indices(0, 0.6) == []
+
+
+def test_sample_batches_keeps_only_sampled():
+    batches, total = sample_batches(_loader(10), 0.5)
+    assert total == 10
+    assert batches.shape == (5, 2, 4)
+    assert batches.dtype == torch.long
+    # Each sampled batch is one of the loader's, in order
+    values = batches[:, 0, 0].tolist()
+    assert values == sorted(set(values))
+
+    assert sample_batches([], 0.5) is None
+
+
+async def test_eval_data_service_loads_each_seed_once():
+    calls = []
+
+    async def load(seed):
+        calls.append(seed)
+        await asyncio.sleep(0.01)
+        if seed == 3:
+            return None
+        return {
+            "loader": _loader(4, offset=seed * 10),
+            "pages": [("cfg", seed, "train")],
+        }
+
+    service = EvalDataService(load, sample_rate=1.0, max_concurrent=2, pin_memory=False)
+    service.start(window=5, seeds=[1000, 1, 2, 3])
+
+    random_data = await service.get(1000)
+    # The random batches are shared: the same tensor for every caller
+    assert (await service.get(1000)).batches is random_data.batches
+    assert len(random_data) == 4 and random_data.total == 4
+
+    own = await service.get(1)
+    assert own.pages == [("cfg", 1, "train")]
+    assert own.batches[0, 0, 0].item() == 10
+    assert await service.get(3) is None
+
+    # Released seeds are loaded again on demand
+    service.release(1)
+    assert (await service.get(1)).batches[0, 0, 0].item() == 10
+    assert sorted(calls) == [1, 1, 2, 3, 1000]
+
+    service.stop()
+    assert service.window is None
+
+
+async def test_eval_data_service_bounds_concurrent_loads():
+    running = 0
+    peak = 0
+
+    async def load(seed):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {"loader": _loader(2), "pages": []}
+
+    service = EvalDataService(load, sample_rate=1.0, max_concurrent=2, pin_memory=False)
+    service.start(window=5, seeds=list(range(6)))
+    results = await asyncio.gather(*(service.get(seed) for seed in range(6)))
+    assert all(result is not None for result in results)
+    assert peak == 2
+
+
+async def test_eval_data_service_stop_cancels_loads():
+    started = asyncio.Event()
+
+    async def load(seed):
+        started.set()
+        await asyncio.sleep(10)
+
+    service = EvalDataService(load, sample_rate=1.0, pin_memory=False)
+    service.start(window=5, seeds=[1])
+    await started.wait()
+    task = service._tasks[1]
+    service.stop()
+    await asyncio.sleep(0)
+    assert task.cancelled()
@@ -0,0 +1,104 @@
+import os
+import threading
+from datetime import datetime, timezone
+
+from tplr.object_cache import ObjectCache
+from tplr.schemas import Bucket
+
+UPLOADED = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _bucket(name="peer-bucket"):
+    return Bucket(
+        name=name,
+        account_id="peer-account",
+        access_key_id="key",
+        secret_access_key="secret",
+    )
+
+
+async def test_memory_tier_evicts_least_recently_used():
+    cache = ObjectCache(max_memory_bytes=8)
+    bucket = _bucket()
+    await cache.put(bucket, "a", '"1"', UPLOADED, b"aaaa")
+    await cache.put(bucket, "b", '"1"', UPLOADED, b"bbbb")
+    assert (await cache.lookup(bucket, "a")).data == b"aaaa"  # a is now most recent
+
+    await cache.put(bucket, "c", '"1"', UPLOADED, b"cccc")
+
+    assert await cache.lookup(bucket, "b") is None
+    assert await cache.lookup(bucket, "a") is not None
+    assert cache.memory_bytes == 8
+    # Too big for the budget: not cached at all
+    await cache.put(bucket, "d", '"1"', UPLOADED, b"d" * 9)
+    assert await cache.lookup(bucket, "d") is None
+
+
+async def test_new_etag_replaces_old_copy():
+    cache = ObjectCache(max_memory_bytes=100)
+    bucket = _bucket()
+    await cache.put(bucket, "a", '"1"', UPLOADED, b"old")
+    await cache.put(bucket, "a", '"2"', UPLOADED, b"newer")
+
+    cached = await cache.lookup(bucket, "a")
+    assert (cached.etag, cached.data) == ('"2"', b"newer")
+    assert cache.memory_bytes == 5
+    # Same key in another bucket is a separate entry
+    assert await cache.lookup(_bucket("other"), "a") is None
+
+
+async def test_put_keeps_a_read_only_view():
+    cache = ObjectCache(max_memory_bytes=100)
+    buffer = bytearray(b"payload")
+    await cache.put(_bucket(), "a", '"1"', UPLOADED, buffer)
+
+    data = (await cache.lookup(_bucket(), "a")).data
+    assert data.readonly and data.obj is buffer
+    assert data == b"payload"
+
+
+async def test_disk_tier_spills_and_promotes(tmp_path):
+    disk_dir = str(tmp_path / "objects")
+    cache = ObjectCache(max_memory_bytes=4, disk_dir=disk_dir, max_disk_bytes=8)
+    bucket = _bucket()
+    for name in "abc":
+        await cache.put(bucket, name, '"1"', UPLOADED, name.encode() * 4)
+
+    # c in memory, a and b spilled to disk
+    assert cache.memory_bytes == 4 and cache.disk_bytes == 8
+    assert len(os.listdir(disk_dir)) == 2
+
+    cached = await cache.lookup(bucket, "a")
+    assert cached.data == b"aaaa" and cached.last_modified == UPLOADED
+    # a promoted back to memory, c demoted to disk
+    assert (await cache.lookup(bucket, "c")).data == b"cccc"
+    assert cache.memory_bytes == 4 and cache.disk_bytes <= 8
+
+    await cache.put(bucket, "d", '"1"', UPLOADED, b"dddd")
+    await cache.put(bucket, "e", '"1"', UPLOADED, b"eeee")
+    assert cache.disk_bytes <= 8
+    assert len(os.listdir(disk_dir)) == len(cache._disk)
+
+
+async def test_disk_io_runs_off_the_event_loop(tmp_path, monkeypatch):
+    cache = ObjectCache(
+        max_memory_bytes=4, disk_dir=str(tmp_path / "objects"), max_disk_bytes=8
+    )
+    bucket = _bucket()
+    loop_thread = threading.get_ident()
+    threads = []
+    for name in ("_write", "_take"):
+        original = getattr(ObjectCache, name)
+
+        def spy(path, *args, _original=original):
+            threads.append(threading.get_ident())
+            return _original(path, *args)
+
+        monkeypatch.setattr(ObjectCache, name, staticmethod(spy))
+
+    await cache.put(bucket, "a", '"1"', UPLOADED, b"aaaa")
+    await cache.put(bucket, "b", '"1"', UPLOADED, b"bbbb")  # spills a
+    assert (await cache.lookup(bucket, "a")).data == b"aaaa"  # reads a back
+
+    assert len(threads) == 3  # write a, read a, write b
+    assert loop_thread not in threads
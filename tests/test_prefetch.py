@@ -0,0 +1,207 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import torch
+
+from tplr.prefetch import WindowPrefetcher, upload_status
+from tplr.schemas import Bucket
+
+UPLOADED = datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def _bucket(uid):
+    return Bucket(
+        name=f"bucket-{uid}",
+        account_id="account",
+        access_key_id="key",
+        secret_access_key="secret",
+    )
+
+
+def _prepare(comms, landed):
+    """Peers 1-3 committed; ``landed`` uids have a gradient for window 5."""
+    comms.commitments = {uid: _bucket(uid) for uid in (1, 2, 3)}
+    comms.current_window = 6
+    comms.prefetcher.poll_interval = 0.01
+
+    async def refresh(bucket):
+        uid = int(bucket.name.split("-")[1])
+        entries = {(5, uid): UPLOADED.timestamp()} if uid in landed else {}
+        key = comms.activity_index.bucket_key(bucket)
+        comms.activity_index._entries[key] = entries
+        comms.activity_index._refreshed_at[key] = 0.0
+        return True
+
+    async def s3_get_object(key, bucket, meta=None, **kwargs):
+        if meta is not None:
+            meta["LastModified"] = UPLOADED
+        uid = int(bucket.name.split("-")[1])
+        return {"state_dict": {"w": torch.full((4,), float(uid))}, "global_step": uid}
+
+    comms._refresh_activity = AsyncMock(side_effect=refresh)
+    comms.s3_get_object = AsyncMock(side_effect=s3_get_object)
+
+
+def test_upload_status():
+    assert upload_status(UPLOADED) is None
+    assert upload_status(UPLOADED, time_min=UPLOADED + timedelta(seconds=1)) == (
+        "TOO_EARLY"
+    )
+    assert upload_status(UPLOADED, time_max=UPLOADED - timedelta(seconds=1)) == (
+        "TOO_LATE"
+    )
+    # Naive bounds are treated as UTC
+    assert upload_status(UPLOADED, time_min=UPLOADED.replace(tzinfo=None)) is None
+
+
+async def test_get_serves_prefetched_gradients(comms_instance):
+    _prepare(comms_instance, landed={1, 2})
+    comms_instance.start_prefetch(5, [1, 2, 3])
+    await asyncio.wait_for(comms_instance.prefetcher._task, timeout=1)
+
+    assert comms_instance.s3_get_object.await_count == 2
+    assert comms_instance.prefetcher.nbytes == 2 * 4 * 4
+
+    state_dict, global_step = await comms_instance.get(
+        uid=1, window=5, key="gradient", local=False
+    )
+    assert global_step == 1 and torch.equal(state_dict["w"], torch.ones(4))
+    assert comms_instance.s3_get_object.await_count == 2  # no new download
+
+    # Entries are handed out once; later reads go back to the bucket
+    await comms_instance.get(uid=1, window=5, key="gradient", local=False)
+    assert comms_instance.s3_get_object.await_count == 3
+    assert comms_instance.prefetcher.hits == 1
+
+
+async def test_prefetched_gradients_are_decoded_on_cpu(comms_instance):
+    _prepare(comms_instance, landed={1})
+    comms_instance.config.device = "meta"
+    comms_instance.start_prefetch(5, [1])
+    await asyncio.wait_for(comms_instance.prefetcher._task, timeout=1)
+
+    assert comms_instance.s3_get_object.await_args.kwargs["map_location"] == "cpu"
+    _, cached, _ = comms_instance.prefetcher._cache[(5, 1, "gradient")]
+    assert cached["state_dict"]["w"].device.type == "cpu"
+
+    # Moved to the configured device when handed out
+    state_dict, _ = await comms_instance.get(
+        uid=1, window=5, key="gradient", local=False
+    )
+    assert state_dict["w"].device.type == "meta"
+
+
+async def test_prefetched_gradients_keep_time_bounds(comms_instance):
+    _prepare(comms_instance, landed={1, 2})
+    comms_instance.start_prefetch(5, [1, 2])
+    await asyncio.wait_for(comms_instance.prefetcher._task, timeout=1)
+
+    too_late = await comms_instance.get(
+        uid=1,
+        window=5,
+        key="gradient",
+        local=False,
+        time_max=UPLOADED - timedelta(seconds=1),
+    )
+    too_early = await comms_instance.get(
+        uid=2,
+        window=5,
+        key="gradient",
+        local=False,
+        time_min=UPLOADED + timedelta(seconds=1),
+    )
+
+    assert too_late == {"__status": "TOO_LATE"}
+    assert too_early == {"__status": "TOO_EARLY"}
+
+
+async def test_prefetch_budget_evicts_oldest(comms_instance):
+    _prepare(comms_instance, landed={1, 2, 3})
+    comms_instance.prefetcher.max_bytes = 2 * 4 * 4
+    comms_instance.prefetcher.max_concurrent = 1
+    comms_instance.start_prefetch(5, [1, 2, 3])
+    await asyncio.wait_for(comms_instance.prefetcher._task, timeout=1)
+
+    assert comms_instance.prefetcher.nbytes <= 2 * 4 * 4
+    assert len(comms_instance.prefetcher._cache) == 2
+    assert (5, 3, "gradient") in comms_instance.prefetcher._cache
+
+
+async def test_prefetch_polls_until_gradients_land(comms_instance):
+    landed = set()
+    _prepare(comms_instance, landed=landed)
+    comms_instance.current_window = 5
+    comms_instance.start_prefetch(5, [1])
+
+    await asyncio.sleep(0.05)
+    assert comms_instance.s3_get_object.await_count == 0
+
+    landed.add(1)
+    await asyncio.wait_for(comms_instance.prefetcher._task, timeout=1)
+    assert comms_instance.s3_get_object.await_count == 1
+
+
+def _window_builder(delay=0.0, fail=()):
+    built = []
+
+    async def build(window):
+        built.append(window)
+        await asyncio.sleep(delay)
+        if window in fail:
+            raise RuntimeError("boom")
+        return f"data-{window}"
+
+    return build, built
+
+
+async def test_window_prefetcher_hit_and_miss():
+    build, built = _window_builder()
+    prefetcher = WindowPrefetcher(build)
+
+    # Nothing prefetched: built inline
+    assert await prefetcher.get(5) == "data-5"
+    prefetcher.start(6)
+    prefetcher.start(6)  # already running, not restarted
+    await asyncio.sleep(0.01)
+    assert await prefetcher.get(6) == "data-6"
+
+    assert built == [5, 6]
+    assert (prefetcher.hits, prefetcher.late, prefetcher.misses) == (1, 0, 1)
+    assert prefetcher.hit_rate() == 0.5
+
+
+async def test_window_prefetcher_awaits_a_prefetch_in_flight():
+    build, built = _window_builder(delay=0.05)
+    prefetcher = WindowPrefetcher(build)
+
+    prefetcher.start(6)
+    assert await prefetcher.get(6) == "data-6"
+    assert built == [6]
+    assert (prefetcher.hits, prefetcher.late, prefetcher.misses) == (0, 1, 0)
+
+
+async def test_window_prefetcher_cancels_stale_window():
+    build, built = _window_builder(delay=10)
+    prefetcher = WindowPrefetcher(build)
+
+    prefetcher.start(6)
+    await asyncio.sleep(0)
+    stale = prefetcher._task
+    # The chain skipped window 6
+    prefetcher.build, _ = _window_builder()
+    assert await prefetcher.get(7) == "data-7"
+    await asyncio.sleep(0)
+    assert stale.cancelled()
+    assert prefetcher.misses == 1
+
+
+async def test_window_prefetcher_rebuilds_after_failure():
+    build, built = _window_builder(fail={6})
+    prefetcher = WindowPrefetcher(build)
+
+    prefetcher.start(6)
+    await asyncio.sleep(0.01)
+    prefetcher.build, _ = _window_builder()
+    assert await prefetcher.get(6) == "data-6"
+    assert prefetcher.misses == 1
@@ -13,6 +13,7 @@ class DummyHparams:
         self.weight_decay = 0.1
         self.momentum_decay = 0.9
         self.topk_compression = 5
+        self.compression_block_size = None
 
 
 class DummyCompressor:
@@ -24,16 +25,17 @@ class DummyCompressor:
         dummy_quant_params = "dummy_quant_params"
         return dummy_idxs, dummy_vals, dummy_xshape, dummy_totalk, dummy_quant_params
 
-    def decompress(self, p, idxs, vals, xshape, totalk, quant_params):
-        return torch.tensor([0.5, 0.5])
+    def subtract_transmitted_(self, x, transformer, idxs, vals, xshape, quant_params):
+        return x.sub_(0.1)
 
 
 class DummyTransformer:
     def encode(self, tensor):
         return tensor
 
-    def decode(self, tensor):
-        return torch.tensor([0.1, 0.1])
+    def encode_iter(self, items):
+        for key, tensor in items:
+            yield key, self.encode(tensor)
 
 
 class DummyLogger:
@@ -205,11 +207,13 @@ def test_compressor_and_transformer_calls():
     """
     Test 5: Compressor and Transformer Calls
     ------------------------------------------
-    - Use dummy implementations that record the arguments passed to compressor.compress and transformer.decode.
+    - Use dummy implementations that record the arguments passed to compressor.compress
+      and compressor.subtract_transmitted_.
     - Verify:
          • compressor.compress is called with the result of transformer.encode(miner.momentum['weight'])
            and the correct value of hparams.topk_compression.
-         • transformer.decode is called with the result from compressor.decompress.
+         • compressor.subtract_transmitted_ is called with the momentum, the transformer
+           and the compressed payload, once past the early iterations.
     - Also, verify that the dummy return values are included in the output dictionaries.
     """
 
@@ -217,6 +221,7 @@ def test_compressor_and_transformer_calls():
     class DummyRecordingCompressor:
         def __init__(self):
             self.called_args = None
+            self.subtract_called_with = None
 
         def compress(self, encoded_tensor, topk):
             self.called_args = (encoded_tensor.clone(), topk)
@@ -233,42 +238,30 @@ def test_compressor_and_transformer_calls():
                 dummy_quant_params,
             )
 
-        def decompress(self, p, idxs, vals, xshape, totalk, quant_params):
-            return torch.tensor([0.2, 0.2])
-
-    class DummyRecordingTransformer:
-        def __init__(self):
-            self.decode_called_with = None
-
-        def encode(self, tensor):
-            return tensor
-
-        def decode(self, tensor):
-            self.decode_called_with = tensor.clone()
-            return torch.tensor([0.1, 0.1])
+        def subtract_transmitted_(
+            self, x, transformer, idxs, vals, xshape, quant_params
+        ):
+            self.subtract_called_with = (x, transformer, idxs, vals, xshape)
+            return x.sub_(0.002)
 
     miner = DummyMiner()
     miner.compressor = DummyRecordingCompressor()
-    miner.transformer = DummyRecordingTransformer()
+    # Past the early iterations, so the transmitted gradient is subtracted
+    miner.gradient_iteration_counter = 10
 
-    # Set initial momentum and gradient value for the single parameter "weight".
-    # Initial momentum is ignored on the first call.
     miner.momentum["weight"] = torch.tensor([1.0, 1.0])
     miner.model.weight.grad = torch.tensor([0.3, 0.4])
 
-    # Expected computation for the tensor passed to compressor.compress on the FIRST iteration:
-    # Momentum is set directly to: lr * p.grad
-    # lr = 0.01 (from DummyScheduler)
-    # p.grad = [0.3, 0.4]
-    # Expected tensor = 0.01 * [0.3, 0.4] = [0.003, 0.004]
+    # Expected computation for the tensor passed to compressor.compress:
+    # Momentum is decayed and the gradient added: momentum_decay * m + lr * p.grad
+    # momentum_decay = 0.9, lr = 0.01 (from DummyScheduler), p.grad = [0.3, 0.4]
+    # Expected tensor = [0.9, 0.9] + [0.003, 0.004] = [0.903, 0.904]
     # This is the tensor that transformer.encode receives (and passes through in this dummy)
     # and then compressor.compress receives.
-    expected_tensor_for_compression = torch.tensor([0.003, 0.004])
+    expected_tensor_for_compression = torch.tensor([0.903, 0.904])
 
     pages = [["doc_record"]]
     step_window = 7
-    # Call the helper so that compressor.compress and transformer.decode are invoked.
-    # This is the first call, miner.gradient_iteration_counter becomes 1.
     gradient, xshapes, totalks = prepare_gradient_dict(miner, pages, step_window)
 
     # Check that compressor.compress was called with the expected encoded tensor and topk.
@@ -279,25 +272,26 @@ def test_compressor_and_transformer_calls():
     recorded_tensor, recorded_topk = recorder_compressor.called_args
     torch.testing.assert_close(
         recorded_tensor,
-        expected_tensor_for_compression,  # Use the corrected expected value
-        msg="compressor.compress argument (encoded tensor) does not match expected value for the first iteration.",
+        expected_tensor_for_compression,
+        msg="compressor.compress argument (encoded tensor) does not match expected value.",
     )
     assert recorded_topk == miner.hparams.topk_compression, (
         "compressor.compress argument (topk) does not match hparams."
     )
 
-    # Check that transformer.decode was called with the result of compressor.decompress.
-    recorder_transformer = miner.transformer
-    # The dummy decompress returns [0.2, 0.2]
-    expected_tensor_for_decode = torch.tensor([0.2, 0.2])
-    assert recorder_transformer.decode_called_with is not None, (
-        "transformer.decode was not called."
+    # Check that the residual was updated in place from the compressed payload.
+    assert recorder_compressor.subtract_called_with is not None, (
+        "compressor.subtract_transmitted_ was not called."
     )
-    torch.testing.assert_close(
-        recorder_transformer.decode_called_with,
-        expected_tensor_for_decode,
-        msg="transformer.decode argument does not match the output of compressor.decompress.",
+    momentum, transformer, idxs, vals, xshape = recorder_compressor.subtract_called_with
+    assert momentum is miner.momentum["weight"]
+    assert transformer is miner.transformer
+    assert (idxs, vals, xshape) == (
+        "recorded_dummy_idxs",
+        "recorded_dummy_vals",
+        "recorded_dummy_xshape",
     )
+    torch.testing.assert_close(miner.momentum["weight"], torch.tensor([0.901, 0.902]))
 
     # Verify dummy return values are in the output dicts
     assert gradient["weightidxs"] == "recorded_dummy_idxs"
@@ -464,19 +458,116 @@ def test_propagation_of_transformer_failure():
     """
     Test 11: Propagation of Exceptions (Transformer Failure)
     ---------------------------------------------------------
-    - Force transformer.decode to throw an exception.
+    - Force transformer.encode to throw an exception.
     - Verify that prepare_gradient_dict propagates this exception as expected.
     """
     miner = DummyMiner()
 
-    # Override transformer.decode to throw an exception.
-    def failing_decode(tensor):
+    # Override transformer.encode to throw an exception.
+    def failing_encode(tensor):
         raise RuntimeError("Transformer error")
 
-    miner.transformer.decode = failing_decode
+    miner.transformer.encode = failing_encode
 
     pages = [["doc1", "page1"]]
     step_window = 5
 
     with pytest.raises(RuntimeError, match="Transformer error"):
         prepare_gradient_dict(miner, pages, step_window)
+
+
+def test_blockwise_compression_matches_dense_path():
+    """
+    Test 12: Block-wise Compression
+    -------------------------------
+    - Run prepare_gradient_dict twice on identical miners using the real DCT
+      transformer/compressor, once with compression_block_size set.
+    - Verify that the transmitted payload and the residual momentum match.
+    """
+    from tplr.compress import CompressDCT, TransformDCT
+
+    class DummyMatrixModel(torch.nn.Module):
+        def __init__(self):
+            super(DummyMatrixModel, self).__init__()
+            self.weight = torch.nn.Parameter(torch.randn(64, 32))
+            self.weight.grad = torch.randn(64, 32)
+
+    def make_miner(block_size):
+        torch.manual_seed(0)
+        miner = DummyMiner()
+        miner.model = DummyMatrixModel()
+        miner.momentum = {"weight": torch.randn(64, 32)}
+        miner.transformer = TransformDCT(miner.model, target_chunk=16)
+        miner.compressor = CompressDCT(use_quantization=True)
+        miner.hparams.compression_block_size = block_size
+        # Skip the early iterations, which do not subtract the residual
+        miner.gradient_iteration_counter = 10
+        return miner
+
+    dense_miner = make_miner(None)
+    block_miner = make_miner(16 * 32)
+
+    dense_grad, dense_xshapes, dense_totalks = prepare_gradient_dict(
+        dense_miner, [["doc1", "page1"]], 5
+    )
+    block_grad, block_xshapes, block_totalks = prepare_gradient_dict(
+        block_miner, [["doc1", "page1"]], 5
+    )
+
+    assert torch.equal(block_grad["weightidxs"], dense_grad["weightidxs"])
+    assert torch.equal(block_grad["weightvals"], dense_grad["weightvals"])
+    assert tuple(block_xshapes["weight"]) == tuple(dense_xshapes["weight"])
+    assert block_totalks["weight"] == dense_totalks["weight"]
+    torch.testing.assert_close(
+        block_miner.momentum["weight"],
+        dense_miner.momentum["weight"],
+        rtol=1e-5,
+        atol=1e-5,
+    )
+
+
+def test_default_path_matches_dense_residual_update():
+    """
+    Test 13: Batched Encode and Sparse Residual
+    -------------------------------------------
+    - Run prepare_gradient_dict with the real DCT transformer/compressor on a
+      model with a matrix and a bias.
+    - Verify the payload and residual match the per-parameter reference:
+      compress(encode(m)) and m - decode(decompress(...)).
+    """
+    from tplr.compress import CompressDCT, TransformDCT
+
+    class DummyMatrixModel(torch.nn.Module):
+        def __init__(self):
+            super(DummyMatrixModel, self).__init__()
+            self.weight = torch.nn.Parameter(torch.randn(64, 32))
+            self.bias = torch.nn.Parameter(torch.randn(32))
+            self.weight.grad = torch.randn(64, 32)
+            self.bias.grad = torch.randn(32)
+
+    torch.manual_seed(0)
+    miner = DummyMiner()
+    miner.model = DummyMatrixModel()
+    miner.owned_params = {"weight", "bias"}
+    miner.momentum = {n: torch.randn_like(p) for n, p in miner.model.named_parameters()}
+    miner.transformer = TransformDCT(miner.model, target_chunk=16)
+    miner.compressor = CompressDCT(use_quantization=True)
+    miner.gradient_iteration_counter = 10
+
+    expected = {}
+    for n, p in miner.model.named_parameters():
+        momentum = miner.momentum[n] * 0.9 + p.grad * 0.01
+        idxs, vals, xshape, totalk, quant_params = miner.compressor.compress(
+            miner.transformer.encode(momentum), miner.hparams.topk_compression
+        )
+        transmitted = miner.transformer.decode(
+            miner.compressor.decompress(p, idxs, vals, xshape, totalk, quant_params)
+        )
+        expected[n] = (idxs, vals, momentum - transmitted)
+
+    gradient, _, _ = prepare_gradient_dict(miner, [["doc1", "page1"]], 5)
+
+    for n, (idxs, vals, residual) in expected.items():
+        assert torch.equal(gradient[n + "idxs"], idxs)
+        assert torch.equal(gradient[n + "vals"], vals)
+        torch.testing.assert_close(miner.momentum[n], residual, rtol=1e-5, atol=1e-5)
@@ -48,6 +48,7 @@ from tplr.logging import logger, debug, T
 from tplr.r2_dataset import R2DatasetLoader
 from tplr.hparams import load_hparams
 from tplr.shard_index import ShardIndex
+import numpy as np
 import torch
 import random
 from neurons.validator import retry_call
@@ -1702,7 +1703,7 @@ async def test_concurrent_parquet_read_threadsafe(monkeypatch):
     results = await asyncio.gather(*tasks)
 
     # Sanity: every call returned tokens
-    assert all(isinstance(tokens, list) and tokens for tokens in results)
+    assert all(isinstance(tokens, np.ndarray) and len(tokens) for tokens in results)
 
     # The file shouldn't have been reopened for every call (cache reuse works)
     assert mem_fs.open_calls < len(pages), (
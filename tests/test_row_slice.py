@@ -0,0 +1,56 @@
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from tplr.r2_dataset import R2DatasetLoader, _CountingReader
+
+ROWS = [f"row {i} " + "x" * (i % 37) for i in range(400)]
+
+
+def _parquet_file():
+    buffer = io.BytesIO()
+    pq.write_table(
+        pa.table({"text": ROWS, "id": list(range(len(ROWS)))}),
+        buffer,
+        row_group_size=200,
+        data_page_size=512,
+        compression="none",
+    )
+    reader = _CountingReader(io.BytesIO(buffer.getvalue()))
+    pf = pq.ParquetFile(reader, pre_buffer=False, buffer_size=1024)
+    return pf, reader
+
+
+def test_row_slice_matches_whole_group_slice():
+    pf, _ = _parquet_file()
+    for group_index in range(pf.num_row_groups):
+        whole = pf.read_row_group(group_index, columns=["text"])["text"].to_pylist()
+        # Slices at the start, in the middle, across the end and past the end
+        for start, num_rows in [(0, 10), (37, 50), (190, 25), (250, 10)]:
+            table = R2DatasetLoader._read_row_slice(pf, group_index, start, num_rows)
+            assert table.column_names == ["text"]
+            assert table["text"].to_pylist() == whole[start : start + num_rows]
+
+
+def test_row_slice_streams_only_the_start_of_the_column_chunk():
+    # Plain-encoded text in many small pages, as in the dataset shards; a
+    # dictionary page would have to be read whole before any row
+    rows = [f"row {i} " + "x" * (i % 97) for i in range(20000)]
+    buffer = io.BytesIO()
+    pq.write_table(
+        pa.table({"text": rows}),
+        buffer,
+        row_group_size=len(rows),
+        data_page_size=4096,
+        compression="none",
+        use_dictionary=False,
+    )
+    reader = _CountingReader(io.BytesIO(buffer.getvalue()))
+    pf = pq.ParquetFile(reader, pre_buffer=False, buffer_size=64 * 1024)
+    chunk_size = pf.metadata.row_group(0).column(0).total_compressed_size
+
+    before = reader.bytes_read
+    table = R2DatasetLoader._read_row_slice(pf, 0, 100, 10)
+    assert table["text"].to_pylist() == rows[100:110]
+    assert 0 < reader.bytes_read - before < chunk_size // 4
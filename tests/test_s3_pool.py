@@ -0,0 +1,85 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import botocore.config
+import pytest
+from botocore.exceptions import ClientError, ConnectionClosedError
+
+from tplr.s3_pool import S3ClientPool
+from tplr.schemas import Bucket
+
+
+@pytest.fixture
+def bucket():
+    return Bucket(
+        name="peer-bucket",
+        account_id="peer-account",
+        access_key_id="key",
+        secret_access_key="secret",
+    )
+
+
+@pytest.fixture
+def pool():
+    session = MagicMock()
+    session.create_client = MagicMock(
+        side_effect=lambda *args, **kwargs: MagicMock(
+            __aenter__=AsyncMock(return_value=MagicMock()),
+            __aexit__=AsyncMock(return_value=False),
+        )
+    )
+    return S3ClientPool(
+        session,
+        endpoint_url=lambda account_id: f"https://{account_id}.example.com",
+        region_name="enam",
+        config=botocore.config.Config(retries={"max_attempts": 2}),
+        max_connections_per_bucket=8,
+        failure_threshold=2,
+        reset_timeout=30.0,
+    )
+
+
+async def test_clients_are_reused(pool, bucket):
+    first = await pool.get(bucket)
+    second = await pool.get(bucket)
+
+    assert first is second
+    pool.session.create_client.assert_called_once()
+    config = pool.session.create_client.call_args.kwargs["config"]
+    assert config.max_pool_connections == 8
+    assert config.retries == {"max_attempts": 2}
+    assert config.connector_args["keepalive_timeout"] == 60.0
+
+
+async def test_purge_keeps_client_on_client_error(pool, bucket):
+    client = await pool.get(bucket)
+    not_found = ClientError({"Error": {"Code": "404"}}, "HeadObject")
+
+    await pool.purge(bucket, not_found)
+    assert await pool.get(bucket) is client
+
+    await pool.purge(bucket, ConnectionClosedError(endpoint_url="x"))
+    assert await pool.get(bucket) is not client
+
+
+def test_circuit_breaker(pool, bucket):
+    with patch("tplr.s3_pool.time.monotonic", return_value=100.0):
+        pool.record(bucket, 1.0, ok=False)
+        assert pool.allow(bucket)
+        pool.record(bucket, 1.0, ok=False)
+        assert not pool.allow(bucket)
+
+        stats = pool.stats()["peer-account/peer-bucket"]
+        assert stats["open"]
+        assert stats["errors"] == 2
+
+    # Half-open after the reset timeout; another failure re-opens for longer
+    with patch("tplr.s3_pool.time.monotonic", return_value=131.0):
+        assert pool.allow(bucket)
+        pool.record(bucket, 1.0, ok=False)
+    with patch("tplr.s3_pool.time.monotonic", return_value=181.0):
+        assert not pool.allow(bucket)
+
+    # A success closes the breaker again
+    pool.record(bucket, 0.5, ok=True)
+    assert pool.allow(bucket)
+    assert pool.stats()["peer-account/peer-bucket"]["consecutive_failures"] == 0
@@ -0,0 +1,127 @@
+import json
+import os
+from unittest.mock import AsyncMock
+
+import pytest
+import torch
+
+import tplr.comms as comms_module
+from tplr import __version__
+from tplr.checkpoint import (
+    TENSOR_REF,
+    checkpoint_stem,
+    load_sharded_checkpoint,
+    merge_checkpoint,
+    shard_name,
+    split_checkpoint,
+    stem_of,
+)
+
+
+class TwoLayer(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.layers = torch.nn.ModuleList(torch.nn.Linear(8, 8) for _ in range(2))
+
+
+def _checkpoint(model, optimizer):
+    return {
+        "model_state_dict": model.state_dict(),
+        "optimizer_state_dict": optimizer.state_dict(),
+        "scheduler_state_dict": {"last_epoch": 3, "_last_lr": [0.1]},
+        "momentum": {n: torch.ones_like(p) for n, p in model.named_parameters()},
+        "start_window": 5,
+        "current_window": 9,
+    }
+
+
+def test_split_groups_layers_and_round_trips():
+    model = TwoLayer()
+    checkpoint = _checkpoint(model, torch.optim.SGD(model.parameters(), lr=0.1))
+    layer_bytes = 8 * 8 * 4 + 8 * 4
+
+    skeleton, shards = split_checkpoint(checkpoint, max_shard_bytes=layer_bytes)
+
+    assert skeleton["model_state_dict"]["layers.0.weight"][0] == TENSOR_REF
+    assert skeleton["start_window"] == 5
+    # One shard per layer of the model, then one per layer of momentum
+    assert len(shards) == 4
+    assert all(len(shard) == 2 for shard in shards)
+
+    tensors = {name: t for shard in shards for name, t in shard.items()}
+    merged = merge_checkpoint(skeleton, tensors)
+    for name, tensor in checkpoint["model_state_dict"].items():
+        assert torch.equal(merged["model_state_dict"][name], tensor)
+    assert merged["scheduler_state_dict"] == checkpoint["scheduler_state_dict"]
+
+
+def test_stem_of_manifest_shard_and_legacy_keys():
+    stem = checkpoint_stem(12, 3, "0.3.10")
+    assert stem_of(f"{stem}.json") == stem
+    assert stem_of(f"{stem}/shard-00000.pt") == stem
+    assert stem_of(f"{stem}.pt") == stem
+
+
+@pytest.mark.asyncio
+async def test_local_sharded_checkpoint_save_and_load(
+    comms_instance, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(comms_module, "LOCAL_TMP_DIR", str(tmp_path))
+    comms_instance.checkpoint_shard_bytes = 1  # one layer per shard
+    model = TwoLayer()
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.1)
+    checkpoint = _checkpoint(model, optimizer)
+
+    await comms_instance._put_checkpoint(
+        checkpoint, uid=comms_instance.uid, window=9, local=True, remote=False
+    )
+
+    stem = checkpoint_stem(9, comms_instance.uid, __version__)
+    window_dir = tmp_path / str(comms_instance.uid) / "9"
+    manifest = json.loads((window_dir / f"{stem}.json").read_text())
+    assert len(manifest["shards"]) == 4
+    assert sorted(os.listdir(window_dir / stem)) == sorted(
+        ["meta.pt"] + [s["name"] for s in manifest["shards"]]
+    )
+
+    loaded, window = comms_instance._load_latest_local_checkpoint(__version__)
+    assert window == 9
+    fresh = TwoLayer()
+    fresh.load_state_dict(loaded["model_state_dict"])
+    for name, tensor in model.state_dict().items():
+        assert torch.equal(fresh.state_dict()[name], tensor)
+    assert loaded["current_window"] == 9
+    assert torch.equal(
+        loaded["momentum"]["layers.1.bias"], checkpoint["momentum"]["layers.1.bias"]
+    )
+    # Reading the shards back directly gives the same checkpoint
+    again = load_sharded_checkpoint(str(window_dir / stem), manifest)
+    assert again.keys() == loaded.keys()
+
+
+@pytest.mark.asyncio
+async def test_manifest_not_published_after_failed_shard_upload(comms_instance):
+    comms_instance.checkpoint_shard_bytes = 1
+    model = TwoLayer()
+    checkpoint = _checkpoint(model, torch.optim.SGD(model.parameters(), lr=0.1))
+    keys = []
+
+    async def put(key, file_path=None, data=None):
+        keys.append(key)
+        return not key.endswith(shard_name(1))
+
+    comms_instance.s3_put_object = put
+    await comms_instance._put_checkpoint(
+        checkpoint, uid=comms_instance.uid, window=9, local=False, remote=True
+    )
+
+    stem = checkpoint_stem(9, comms_instance.uid, __version__)
+    assert f"{stem}/{shard_name(1)}" in keys
+    assert f"{stem}.json" not in keys
+
+    keys.clear()
+    comms_instance.s3_put_object = AsyncMock(return_value=True)
+    await comms_instance._put_checkpoint(
+        checkpoint, uid=comms_instance.uid, window=9, local=False, remote=True
+    )
+    assert comms_instance.s3_put_object.await_args.args == (f"{stem}.json",)
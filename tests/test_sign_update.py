@@ -0,0 +1,51 @@
+import pytest
+import torch
+
+from tplr.neurons import (
+    apply_packed_sign_update_,
+    pack_binary_tensor,
+    sign_sgd_fusable,
+    unpack_binary_tensor,
+)
+
+
+def _reference(param, packed, lr, weight_decay):
+    """What the neurons did before: unpack, weight decay, SGD step."""
+    param = torch.nn.Parameter(param.clone())
+    optimizer = torch.optim.SGD([param], lr=lr)
+    with torch.no_grad():
+        param.mul_(1.0 - lr * weight_decay)
+    param.grad = unpack_binary_tensor(packed, param.shape)
+    optimizer.step()
+    return param.data
+
+
+@pytest.mark.parametrize("shape", [(64, 40), (8,), (3, 5, 16)])
+@pytest.mark.parametrize("weight_decay", [0.0, 0.1])
+@pytest.mark.parametrize("chunk_size", [1 << 24, 24])
+def test_fused_update_matches_sgd_step(shape, weight_decay, chunk_size):
+    torch.manual_seed(0)
+    param = torch.randn(shape)
+    packed = pack_binary_tensor(torch.randn(shape).sign(), "cpu")
+    lr = 3e-4
+
+    expected = _reference(param, packed, lr, weight_decay)
+    fused = param.clone()
+    apply_packed_sign_update_(fused, packed, lr, weight_decay, chunk_size=chunk_size)
+
+    assert torch.equal(fused, expected)
+
+
+def test_fused_update_rejects_short_packed_tensor():
+    with pytest.raises(ValueError):
+        apply_packed_sign_update_(
+            torch.zeros(16), torch.zeros(1, dtype=torch.uint8), 0.1
+        )
+
+
+def test_sign_sgd_fusable():
+    params = [torch.nn.Parameter(torch.zeros(2))]
+    assert sign_sgd_fusable(torch.optim.SGD(params, lr=0.1))
+    assert not sign_sgd_fusable(torch.optim.SGD(params, lr=0.1, momentum=0.9))
+    assert not sign_sgd_fusable(torch.optim.SGD(params, lr=0.1, weight_decay=0.1))
+    assert not sign_sgd_fusable(torch.optim.AdamW(params, lr=0.1))
@@ -0,0 +1,71 @@
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+from tplr.token_cache import TokenCache, tokenizer_fingerprint
+
+
+def _tokens(n, value=1):
+    return np.full(n, value, dtype=np.int32)
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = TokenCache(max_memory_bytes=8 * 4)
+    cache.put("a", _tokens(4))
+    cache.put("b", _tokens(4))
+    assert cache.get("a") is not None  # a is now most recent
+
+    cache.put("c", _tokens(4))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.memory_bytes == 32
+    assert cache.stats()["misses"] == 1
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    directory = str(tmp_path / "tokens")
+    cache = TokenCache(max_memory_bytes=0, directory=directory, max_disk_bytes=1024)
+    cache.put("page", np.arange(10, dtype=np.int32))
+
+    reopened = TokenCache(max_memory_bytes=0, directory=directory, max_disk_bytes=1024)
+    assert reopened.disk_bytes == cache.disk_bytes > 0
+    tokens = reopened.get("page")
+    assert isinstance(tokens, np.memmap)
+    assert tokens.tolist() == list(range(10))
+
+
+def test_disk_tier_drops_oldest_files(tmp_path):
+    directory = str(tmp_path / "tokens")
+    probe = TokenCache(max_memory_bytes=0, directory=directory, max_disk_bytes=10**6)
+    probe.put("probe", _tokens(16))
+    file_size = probe.disk_bytes
+    os.remove(os.path.join(directory, "probe.npy"))
+
+    cache = TokenCache(
+        max_memory_bytes=0, directory=directory, max_disk_bytes=2 * file_size
+    )
+    cache.put("a", _tokens(16))
+    cache.put("b", _tokens(16))
+    assert cache.get("a") is not None  # b is now least recent
+    cache.put("c", _tokens(16))
+
+    assert sorted(os.listdir(directory)) == ["a.npy", "c.npy"]
+    assert cache.disk_bytes == 2 * file_size
+
+
+def test_key_depends_on_tokenizer_and_sequence_length():
+    first = SimpleNamespace(name_or_path="tok-a", eos_token_id=2)
+    second = SimpleNamespace(name_or_path="tok-b", eos_token_id=2)
+    fingerprint = tokenizer_fingerprint(first)
+    assert fingerprint == tokenizer_fingerprint(first)
+    assert fingerprint != tokenizer_fingerprint(second)
+
+    keys = {
+        TokenCache.make_key("cfg", 7, fingerprint, 2048),
+        TokenCache.make_key("cfg", 7, fingerprint, 1024),
+        TokenCache.make_key("cfg", 7, tokenizer_fingerprint(second), 2048),
+        TokenCache.make_key("cfg", 8, fingerprint, 2048),
+    }
+    assert len(keys) == 4
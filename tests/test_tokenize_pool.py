@@ -0,0 +1,54 @@
+import numpy as np
+
+from tplr.tokenize_pool import TokenizePool, tokenize_texts
+
+EOS = 0
+
+
+class WordTokenizer:
+    """Maps each word to its length; "." is EOS. Picklable for pool workers."""
+
+    eos_token_id = EOS
+
+    def __call__(self, texts, padding, truncation, max_length, return_tensors):
+        input_ids = [
+            [EOS if word == "." else len(word) for word in text.split()][:max_length]
+            for text in texts
+        ]
+        return {"input_ids": input_ids}
+
+
+def _list_tokenize(tokenizer, texts, max_length):
+    """The per-token loop R2DatasetLoader used before."""
+    all_tokens = []
+    for tokens in tokenizer(texts, False, True, max_length, None)["input_ids"]:
+        if tokens:
+            all_tokens.extend(tokens)
+            if tokens[-1] != tokenizer.eos_token_id:
+                all_tokens.append(tokenizer.eos_token_id)
+    return all_tokens
+
+
+TEXTS = ["a bb ccc", "", "dddd .", "ee . f", "g h i j k l"] * 60
+
+
+def test_tokenize_texts_matches_list_loop():
+    tokenizer = WordTokenizer()
+    tokens = tokenize_texts(tokenizer, TEXTS, max_length=4)
+
+    assert tokens.dtype == np.int32
+    assert tokens.tolist() == _list_tokenize(tokenizer, TEXTS, 4)
+    assert tokenize_texts(tokenizer, ["", ""], max_length=4).size == 0
+
+
+def test_pool_returns_tokens_through_shared_memory():
+    tokenizer = WordTokenizer()
+    pool = TokenizePool(tokenizer, max_workers=2)
+    try:
+        futures = [pool.submit(TEXTS, 4), pool.submit([""], 4)]
+        tokens, empty = (future.result(timeout=120) for future in futures)
+    finally:
+        pool.shutdown()
+
+    assert tokens.tolist() == _list_tokenize(tokenizer, TEXTS, 4)
+    assert empty.size == 0
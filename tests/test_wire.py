@@ -0,0 +1,200 @@
+import io
+import json
+import struct
+import warnings
+
+import pytest
+import torch
+
+from tplr.compress import CompressDCT, TransformDCT
+from tplr.wire import (
+    _HEADER,
+    WIRE_MAGIC,
+    _align,
+    decode_wire,
+    encode_wire,
+    is_wire_payload,
+)
+
+
+@pytest.fixture
+def gradient():
+    """A payload shaped like prepare_gradient_dict's output."""
+    torch.manual_seed(0)
+    model = torch.nn.Linear(64, 32)
+    transformer = TransformDCT(model, target_chunk=16)
+    compressor = CompressDCT(use_quantization=True)
+
+    state_dict = {}
+    for name, p in model.named_parameters():
+        idxs, vals, _, _, qparams = compressor.compress(
+            transformer.encode(torch.randn_like(p)), 8
+        )
+        state_dict[name + "idxs"] = idxs
+        state_dict[name + "vals"] = vals
+        state_dict[name + "quant_params"] = qparams
+    state_dict["metadata"] = {"pages_info": [("cfg", 3, "train")], "window": 7}
+    return state_dict
+
+
+def _assert_same_payload(decoded, expected):
+    assert decoded.keys() == expected.keys()
+    for name, value in expected.items():
+        if isinstance(value, torch.Tensor):
+            assert decoded[name].dtype == value.dtype
+            assert torch.equal(decoded[name], value)
+        elif name.endswith("quant_params"):
+            shift, scale, offset, lookup, dtype = decoded[name]
+            assert torch.equal(shift, value[0])
+            assert scale == value[1]
+            assert offset == value[2]
+            assert torch.equal(lookup, value[3])
+            assert dtype == value[4]
+        else:
+            assert decoded[name] == value
+
+
+def test_roundtrip(gradient):
+    buffer = encode_wire(gradient, global_step=42)
+
+    assert is_wire_payload(buffer)
+    loaded = decode_wire(buffer)
+    assert loaded["global_step"] == 42
+    _assert_same_payload(loaded["state_dict"], gradient)
+
+
+def test_decode_is_zero_copy(gradient):
+    buffer = encode_wire(gradient)
+    decoded = decode_wire(buffer)["state_dict"]
+
+    address = torch.frombuffer(buffer, dtype=torch.uint8).data_ptr()
+    vals = decoded["weightvals"]
+    assert address <= vals.data_ptr() < address + len(buffer)
+
+
+def test_decode_readonly_buffer(gradient):
+    decoded = decode_wire(bytes(encode_wire(gradient)))["state_dict"]
+    _assert_same_payload(decoded, gradient)
+
+    # Off the CPU the tensors are copied straight from the read-only buffer
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        view = memoryview(encode_wire(gradient)).toreadonly()
+        decoded = decode_wire(view, map_location="meta")["state_dict"]
+    assert decoded["weightvals"].device.type == "meta"
+
+
+def test_mixed_dtypes_and_shapes():
+    state_dict = {
+        "bf16": torch.randn(3, 5).to(torch.bfloat16),
+        "scalar": torch.tensor(1.5),
+        "empty": torch.empty(0, 4, dtype=torch.int16),
+        "mask": torch.tensor([True, False, True]),
+        "quant_params": None,
+    }
+    decoded = decode_wire(encode_wire(state_dict))["state_dict"]
+
+    assert decoded["quant_params"] is None
+    for name in ("bf16", "scalar", "empty", "mask"):
+        assert decoded[name].dtype == state_dict[name].dtype
+        assert torch.equal(decoded[name], state_dict[name])
+
+
+def test_smaller_than_torch_save(gradient):
+    pickled = io.BytesIO()
+    torch.save({"state_dict": gradient, "global_step": 0}, pickled)
+
+    assert len(encode_wire(gradient)) < len(pickled.getvalue())
+
+
+def test_rejects_bad_payloads(gradient):
+    buffer = encode_wire(gradient)
+
+    with pytest.raises(ValueError):
+        decode_wire(b"not a payload, definitely not one")
+    with pytest.raises(ValueError):
+        decode_wire(buffer[:16])
+
+    bad_version = bytearray(buffer)
+    struct.pack_into("<H", bad_version, len(WIRE_MAGIC), 99)
+    with pytest.raises(ValueError, match="version"):
+        decode_wire(bad_version)
+
+    with pytest.raises(ValueError):
+        decode_wire(buffer[: len(buffer) - 64])
+
+    with pytest.raises(ValueError, match="dtype"):
+        encode_wire({"x": torch.zeros(2, dtype=torch.complex64)})
+
+
+def _with_index(buffer, edit):
+    """Re-encode ``buffer`` with its JSON index changed by ``edit``."""
+    magic, version, flags, index_len, step = _HEADER.unpack_from(buffer, 0)
+    index_end = _HEADER.size + index_len
+    index = json.loads(bytes(buffer[_HEADER.size : index_end]))
+    edit(index)
+    raw = json.dumps(index).encode("utf-8")
+    data = bytes(buffer[_align(index_end) :])
+
+    out = bytearray(_align(_HEADER.size + len(raw)) + len(data))
+    _HEADER.pack_into(out, 0, magic, version, flags, len(raw), step)
+    out[_HEADER.size : _HEADER.size + len(raw)] = raw
+    out[len(out) - len(data) :] = data
+    return out
+
+
+def _set(path, value):
+    def edit(index):
+        target = index
+        for key in path[:-1]:
+            target = target[key]
+        target[path[-1]] = value
+
+    return edit
+
+
+@pytest.mark.parametrize(
+    "edit",
+    [
+        _set(("tensors", 0, "offset"), -64),
+        _set(("tensors", 0, "shape"), [-2, -4]),
+        _set(("tensors", 0, "shape"), [2**40, 2**40]),
+        _set(("tensors", 0, "shape"), None),
+        _set(("tensors", 0, "dtype"), "complex64"),
+        lambda index: index["tensors"][0].pop("nbytes"),
+        lambda index: index.pop("entries"),
+        _set(("entries", "weightidxs"), {"tensor": 99}),
+        _set(("entries", "weightidxs"), {"tensor": -1}),
+        _set(("entries", "weightidxs"), ["not", "an", "entry"]),
+        _set(("tensors",), {"not": "a list"}),
+    ],
+    ids=[
+        "negative-offset",
+        "negative-dims",
+        "overflowing-dims",
+        "missing-shape",
+        "unknown-dtype",
+        "missing-nbytes",
+        "missing-entries",
+        "dangling-ref",
+        "negative-ref",
+        "entry-not-object",
+        "table-not-list",
+    ],
+)
+def test_rejects_malformed_index(gradient, edit):
+    unchanged = _with_index(encode_wire(gradient), lambda index: None)
+    _assert_same_payload(decode_wire(unchanged)["state_dict"], gradient)
+
+    buffer = _with_index(encode_wire(gradient), edit)
+
+    with pytest.raises(ValueError):
+        decode_wire(buffer)
+
+
+def test_rejects_invalid_index_json(gradient):
+    buffer = encode_wire(gradient)
+    buffer[_HEADER.size] = ord("}")
+
+    with pytest.raises(ValueError):
+        decode_wire(buffer)
@@ -2,6 +2,7 @@
 Unit tests for ShardProfiler in tplr/profilers/shard_profiler.py.
 """
 
+import json
 import os
 import tempfile
 from unittest import mock
@@ -196,6 +197,32 @@ class TestShardProfiler:
             assert shard_path in log_message
             assert "Reading row group 2/5" in log_message
 
+    def test_shard_profiler_record_bytes(self):
+        """Test that bytes read per page are accumulated and exported."""
+        profiler = ShardProfiler(name="TestShardProfiler")
+        shard_path = "/test/shard.parquet"
+        chosen_shard = {"num_rows": 1000, "file_size": 1024 * 1024}
+
+        for bytes_read in (1000, 3000):
+            timer_id = profiler.start_read(shard_path, chosen_shard)
+            profiler.record_bytes(shard_path, bytes_read, rows=100)
+            profiler.end_read(timer_id, shard_path)
+
+        stats = profiler.get_stats()[shard_path]
+        assert stats["pages_read"] == 2
+        assert stats["bytes_read"] == 4000
+        assert stats["rows_read"] == 200
+        assert ShardProfiler.bytes_per_page(stats) == 2000
+
+        # Unknown shards are ignored
+        profiler.record_bytes("/test/other.parquet", 10, rows=1)
+        assert "/test/other.parquet" not in profiler.get_stats()
+
+        with tempfile.NamedTemporaryFile(suffix=".json") as f:
+            profiler.export_data(f.name)
+            exported = json.load(open(f.name))
+        assert exported["shard_statistics"][shard_path]["bytes_per_page"] == 2000
+
 
 class TestShardProfilerDisabled:
     """Test the ShardProfiler with profiling disabled."""